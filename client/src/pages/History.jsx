@@ -1,6 +1,9 @@
 import { useState, useEffect } from 'react';
 import { getBacktestHistory } from '../utils/api';
 
+// Risk metrics are null when undefined (e.g. no trades or no losing trades)
+const formatMetric = (value, suffix = '') => (value == null ? '—' : `${value.toFixed(2)}${suffix}`);
+
 const History = () => {
     const [history, setHistory] = useState([]);
     const [loading, setLoading] = useState(true);
@@ -126,6 +129,30 @@ const History = () => {
                                                             <span className="block text-xs uppercase text-gray-500">Win Rate</span>
                                                             <span className="text-white">{item.winRate}%</span>
                                                         </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">Max Drawdown</span>
+                                                            <span className="text-white">{formatMetric(item.maxDrawdown, '%')}</span>
+                                                        </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">Sharpe Ratio</span>
+                                                            <span className="text-white">{formatMetric(item.sharpeRatio)}</span>
+                                                        </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">Sortino Ratio</span>
+                                                            <span className="text-white">{formatMetric(item.sortinoRatio)}</span>
+                                                        </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">CAGR</span>
+                                                            <span className="text-white">{formatMetric(item.cagr, '%')}</span>
+                                                        </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">Profit Factor</span>
+                                                            <span className="text-white">{formatMetric(item.profitFactor)}</span>
+                                                        </div>
+                                                        <div>
+                                                            <span className="block text-xs uppercase text-gray-500">Exposure</span>
+                                                            <span className="text-white">{formatMetric(item.exposure, '%')}</span>
+                                                        </div>
                                                         <div>
                                                             <span className="block text-xs uppercase text-gray-500">Parameters</span>
                                                             <span className="text-white font-mono text-xs">{JSON.stringify(item.params)}</span>
@@ -1,27 +1,40 @@
+import os
 import sys
 import json
-import yfinance as yf
+import time
 import pandas as pd
-import pandas_ta as ta
+
+from market_data import MarketDataStore
+
+# Share the vectorized indicator kernels with python_service
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python_service')))
+from engine.indicators import sma, ema, rolling_std, wilder_rsi
+
+# Downloaded data kept warm between worker requests: (symbol, period, interval) -> (fetched_at, DataFrame)
+DATA_CACHE_TTL = 15 * 60
+_data_cache = {}
+
+# On-disk bar store; only bars newer than the stored ones are downloaded
+market_data = MarketDataStore()
 
 def fetch_data(symbol, period='1y', interval='1d'):
-    try:
-        data = yf.download(symbol, period=period, interval=interval, progress=False)
-        if data.empty:
-            raise ValueError("No data found for symbol")
-        return data
-    except Exception as e:
-        print(json.dumps({"error": str(e)}))
-        sys.exit(1)
+    key = (symbol, period, interval)
+    cached = _data_cache.get(key)
+    if cached and time.time() - cached[0] < DATA_CACHE_TTL:
+        return cached[1]
+
+    data = market_data.load(symbol, period, interval)
+    _data_cache[key] = (time.time(), data)
+    return data
 
 def strategy_sma_ema(data, type='SMA', short_window=50, long_window=200):
     df = data.copy()
     if type == 'SMA':
-        df['Short'] = ta.sma(df['Close'], length=short_window)
-        df['Long'] = ta.sma(df['Close'], length=long_window)
+        df['Short'] = sma(df['Close'], short_window)
+        df['Long'] = sma(df['Close'], long_window)
     else:
-        df['Short'] = ta.ema(df['Close'], length=short_window)
-        df['Long'] = ta.ema(df['Close'], length=long_window)
+        df['Short'] = ema(df['Close'], short_window)
+        df['Long'] = ema(df['Close'], long_window)
     
     df['Signal'] = 0
     df.loc[df['Short'] > df['Long'], 'Signal'] = 1 # Buy
@@ -30,7 +43,7 @@ def strategy_sma_ema(data, type='SMA', short_window=50, long_window=200):
 
 def strategy_rsi(data, period=14, overbought=70, oversold=30):
     df = data.copy()
-    df['RSI'] = ta.rsi(df['Close'], length=period)
+    df['RSI'] = wilder_rsi(df['Close'], period)
     
     df['Signal'] = 0
     df.loc[df['RSI'] < oversold, 'Signal'] = 1 # Buy
@@ -40,15 +53,8 @@ def strategy_rsi(data, period=14, overbought=70, oversold=30):
 def strategy_volatility_breakout(data, window=20, num_std_dev=2):
     df = data.copy()
     # Bollinger Bands
-    bb = ta.bbands(df['Close'], length=window, std=num_std_dev)
-    # Check if bb is None or missing columns. keep it simple.
-    # col names: BBL, BBM, BBU
-    # But pandas_ta naming might vary based on version/params. 
-    # Usually: BBL_20_2.0, BBU_20_2.0
-    
-    # Let's dynamically find the Upper/Lower columns if needed or just use standard calculation for robustness
-    mean = df['Close'].rolling(window).mean()
-    std = df['Close'].rolling(window).std()
+    mean = sma(df['Close'], window)
+    std = rolling_std(df['Close'], window)
     df['Upper'] = mean + (std * num_std_dev)
     df['Lower'] = mean - (std * num_std_dev)
 
@@ -94,56 +100,89 @@ def run_backtest(df):
         'prices': df['Close'].tolist()
     }
 
+def run_request(input_data):
+    """
+    Run one backtest request ({"type", "parameters"}) and return the results dict.
+    """
+    type = input_data.get('type', 'SMA')
+    parameters = input_data.get('parameters', {})
+    symbol = parameters.get('symbol', 'AAPL')
+    
+    # 1. Fetch Data
+    data = fetch_data(symbol)
+    
+    # 2. Apply Strategy
+    if type == 'SMA':
+        processed_data = strategy_sma_ema(data, 'SMA', 
+                                          int(parameters.get('shortWindow', 50)), 
+                                          int(parameters.get('longWindow', 200)))
+    elif type == 'EMA':
+        processed_data = strategy_sma_ema(data, 'EMA',
+                                          int(parameters.get('shortWindow', 50)), 
+                                          int(parameters.get('longWindow', 200)))
+    elif type == 'RSI':
+        processed_data = strategy_rsi(data, 
+                                      int(parameters.get('period', 14)),
+                                      int(parameters.get('overbought', 70)),
+                                      int(parameters.get('oversold', 30)))
+    elif type == 'Volatility':
+        processed_data = strategy_volatility_breakout(data,
+                                                      int(parameters.get('window', 20)),
+                                                      float(parameters.get('stdDev', 2)))
+    else:
+        raise ValueError("Unknown strategy type")
+
+    # 3. Run Backtest
+    return run_backtest(processed_data)
+
 def main():
     try:
-        # Input: JSON string from stdin or arg
+        # Input: JSON string as the first argument
         if len(sys.argv) < 2:
             print(json.dumps({"error": "No arguments provided"}))
             sys.exit(1)
             
-        input_data = JSON.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
-        # Wait, I used sys.argv in nodejs spawn. 
-        # Correct usage: json.loads(sys.argv[1])
         input_data = json.loads(sys.argv[1])
+        results = run_request(input_data)
         
-        type = input_data.get('type', 'SMA')
-        parameters = input_data.get('parameters', {})
-        symbol = parameters.get('symbol', 'AAPL')
-        
-        # 1. Fetch Data
-        data = fetch_data(symbol)
-        
-        # 2. Apply Strategy
-        if type == 'SMA':
-            processed_data = strategy_sma_ema(data, 'SMA', 
-                                              int(parameters.get('shortWindow', 50)), 
-                                              int(parameters.get('longWindow', 200)))
-        elif type == 'EMA':
-            processed_data = strategy_sma_ema(data, 'EMA',
-                                              int(parameters.get('shortWindow', 50)), 
-                                              int(parameters.get('longWindow', 200)))
-        elif type == 'RSI':
-            processed_data = strategy_rsi(data, 
-                                          int(parameters.get('period', 14)),
-                                          int(parameters.get('overbought', 70)),
-                                          int(parameters.get('oversold', 30)))
-        elif type == 'Volatility':
-            processed_data = strategy_volatility_breakout(data,
-                                                          int(parameters.get('window', 20)),
-                                                          float(parameters.get('stdDev', 2)))
-        else:
-             print(json.dumps({"error": "Unknown strategy type"}))
-             sys.exit(1)
-
-        # 3. Run Backtest
-        results = run_backtest(processed_data)
-        
-        # 4. Output JSON
+        # Output JSON
         print(json.dumps(results))
         
     except Exception as e:
         print(json.dumps({"error": str(e)}))
         sys.exit(1)
 
+def worker():
+    """
+    Long-running mode: read one JSON request per line from stdin and write one
+    JSON response per line to stdout, keeping imports and fetched data warm.
+
+    Request:  {"id": ..., "type": "SMA", "parameters": {...}}
+    Response: {"id": ..., "result": {...}} or {"id": ..., "error": "..."}
+    """
+    out = sys.stdout
+    # Anything a library prints must not corrupt the response stream
+    sys.stdout = sys.stderr
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request_id = None
+        try:
+            input_data = json.loads(line)
+            request_id = input_data.get('id')
+            response = {"id": request_id, "result": run_request(input_data)}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+
 if __name__ == "__main__":
-    main()
+    if '--offline' in sys.argv[1:]:
+        market_data.offline = True
+        sys.argv.remove('--offline')
+    if '--worker' in sys.argv[1:]:
+        worker()
+    else:
+        main()
@@ -0,0 +1,212 @@
+"""
+Local on-disk store for downloaded market data.
+
+Bars are kept per (symbol, interval) as a single memory-mapped structured
+NumPy file (timestamp + OHLCV columns) plus a small JSON sidecar. A repeat
+request only reads the rows inside the requested period, and only bars newer
+than the last stored one are fetched from the network.
+
+Environment:
+    MARKET_DATA_DIR      store location (default: engine/.market_data)
+    MARKET_DATA_OFFLINE  set to 1 to never touch the network
+"""
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.market_data')
+
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653
+}
+
+INTERVALS = {
+    '1m': pd.Timedelta(minutes=1), '2m': pd.Timedelta(minutes=2), '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15), '30m': pd.Timedelta(minutes=30), '60m': pd.Timedelta(hours=1),
+    '90m': pd.Timedelta(minutes=90), '1h': pd.Timedelta(hours=1), '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=5), '1wk': pd.Timedelta(weeks=1), '1mo': pd.Timedelta(days=31),
+    '3mo': pd.Timedelta(days=92)
+}
+
+
+def period_start(period, now):
+    """First timestamp covered by a yfinance-style period, or None for 'max'."""
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC')
+    if period not in PERIOD_DAYS:
+        raise ValueError(f"Unsupported period: {period}")
+    return now - pd.Timedelta(days=PERIOD_DAYS[period])
+
+
+def normalize_frame(data):
+    """Flatten yfinance's (Price, Ticker) columns and drop duplicate/unsorted bars."""
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+    data = data[~data.index.duplicated(keep='last')]
+    return data.sort_index()
+
+
+class YFinanceSource:
+    """Downloads bars with yfinance (imported on first use)."""
+
+    def download(self, symbol, interval, period=None, start=None):
+        import yfinance as yf
+        if start is not None:
+            return yf.download(symbol, start=start.tz_convert(None).to_pydatetime(), interval=interval, progress=False)
+        return yf.download(symbol, period=period, interval=interval, progress=False)
+
+
+class FixtureSource:
+    """
+    Serves bars from local CSV files named <symbol>_<interval>.csv (first
+    column is the timestamp). Used by tests in place of yfinance.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.calls = []
+
+    def download(self, symbol, interval, period=None, start=None):
+        self.calls.append((symbol, interval, period, start))
+        path = os.path.join(self.directory, f"{symbol}_{interval}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        index = data.index if data.index.tz is not None else data.index.tz_localize('UTC')
+        now = pd.Timestamp.now(tz='UTC')
+        lower = start if start is not None else period_start(period or 'max', now)
+        if lower is not None:
+            data = data[index >= lower]
+        return data
+
+
+class MarketDataStore:
+    def __init__(self, root=None, source=None, offline=None):
+        self.root = root or os.environ.get('MARKET_DATA_DIR', DEFAULT_DIR)
+        self.source = source or YFinanceSource()
+        self.offline = offline if offline is not None else os.environ.get('MARKET_DATA_OFFLINE') == '1'
+
+    def _paths(self, symbol, interval):
+        name = re.sub(r'[^A-Za-z0-9._^=-]', '_', f"{symbol}_{interval}")
+        return os.path.join(self.root, name + '.npy'), os.path.join(self.root, name + '.json')
+
+    def _read(self, symbol, interval):
+        data_path, meta_path = self._paths(symbol, interval)
+        if not os.path.exists(data_path) or not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return np.load(data_path, mmap_mode='r'), meta
+
+    def _write(self, symbol, interval, frame, complete, covered_from=None):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(symbol, interval)
+
+        index = frame.index
+        tz = str(index.tz) if index.tz is not None else None
+        utc = index.tz_convert('UTC') if tz else index
+        columns = [str(col) for col in frame.columns]
+
+        records = np.empty(len(frame), dtype=[('ts', '<i8')] + [(col, '<f8') for col in columns])
+        records['ts'] = utc.as_unit('ns').asi8
+        for col in columns:
+            records[col] = frame[col].to_numpy(dtype=np.float64)
+
+        # Write to temp files and swap in, so readers never see a partial file
+        tmp_data, tmp_meta = data_path + '.tmp', meta_path + '.tmp'
+        with open(tmp_data, 'wb') as f:
+            np.save(f, records)
+        with open(tmp_meta, 'w') as f:
+            json.dump({"tz": tz, "complete": complete, "covered_from": covered_from, "updated": time.time()}, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    def _to_frame(self, records, meta, lo=0, hi=None):
+        rows = records[lo:hi]
+        index = pd.DatetimeIndex(np.asarray(rows['ts']).astype('datetime64[ns]'))
+        if meta.get('tz'):
+            index = index.tz_localize('UTC').tz_convert(meta['tz'])
+        columns = [name for name in records.dtype.names if name != 'ts']
+        return pd.DataFrame({col: np.array(rows[col]) for col in columns}, index=index)
+
+    def _download(self, symbol, interval, period=None, start=None):
+        data = self.source.download(symbol, interval, period=period, start=start)
+        if data is None or data.empty:
+            return None
+        return normalize_frame(data)
+
+    def _refresh(self, symbol, period, interval, records, meta, start, now):
+        """Download what the store is missing and return the updated (records, meta)."""
+        # Earliest requested start already downloaded (ns since epoch). The
+        # first stored bar can be later than it (weekends, holidays), so
+        # comparing requests with the first bar would re-download every time.
+        requested = start.as_unit('ns').value if start is not None else None
+        if records is None or len(records) == 0:
+            fresh = self._download(symbol, interval, period=period)
+            if fresh is not None:
+                self._write(symbol, interval, fresh, complete=period == 'max', covered_from=requested)
+            return self._read(symbol, interval)
+
+        first = pd.Timestamp(int(records['ts'][0]), tz='UTC')
+        last = pd.Timestamp(int(records['ts'][-1]), tz='UTC')
+        step = INTERVALS.get(interval, pd.Timedelta(days=1))
+        covered = meta.get('covered_from')
+        # Stores written before covered_from was recorded: allow one bar of slack
+        covered = pd.Timestamp(covered, tz='UTC') if covered is not None else first - step
+        needs_history = not meta.get('complete') and (start is None or start < covered)
+
+        if needs_history:
+            # Older bars than stored are needed: fetch the whole period and merge
+            fresh = self._download(symbol, interval, period=period)
+            if fresh is None:
+                return records, meta
+            stored = self._to_frame(records, meta)
+            merged = normalize_frame(pd.concat([stored, fresh.reindex(columns=stored.columns)]))
+            self._write(symbol, interval, merged, complete=meta.get('complete') or period == 'max',
+                        covered_from=requested)
+            return self._read(symbol, interval)
+
+        if now - last >= step:
+            # Only fetch bars newer than the last stored one
+            fresh = self._download(symbol, interval, start=last)
+            if fresh is not None:
+                fresh_index = fresh.index.tz_convert('UTC') if fresh.index.tz is not None else fresh.index.tz_localize('UTC')
+                fresh = fresh[fresh_index > last]
+            if fresh is not None and not fresh.empty:
+                stored = self._to_frame(records, meta)
+                merged = pd.concat([stored, fresh.reindex(columns=stored.columns)])
+                self._write(symbol, interval, merged, complete=meta.get('complete', False),
+                            covered_from=meta.get('covered_from'))
+                return self._read(symbol, interval)
+        return records, meta
+
+    def load(self, symbol, period='1y', interval='1d'):
+        """
+        Return OHLCV bars for symbol covering period, refreshing the store as needed.
+        """
+        now = pd.Timestamp.now(tz='UTC')
+        start = period_start(period, now)
+        records, meta = self._read(symbol, interval)
+
+        if not self.offline:
+            records, meta = self._refresh(symbol, period, interval, records, meta, start, now)
+
+        if records is None or len(records) == 0:
+            if self.offline:
+                raise ValueError(f"No stored data for {symbol} ({interval}) in offline mode")
+            raise ValueError("No data found for symbol")
+
+        # Only materialize the rows inside the requested period
+        lo = 0 if start is None else int(np.searchsorted(records['ts'], start.as_unit('ns').value))
+        frame = self._to_frame(records, meta, lo)
+        if frame.empty:
+            raise ValueError("No data found for symbol")
+        return frame
@@ -0,0 +1,71 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_data import MarketDataStore, FixtureSource, period_start
+
+def write_fixture(directory, index, symbol="TEST"):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(index)))
+    frame = pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                          "Volume": rng.integers(100, 1000, len(index)).astype(float)},
+                         index=index.tz_convert(None).rename("Date"))
+    frame.to_csv(os.path.join(directory, f"{symbol}_1d.csv"))
+
+def daily_bars(end, days):
+    return pd.date_range(end=end.normalize(), periods=days, freq="D", tz="UTC")
+
+def naive(ts):
+    # Fixture CSVs have naive UTC timestamps, and the store keeps them naive
+    return ts.tz_convert(None)
+
+def full_downloads(source):
+    return [call for call in source.calls if call[2] is not None]
+
+def test_cold_load_and_incremental_append(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    now = pd.Timestamp.now(tz="UTC")
+    write_fixture(str(fixtures), daily_bars(now - pd.Timedelta(days=5), 400))
+    source = FixtureSource(str(fixtures))
+    store = MarketDataStore(root=str(tmp_path / "store"), source=source, offline=False)
+
+    cold = store.load("TEST", period="1y")
+    assert len(full_downloads(source)) == 1
+    assert cold.index[0] >= naive(period_start("1y", now)) and cold.index[-1] == naive((now - pd.Timedelta(days=5)).normalize())
+
+    # Five newer bars appear upstream: only bars after the last stored one are fetched
+    write_fixture(str(fixtures), daily_bars(now, 405))
+    updated = store.load("TEST", period="1y")
+    assert len(full_downloads(source)) == 1
+    assert naive(source.calls[-1][3]) == cold.index[-1]
+    assert updated.index[-1] == naive(now.normalize())
+    assert updated.loc[cold.index[-1]:].shape[0] == 6
+    pd.testing.assert_frame_equal(updated.loc[:cold.index[-1]], cold.loc[updated.index[0]:], check_freq=False)
+
+def test_repeat_load_with_period_starting_in_a_gap(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    now = pd.Timestamp.now(tz="UTC")
+    # No bars for a few days around the start of the period (a weekend or holiday)
+    index = daily_bars(now, 400)
+    start = period_start("1y", now).normalize()
+    index = index[(index < start - pd.Timedelta(days=1)) | (index > start + pd.Timedelta(days=3))]
+    write_fixture(str(fixtures), index)
+    source = FixtureSource(str(fixtures))
+    store = MarketDataStore(root=str(tmp_path / "store"), source=source, offline=False)
+
+    first = store.load("TEST", period="1y")
+    for _ in range(3):
+        again = store.load("TEST", period="1y")
+    assert len(full_downloads(source)) == 1
+    pd.testing.assert_frame_equal(again, first, check_freq=False)
+
+    # A longer period than was downloaded still fetches the older history
+    longer = store.load("TEST", period="2y")
+    assert len(full_downloads(source)) == 2
+    assert longer.index[0] == naive(index[0])
@@ -0,0 +1,197 @@
+"""
+Benchmark suite for strategies, the backtest engine and result serialization.
+
+Generates deterministic synthetic OHLCV data (1e3 to 1e7 bars by default),
+times every stage for every strategy and records the peak memory allocated
+during the stage. Results are written as JSON so that runs can be compared:
+
+    python benchmarks/bench.py --output benchmarks/baseline.json
+    python benchmarks/bench.py --sizes 1e3 1e5 --compare benchmarks/baseline.json
+
+With --compare the exit status is 1 when any stage got slower than the
+baseline by more than --tolerance.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.backtest_engine import BacktestEngine
+from engine.indicator_cache import indicator_cache
+from engine.serialization import dumps
+from engine.strategy_runner import run_strategy, load_strategy
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+STRATEGY_PARAMS = {
+    "sma": {"short_window": 20, "long_window": 50},
+    "rsi": {"period": 14, "oversold": 30, "overbought": 70},
+    "breakout": {"lookback": 20}
+}
+
+# The records response builds one dict per bar; skip it above this size
+MAX_RECORDS_BARS = 1_000_000
+
+
+def synthetic_ohlcv(n, seed=42):
+    """Deterministic geometric random walk with minute bars."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = close * rng.uniform(0, 0.002, n)
+    return pd.DataFrame({
+        "open": close + rng.uniform(-1, 1, n) * spread,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(100, 10000, n)
+    }, index=pd.date_range("2020-01-01", periods=n, freq="min", name="index"))
+
+
+def measure(fn, repeat=1, memory=True):
+    """
+    Run fn `repeat` times and return (best seconds, peak bytes, last result).
+
+    Peak memory is measured in an extra traced run so tracing does not
+    distort the timings.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def bench_strategy(df, strategy, params, repeat=1, memory=True, max_records_bars=MAX_RECORDS_BARS):
+    module = load_strategy(strategy)
+    rows = []
+
+    def record(stage, fn):
+        seconds, peak, result = measure(fn, repeat, memory)
+        rows.append({"strategy": strategy, "bars": len(df), "stage": stage, "seconds": seconds, "peak_bytes": peak})
+        return result
+
+    def cold_signals():
+        indicator_cache.clear()
+        return module.generate_signals(df, params)
+
+    signals = record("generate_signals", cold_signals)
+
+    def engine_run():
+        engine = BacktestEngine()
+        engine.run(df, signals)
+        return engine
+
+    engine = record("engine_run", engine_run)
+    record("engine_results", lambda: engine.get_results(2000))
+    record("run_strategy_columnar", lambda: dumps(run_strategy(df, strategy, params, response_format="columnar", max_points=2000)))
+    if len(df) <= max_records_bars:
+        record("run_strategy_records", lambda: dumps(run_strategy(df, strategy, params, max_points=2000)))
+    indicator_cache.clear()
+    return rows
+
+
+def run_suite(sizes=DEFAULT_SIZES, strategies=tuple(STRATEGY_PARAMS), repeat=3, memory=True, max_records_bars=MAX_RECORDS_BARS, log=None):
+    results = []
+    for n in sizes:
+        df = synthetic_ohlcv(int(n))
+        for strategy in strategies:
+            # Fewer repeats for the largest datasets
+            rows = bench_strategy(df, strategy, STRATEGY_PARAMS[strategy], repeat=repeat if n <= 100_000 else 1,
+                                  memory=memory, max_records_bars=max_records_bars)
+            results.extend(rows)
+            if log:
+                for row in rows:
+                    peak = f"{row['peak_bytes'] / 2**20:9.1f} MiB" if row['peak_bytes'] is not None else ""
+                    log(f"{row['strategy']:>9} {row['bars']:>9} {row['stage']:<22} {row['seconds'] * 1000:10.2f} ms {peak}")
+        del df
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count()
+        },
+        "results": results
+    }
+
+
+def compare(baseline, current, tolerance=0.2, min_seconds=0.005):
+    """
+    Compare two suite results stage by stage.
+
+    Returns:
+        list: (strategy, bars, stage, baseline seconds, current seconds, ratio)
+        for every stage slower than the baseline by more than `tolerance`.
+        Stages faster than min_seconds in both runs are ignored as noise.
+    """
+    reference = {(r["strategy"], r["bars"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = reference.get((row["strategy"], row["bars"], row["stage"]))
+        if before is None or max(before, row["seconds"]) < min_seconds:
+            continue
+        ratio = row["seconds"] / before if before > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            regressions.append((row["strategy"], row["bars"], row["stage"], before, row["seconds"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES, help="bar counts (e.g. 1e3 1e6)")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGY_PARAMS), choices=list(STRATEGY_PARAMS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory runs")
+    parser.add_argument("--max-records-bars", type=int, default=MAX_RECORDS_BARS)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    suite = run_suite([int(n) for n in args.sizes], args.strategies, repeat=args.repeat,
+                      memory=not args.no_memory, max_records_bars=args.max_records_bars, log=print)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, suite, tolerance=args.tolerance)
+        for strategy, bars, stage, before, after, ratio in regressions:
+            print(f"REGRESSION {strategy} {bars} {stage}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Load test for the service: concurrent /run-backtest requests against a real server.
+
+Starts the service with uvicorn (or targets --url), then for each concurrency
+level replays a deterministic mix of requests from that many client threads
+and reports throughput and p50/p95/p99 latency, overall and per mix entry.
+Each mix entry is strategy:bars[:weight]; its payload is built once from the
+same synthetic data as bench.py. Results are written as JSON so that
+execution-model changes can be compared:
+
+    python benchmarks/loadtest.py --output benchmarks/load-baseline.json
+    python benchmarks/loadtest.py --mix sma:1e4:3 rsi:1e5 --concurrency 1 8 \\
+        --workers 4 --compare benchmarks/load-baseline.json
+
+The started service runs with the result and indicator caches disabled, so
+repeated payloads measure the computation rather than cache hits; pass
+--keep-caches to measure with them. With --compare the exit status is 1 when
+any p95 latency or throughput got worse than the baseline by more than
+--tolerance.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench import synthetic_ohlcv, STRATEGY_PARAMS
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = ("sma:1e3:4", "rsi:1e4:2", "breakout:1e5:1")
+DEFAULT_CONCURRENCY = (1, 4, 16)
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(entries):
+    """Parse strategy:bars[:weight] entries into (strategy, bars, weight) tuples."""
+    mix = []
+    for entry in entries:
+        parts = entry.split(":")
+        if len(parts) not in (2, 3) or parts[0] not in STRATEGY_PARAMS:
+            raise ValueError(f"Invalid mix entry {entry!r}: expected strategy:bars[:weight] with a strategy from {list(STRATEGY_PARAMS)}")
+        weight = float(parts[2]) if len(parts) == 3 else 1.0
+        mix.append((parts[0], int(float(parts[1])), weight))
+    return mix
+
+
+def build_payload(strategy, bars, response_format="columnar", include_data=True):
+    """Encoded /run-backtest body with columnar data."""
+    df = synthetic_ohlcv(bars)
+    data = {name: values.tolist() for name, values in df.items()}
+    data["timestamp"] = df.index.as_unit('s').asi8.tolist()
+    return json.dumps({"symbol": "LOAD", "strategy": strategy, "params": STRATEGY_PARAMS[strategy], "data": data,
+                       "response_format": response_format, "include_data": include_data}).encode()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_healthy(url, timeout=60.0, process=None):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Service exited with status {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            conn.close()
+        time.sleep(0.1)
+    raise RuntimeError(f"Service at {url} did not become healthy within {timeout:.0f}s")
+
+
+@contextmanager
+def start_service(workers=1, keep_caches=False, port=None):
+    """Run the service under uvicorn on a local port and yield its URL."""
+    port = port or free_port()
+    env = dict(os.environ)
+    if not keep_caches:
+        env.update(RESULT_CACHE_MB="0", INDICATOR_CACHE_MB="0")
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_healthy(url, process=process)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def schedule(mix, requests, seed=42):
+    """Deterministic sequence of mix entry positions, drawn by weight."""
+    weights = np.array([weight for _, _, weight in mix], dtype=float)
+    return np.random.default_rng(seed).choice(len(mix), size=requests, p=weights / weights.sum()).tolist()
+
+
+def replay(url, payloads, order, concurrency, timeout=300.0):
+    """
+    Send payloads[i] for every i in order from `concurrency` threads, each on
+    its own keep-alive connection.
+
+    Returns:
+        (list, float): (entry position, seconds, HTTP status or None) per
+        request, and the wall time of the whole run
+    """
+    parts = urlsplit(url)
+    samples = []
+    lock = threading.Lock()
+    position = iter(order)
+    start = threading.Barrier(concurrency + 1)
+
+    def client():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+        start.wait()
+        while True:
+            with lock:
+                entry = next(position, None)
+            if entry is None:
+                break
+            began = time.perf_counter()
+            try:
+                conn.request("POST", "/run-backtest", body=payloads[entry], headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                status = None
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+            elapsed = time.perf_counter() - began
+            with lock:
+                samples.append((entry, elapsed, status))
+        conn.close()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - began
+
+
+def summarize(samples, wall):
+    """Throughput and latency percentiles (ms) of (entry, seconds, status) samples."""
+    latencies = np.array([seconds for _, seconds, _ in samples]) * 1000
+    errors = sum(1 for _, _, status in samples if status != 200)
+    row = {"requests": len(samples), "errors": errors, "throughput": len(samples) / wall if wall > 0 else 0.0}
+    for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES) if len(latencies) else [None] * len(PERCENTILES)):
+        row[f"p{q}_ms"] = float(value) if value is not None else None
+    row["mean_ms"] = float(latencies.mean()) if len(latencies) else None
+    row["max_ms"] = float(latencies.max()) if len(latencies) else None
+    return row
+
+
+def run_load(url, mix, concurrency=DEFAULT_CONCURRENCY, requests=50, warmup=1, seed=42,
+             response_format="columnar", include_data=True, log=None):
+    """
+    Replay the mix at every concurrency level.
+
+    Returns:
+        list: one row per level and mix entry ("strategy": "all" for the whole
+        level) with requests, errors, throughput (requests/s over the level's
+        wall time) and p50/p95/p99/mean/max latency in ms
+    """
+    payloads = [build_payload(strategy, bars, response_format, include_data) for strategy, bars, _ in mix]
+    if warmup:
+        replay(url, payloads, [i for i in range(len(mix)) for _ in range(warmup)], 1)
+
+    results = []
+    for level in concurrency:
+        samples, wall = replay(url, payloads, schedule(mix, requests, seed), level)
+        rows = [dict({"concurrency": level, "strategy": "all", "bars": None}, **summarize(samples, wall))]
+        for i, (strategy, bars, _) in enumerate(mix):
+            entry = [sample for sample in samples if sample[0] == i]
+            if entry:
+                rows.append(dict({"concurrency": level, "strategy": strategy, "bars": bars}, **summarize(entry, wall)))
+        results.extend(rows)
+        if log:
+            for row in rows:
+                bars = row["bars"] if row["bars"] is not None else ""
+                log(f"c={row['concurrency']:<4} {row['strategy']:>9} {bars:>9} {row['requests']:>6} req "
+                    f"{row['throughput']:8.2f} req/s  p50 {row['p50_ms']:9.2f}  p95 {row['p95_ms']:9.2f}  "
+                    f"p99 {row['p99_ms']:9.2f} ms  errors {row['errors']}")
+    return results
+
+
+def compare(baseline, current, tolerance=0.2, min_ms=5.0):
+    """
+    Compare two load test results level by level and entry by entry.
+
+    Returns:
+        list: (concurrency, strategy, bars, metric, baseline value, current
+        value) for every p95 latency higher, or throughput lower, than the
+        baseline by more than `tolerance`. Latencies under min_ms in both runs
+        are ignored as noise.
+    """
+    reference = {(r["concurrency"], r["strategy"], r["bars"]): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = reference.get((row["concurrency"], row["strategy"], row["bars"]))
+        if before is None:
+            continue
+        if row["strategy"] == "all" and row["throughput"] < before["throughput"] / (1 + tolerance):
+            regressions.append((row["concurrency"], row["strategy"], row["bars"], "throughput", before["throughput"], row["throughput"]))
+        if max(before["p95_ms"], row["p95_ms"]) >= min_ms and row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append((row["concurrency"], row["strategy"], row["bars"], "p95_ms", before["p95_ms"], row["p95_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", nargs="+", default=list(DEFAULT_MIX), help="strategy:bars[:weight] entries")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(DEFAULT_CONCURRENCY), help="client threads per level")
+    parser.add_argument("--requests", type=int, default=50, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed requests per mix entry before the levels")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the request order")
+    parser.add_argument("--format", default="columnar", choices=["columnar", "records"], help="response_format of the requests")
+    parser.add_argument("--no-data", action="store_true", help="send include_data=false")
+    parser.add_argument("--url", help="target a running service instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes of the started service")
+    parser.add_argument("--keep-caches", action="store_true", help="leave the result and indicator caches enabled")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    options = dict(requests=args.requests, warmup=args.warmup, seed=args.seed, response_format=args.format,
+                   include_data=not args.no_data, log=print)
+    if args.url:
+        wait_until_healthy(args.url)
+        results = run_load(args.url, mix, args.concurrency, **options)
+    else:
+        with start_service(args.workers, args.keep_caches) as url:
+            results = run_load(url, mix, args.concurrency, **options)
+
+    suite = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "url": args.url,
+            "workers": None if args.url else args.workers,
+            "caches": None if args.url else args.keep_caches,
+            "mix": args.mix,
+            "requests": args.requests,
+            "seed": args.seed,
+            "format": args.format,
+            "include_data": not args.no_data
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, suite, tolerance=args.tolerance)
+        for level, strategy, bars, metric, before, after in regressions:
+            print(f"REGRESSION c={level} {strategy} {bars or ''} {metric}: {before:.2f} -> {after:.2f}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
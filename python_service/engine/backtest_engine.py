@@ -1,42 +1,476 @@
+import numpy as np
 import pandas as pd
 
+from engine.downsample import downsample_indices
+from engine import monte_carlo
+from engine.risk import risk_metrics
+
+# Signal codes used by the array execution core
+BUY = 1
+SELL = -1
+HOLD = 0
+
+SIGNAL_CODES = {"BUY": BUY, "SELL": SELL}
+
+# Column order of the trade ledger arrays
+TRADE_FIELDS = ("entry_index", "exit_index", "entry_price", "exit_price", "quantity", "pnl", "pnl_pct")
+
+# Extended metrics added to the summary by engine.risk.risk_metrics
+RISK_FIELDS = ("max_drawdown", "max_drawdown_duration", "sharpe_ratio", "sortino_ratio", "cagr",
+               "profit_factor", "exposure", "avg_trade_duration")
+
+MODES = ("array", "reference")
+
+# Portfolio mode: capital allocated per BUY as equity / n_symbols ("equal")
+# or as a fixed fraction of equity ("fraction")
+SIZING_MODES = ("equal", "fraction")
+
+# Bars x symbols cells materialized at once when expanding portfolio positions
+PORTFOLIO_BLOCK_CELLS = 2_000_000
+
+# Bars executed between progress reports in run/run_arrays
+PROGRESS_BLOCK_BARS = 250_000
+
+
+def signals_to_arrays(signals, close):
+    """
+    Convert signals into (signal_codes, exec_prices) arrays aligned to close.
+
+    Accepts a columnar Signals object or a list of signal dicts. For dicts this
+    matches the lookup rules of the reference loop: only integer indices inside
+    the data are used, and when several signals share an index the last one wins.
+    """
+    n = len(close)
+    exec_prices = np.array(close, dtype=np.float64, copy=True)
+
+    if hasattr(signals, 'to_codes'):
+        exec_prices[signals.index] = signals.price
+        return signals.to_codes(n), exec_prices
+
+    codes = np.zeros(n, dtype=np.int8)
+
+    for sig in signals:
+        i = sig['index']
+        if not isinstance(i, (int, np.integer)) or isinstance(i, bool) or not 0 <= i < n:
+            continue
+        codes[i] = SIGNAL_CODES.get(sig['signal'], HOLD)
+        exec_prices[i] = sig.get('price', close[i])
+
+    return codes, exec_prices
+
+
+class ExecutionState:
+    """
+    Account state carried between blocks of bars by execute_signals.
+    """
+
+    def __init__(self, cash, position=0, entry_price=0, entry_index=0):
+        self.cash = cash
+        self.position = position
+        self.entry_price = entry_price
+        self.entry_index = entry_index
+
+
+def execute_signals(codes, exec_prices, state, offset=0):
+    """
+    Run the all-in/all-out state machine over one block of bars.
+
+    Cash/position only change on signal bars, so the loop walks the (sparse)
+    signal events instead of every candle. Executing a series block by block
+    with the returned state gives the same result as executing it at once.
+
+    Args:
+        codes (np.ndarray): Signal code per bar of the block
+        exec_prices (np.ndarray): Fill price per bar of the block
+        state (ExecutionState): State before the block's first bar
+        offset (int): Bar number of the block's first bar (for the trade ledger)
+
+    Returns:
+        tuple: (state after the block,
+                (change bars within the block, cash, position) starting with bar -1,
+                trade rows in TRADE_FIELDS order)
+    """
+    cash = state.cash
+    position = state.position
+    entry_price = state.entry_price
+    entry_index = state.entry_index
+
+    change_index = [-1]
+    change_cash = [cash]
+    change_position = [position]
+    rows = []
+
+    for i in np.flatnonzero(codes).tolist():
+        code = codes[i]
+        exec_price = exec_prices[i]
+
+        if code == BUY and position == 0:
+            quantity = cash // exec_price
+            if quantity > 0:
+                position = quantity
+                cash -= quantity * exec_price
+                entry_price = exec_price
+                entry_index = offset + i
+                change_index.append(i)
+                change_cash.append(cash)
+                change_position.append(position)
+
+        elif code == SELL and position > 0:
+            exit_price = exec_price
+            revenue = position * exit_price
+            cost = position * entry_price
+            pnl = revenue - cost
+            pnl_pct = (pnl / cost) * 100 if cost > 0 else 0
+
+            cash += revenue
+            rows.append((entry_index, offset + i, entry_price, exit_price, position, pnl, pnl_pct))
+
+            position = 0
+            entry_price = 0
+            change_index.append(i)
+            change_cash.append(cash)
+            change_position.append(position)
+
+    return ExecutionState(cash, position, entry_price, entry_index), (change_index, change_cash, change_position), rows
+
+
+def expand_equity(changes, close):
+    """Expand execute_signals change points to one equity value per bar."""
+    change_index, change_cash, change_position = changes
+    state = np.searchsorted(np.asarray(change_index), np.arange(len(close)), side='right') - 1
+    cash_per_bar = np.asarray(change_cash, dtype=np.float64)[state]
+    position_per_bar = np.asarray(change_position, dtype=np.float64)[state]
+    return cash_per_bar + position_per_bar * close
+
+
+def bars_in_market(ledger, n, state):
+    """Bars spent in the market: closed trades plus a position still open after n bars."""
+    held = int((ledger['exit_index'] - ledger['entry_index']).sum())
+    return held + (n - int(state.entry_index) if state.position > 0 else 0)
+
+
+def ledger_arrays(rows):
+    """Trade rows (tuples in TRADE_FIELDS order) as {field: array}."""
+    columns = list(zip(*rows)) if rows else [()] * len(TRADE_FIELDS)
+    return {
+        field: np.asarray(col, dtype=np.int64 if field.endswith("_index") else np.float64)
+        for field, col in zip(TRADE_FIELDS, columns)
+    }
+
+
 class BacktestEngine:
-    def __init__(self, initial_capital=100000):
+    def __init__(self, initial_capital=100000, mode="array"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown engine mode: {mode}")
         self.initial_capital = initial_capital
+        self.mode = mode
         self.cash = initial_capital
         self.position = 0
-        self.trades = []
-        self.equity_curve = []
+        self._reset()
 
-    def run(self, df, signals):
+    def _reset(self):
+        self.cash = self.initial_capital
+        self.position = 0
+        self.index = None
+        self.close = np.empty(0, dtype=np.float64)
+        self.equity = np.empty(0, dtype=np.float64)
+        self.ledger = {field: np.empty(0) for field in TRADE_FIELDS}
+        # Bars with an open position (exposure)
+        self.held_bars = 0
+        self.symbols = None
+        self.holdings = None
+        self._trades = None
+        self._equity_curve = None
+
+    @property
+    def trades(self):
+        """Trade ledger as a list of dicts (materialized on first access)."""
+        if self._trades is None:
+            self._trades = self._ledger_records()
+        return self._trades
+
+    @property
+    def equity_curve(self):
+        """Equity curve as a list of dicts (materialized on first access)."""
+        if self._equity_curve is None:
+            self._equity_curve = self._equity_records()
+        return self._equity_curve
+
+    def run(self, df, signals, mode=None, progress=None):
         """
         Execute signals on the dataframe and track equity curve.
+
+        mode='array' (default) runs the NumPy execution core, mode='reference'
+        runs the original per-candle loop. Both produce identical results.
+        progress is an optional progress("backtest", bars_done, bars_total)
+        hook called every PROGRESS_BLOCK_BARS bars; an exception it raises
+        (e.g. engine.jobs.JobCancelled) stops the run.
+        """
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown engine mode: {mode}")
+
+        if mode == "reference":
+            self._run_reference(df, signals, progress=progress)
+            return
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        codes, exec_prices = signals_to_arrays(signals, close)
+        self.run_arrays(close, codes, exec_prices, index=df.index, progress=progress)
+
+    def run_arrays(self, close, signal_codes, exec_prices=None, index=None, progress=None):
+        """
+        Execute a signal code array (BUY=1, SELL=-1, HOLD=0) against close prices.
+
+        Bars are executed in blocks of PROGRESS_BLOCK_BARS, carrying the
+        execution state across blocks, with a progress report after each.
+
+        Args:
+            close (np.ndarray): Close price per bar
+            signal_codes (np.ndarray): Signal code per bar
+            exec_prices (np.ndarray): Optional fill price per bar (defaults to close)
+            index (pd.Index): Optional labels used for equity curve timestamps
+            progress (callable): Optional progress("backtest", bars_done, bars_total) hook
+        """
+        self._reset()
+
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        codes = np.ascontiguousarray(signal_codes, dtype=np.int8)
+        if exec_prices is None:
+            exec_prices = close
+        exec_prices = np.ascontiguousarray(exec_prices, dtype=np.float64)
+
+        n = len(close)
+        state = ExecutionState(self.initial_capital)
+        equity = np.empty(n, dtype=np.float64)
+        rows = []
+        for start in range(0, n, PROGRESS_BLOCK_BARS):
+            end = min(n, start + PROGRESS_BLOCK_BARS)
+            state, changes, block_rows = execute_signals(codes[start:end], exec_prices[start:end], state, offset=start)
+            equity[start:end] = expand_equity(changes, close[start:end])
+            rows.extend(block_rows)
+            if progress is not None:
+                progress("backtest", end, n)
+
+        self.cash = state.cash
+        self.position = state.position
+        self.index = index
+        self.close = close
+        self.equity = equity
+        self.ledger = ledger_arrays(rows)
+        self.held_bars = bars_in_market(self.ledger, len(close), state)
+
+    def run_portfolio(self, prices, signal_codes, symbols=None, sizing="equal", fraction=None, index=None):
+        """
+        Execute a bars x symbols signal matrix against a bars x symbols price
+        matrix, sharing one cash balance across symbols.
+
+        A BUY on a flat symbol targets equity / n_symbols ("equal") or
+        equity * fraction ("fraction") in whole shares, with equity marked at
+        that bar. Sells are processed before buys on the same bar; buys are
+        filled in column order until cash runs out. A SELL closes the whole
+        position. Signals on bars with a missing (NaN) price are ignored.
+
+        Args:
+            prices (np.ndarray): Fill/valuation price per bar and symbol (forward-filled)
+            signal_codes (np.ndarray): Signal code per bar and symbol
+            symbols (list): Optional symbol names, one per column
+            sizing (str): 'equal' or 'fraction'
+            fraction (float): Fraction of equity per position for sizing='fraction'
+            index (pd.Index): Optional labels used for equity curve timestamps
+        """
+        if sizing not in SIZING_MODES:
+            raise ValueError(f"Unknown sizing mode: {sizing}")
+        if sizing == "fraction" and not (fraction is not None and 0 < fraction <= 1):
+            raise ValueError("fraction must be in (0, 1] for sizing='fraction'")
+
+        prices = np.asarray(prices, dtype=np.float64)
+        codes = np.asarray(signal_codes, dtype=np.int8)
+        if prices.ndim != 2 or prices.shape != codes.shape:
+            raise ValueError("prices and signal_codes must be matrices of the same shape")
+        n, m = prices.shape
+        symbols = list(range(m)) if symbols is None else list(symbols)
+        if len(symbols) != m:
+            raise ValueError("symbols must have one name per column")
+
+        self._reset()
+
+        # Sparse events ordered by bar, then symbol
+        event_bar, event_col = np.nonzero(codes)
+        event_code = codes[event_bar, event_col]
+        event_price = prices[event_bar, event_col]
+        tradable = np.isfinite(event_price) & (event_price > 0)
+        event_bar, event_col = event_bar[tradable], event_col[tradable]
+        event_code, event_price = event_code[tradable], event_price[tradable]
+        bounds = np.flatnonzero(np.diff(event_bar)) + 1
+        starts = np.concatenate([[0], bounds]).astype(np.int64)
+        ends = np.concatenate([bounds, [len(event_bar)]]).astype(np.int64)
+        if not len(event_bar):
+            starts = ends = np.empty(0, dtype=np.int64)
+
+        cash = self.initial_capital
+        position = np.zeros(m, dtype=np.float64)
+        entry_index = np.zeros(m, dtype=np.int64)
+        # Quantity traded by each event (0 = not executed); the ledger is built from it afterwards
+        event_quantity = np.zeros(len(event_bar), dtype=np.float64)
+
+        change_index = [-1]
+        change_cash = [cash]
+
+        for lo, hi in zip(starts.tolist(), ends.tolist()):
+            t = int(event_bar[lo])
+            cols = event_col[lo:hi]
+            code = event_code[lo:hi]
+            price = event_price[lo:hi]
+            held = position[cols] > 0
+            changed = False
+
+            sell = np.nonzero((code == SELL) & held)[0]
+            if len(sell):
+                s = cols[sell]
+                quantity = position[s]
+                cash += float(np.dot(quantity, price[sell]))
+                event_quantity[lo + sell] = quantity
+                position[s] = 0
+                changed = True
+
+            buy = np.nonzero((code == BUY) & ~held)[0]
+            if len(buy):
+                buy_price = price[buy]
+                open_cols = np.nonzero(position)[0]
+                equity = cash + float(np.dot(position[open_cols], prices[t, open_cols]))
+                target = equity / m if sizing == "equal" else equity * fraction
+
+                quantity = np.floor(target / buy_price)
+                spent = np.cumsum(quantity * buy_price)
+                fits = spent <= cash
+                if not fits.all():
+                    # The first order that does not fit gets the remaining cash, later ones nothing
+                    k = int(np.argmin(fits))
+                    quantity[k] = (cash - (spent[k - 1] if k else 0.0)) // buy_price[k]
+                    quantity[k + 1:] = 0
+                    spent = np.cumsum(quantity * buy_price)
+
+                filled = quantity > 0
+                if filled.any():
+                    f = cols[buy[filled]]
+                    position[f] = quantity[filled]
+                    entry_index[f] = t
+                    event_quantity[lo + buy[filled]] = quantity[filled]
+                    cash -= float(spent[-1])
+                    changed = True
+
+            if changed:
+                change_index.append(t)
+                change_cash.append(cash)
+
+        # Executed events alternate BUY, SELL per symbol: pair each SELL with the fill before it
+        executed = np.flatnonzero(event_quantity > 0)
+        executed = executed[np.argsort(event_col[executed], kind='stable')]
+        is_exit = np.flatnonzero(event_code[executed] == SELL)
+        exits, entries = executed[is_exit], executed[is_exit - 1]
+        order = np.argsort(exits, kind='stable')
+        exits, entries = exits[order], entries[order]
+
+        quantity = event_quantity[exits]
+        entry_prices = event_price[entries]
+        exit_prices = event_price[exits]
+        cost = quantity * entry_prices
+        pnl = quantity * exit_prices - cost
+        ledger = {
+            "entry_index": event_bar[entries].astype(np.int64),
+            "exit_index": event_bar[exits].astype(np.int64),
+            "entry_price": entry_prices,
+            "exit_price": exit_prices,
+            "quantity": quantity,
+            "pnl": pnl,
+            "pnl_pct": np.divide(pnl, cost, out=np.zeros_like(pnl), where=cost > 0) * 100,
+            "symbol": event_col[exits].astype(np.int64)
+        }
+
+        state = np.searchsorted(np.asarray(change_index), np.arange(n), side='right') - 1
+        cash_per_bar = np.asarray(change_cash, dtype=np.float64)[state]
+
+        # Open positions at the end are held through the last bar
+        still_open = np.flatnonzero(position)
+        holdings = self._holdings_value(
+            prices,
+            np.concatenate([ledger["entry_index"], entry_index[still_open]]),
+            np.concatenate([ledger["exit_index"], np.full(len(still_open), n, dtype=np.int64)]),
+            np.concatenate([ledger["symbol"], still_open]),
+            np.concatenate([ledger["quantity"], position[still_open]])
+        )
+
+        self.cash = cash
+        self.position = position
+        self.index = index
+        self.symbols = symbols
+        self.holdings = holdings
+        # curve_bars keeps the extremes of self.close; for a portfolio that is the holdings value
+        self.close = holdings
+        self.equity = cash_per_bar + holdings
+        self.ledger = ledger
+        self.held_bars = int(np.count_nonzero(holdings))
+
+    @staticmethod
+    def _holdings_value(prices, entries, exits, cols, quantities):
+        """
+        Market value of all positions per bar. A position is held on bars
+        [entry, exit); positions are expanded block by block to bound memory.
+        """
+        n, m = prices.shape
+        rows = np.concatenate([entries, exits])
+        delta_cols = np.concatenate([cols, cols])
+        deltas = np.concatenate([quantities, -quantities])
+        inside = rows < n
+        rows, delta_cols, deltas = rows[inside], delta_cols[inside], deltas[inside]
+        order = np.argsort(rows, kind='stable')
+        rows, delta_cols, deltas = rows[order], delta_cols[order], deltas[order]
+
+        holdings = np.zeros(n, dtype=np.float64)
+        carry = np.zeros(m, dtype=np.float64)
+        block = max(1, PORTFOLIO_BLOCK_CELLS // max(m, 1))
+        for b0 in range(0, n, block):
+            b1 = min(n, b0 + block)
+            lo, hi = np.searchsorted(rows, [b0, b1])
+            if lo == hi and not carry.any():
+                continue
+            dense = np.zeros((b1 - b0, m), dtype=np.float64)
+            np.add.at(dense, (rows[lo:hi] - b0, delta_cols[lo:hi]), deltas[lo:hi])
+            held = np.cumsum(dense, axis=0)
+            held += carry
+            carry = held[-1].copy()
+            holdings[b0:b1] = np.where(held != 0, held * prices[b0:b1], 0.0).sum(axis=1)
+        return holdings
+
+    def _run_reference(self, df, signals, progress=None):
+        """
+        Original per-candle loop, kept as a reference implementation.
         """
         # Reset state
-        self.cash = self.initial_capital
-        self.position = 0
-        self.trades = []
-        self.equity_curve = []
-        
+        self._reset()
+        trades = []
+        equity_curve = []
+
         # Create a dict for faster signal lookup: index -> signal_obj
         # Assuming index is integer 0..N
         signal_map = {s['index']: s for s in signals}
-        
+
         entry_price = 0
         entry_index = 0
-        
+
         # Iterate through every candle in the dataframe
         # Assuming df has integer index or we iterate length
         for i in range(len(df)):
             price = df.iloc[i]['close']
-            
+
             # 1. Process Signal if exists at this index
             if i in signal_map:
                 sig = signal_map[i]
-                
+
                 # Use signal price if available, else close
                 exec_price = sig.get('price', price)
-                
+
                 # BUY Logic
                 if sig['signal'] == "BUY" and self.position == 0:
                     quantity = self.cash // exec_price
@@ -45,7 +479,7 @@ class BacktestEngine:
                         self.cash -= quantity * exec_price
                         entry_price = exec_price
                         entry_index = i
-                
+
                 # SELL Logic
                 elif sig['signal'] == "SELL" and self.position > 0:
                     exit_price = exec_price
@@ -53,10 +487,10 @@ class BacktestEngine:
                     cost = self.position * entry_price
                     pnl = revenue - cost
                     pnl_pct = (pnl / cost) * 100 if cost > 0 else 0
-                    
+
                     self.cash += revenue
-                    
-                    self.trades.append({
+
+                    trades.append({
                         "entry_index": entry_index,
                         "exit_index": i,
                         "entry_price": entry_price,
@@ -65,49 +499,185 @@ class BacktestEngine:
                         "pnl": pnl,
                         "pnl_pct": pnl_pct
                     })
-                    
+
                     self.position = 0
                     entry_price = 0
 
             # 2. Track Equity for this candle
             # Equity = Cash + (Position * Current Close)
             current_equity = self.cash + (self.position * price)
-            
+
             # Store timestamp if available, else index
             timestamp = str(df.index[i]) if str(df.index[i]) != str(i) else i
-                
-            self.equity_curve.append({
+
+            equity_curve.append({
                 "index": i,
                 "timestamp": timestamp,
                 "equity": current_equity,
                 "price": price
             })
 
-    def get_results(self):
+            if progress is not None and ((i + 1) % PROGRESS_BLOCK_BARS == 0 or i + 1 == len(df)):
+                progress("backtest", i + 1, len(df))
+
+        self._trades = trades
+        self._equity_curve = equity_curve
+        self.index = df.index
+        self.close = np.array([p['price'] for p in equity_curve], dtype=np.float64)
+        self.equity = np.array([p['equity'] for p in equity_curve], dtype=np.float64)
+        self.ledger = {
+            field: np.array([t[field] for t in trades], dtype=np.int64 if field.endswith("_index") else np.float64)
+            for field in TRADE_FIELDS
+        }
+        self.held_bars = bars_in_market(self.ledger, len(df), ExecutionState(self.cash, self.position, entry_price, entry_index))
+
+    def _timestamps(self, bars):
+        if self.index is None or (isinstance(self.index, pd.RangeIndex) and self.index.start == 0 and self.index.step == 1):
+            return bars.tolist()
+        index = self.index[bars]
+        if isinstance(index, pd.DatetimeIndex) and index.tz is None and not index.hasnans and (index == index.floor('s')).all():
+            # Same text as str(Timestamp) for whole seconds, formatted in one vectorized call
+            return np.char.replace(np.datetime_as_string(index.to_numpy(), unit='s'), 'T', ' ').tolist()
+        labels = list(map(str, index))
+        return [i if label == str(i) else label for i, label in zip(bars.tolist(), labels)]
+
+    def curve_bars(self, max_points=None):
         """
-        Return portfolio metrics including win/loss stats.
+        Bars of the equity curve to return: all of them, or an LTTB selection of
+        about max_points that always keeps trade bars and drawdown/price extremes.
+        """
+        keep = np.concatenate([self.ledger['entry_index'], self.ledger['exit_index']])
+        return downsample_indices(self.equity, self.close, max_points, keep=keep)
+
+    def _equity_records(self, bars=None):
+        bars = np.arange(len(self.equity)) if bars is None else bars
+        return [
+            {"index": i, "timestamp": ts, "equity": equity, "price": price}
+            for i, ts, equity, price in zip(bars.tolist(), self._timestamps(bars), self.equity[bars].tolist(), self.close[bars].tolist())
+        ]
+
+    def _ledger_records(self):
+        columns = [self.ledger[field].tolist() for field in TRADE_FIELDS]
+        return [dict(zip(TRADE_FIELDS, row)) for row in zip(*columns)]
+
+    def get_summary(self, risk=True):
+        """
+        Return portfolio metrics without the trade ledger and equity curve.
+
+        risk=False skips the drawdown, ratio and exposure metrics (see
+        engine.risk.risk_metrics), which take a pass over the equity curve.
         """
         # Final Equity
-        final_value = self.equity_curve[-1]['equity'] if self.equity_curve else self.initial_capital
-        
+        final_value = self.equity[-1].item() if len(self.equity) else self.initial_capital
+
         total_return = final_value - self.initial_capital
         return_pct = (total_return / self.initial_capital) * 100 if self.initial_capital > 0 else 0
-        
+
         # Win/Loss Stats
-        winning_trades = [t for t in self.trades if t['pnl'] > 0]
-        losing_trades = [t for t in self.trades if t['pnl'] <= 0]
-        
-        win_rate = (len(winning_trades) / len(self.trades) * 100) if self.trades else 0
-        
-        return {
+        pnl = self.ledger['pnl']
+        total_trades = len(pnl)
+        winning_trades = int(np.count_nonzero(pnl > 0))
+        losing_trades = total_trades - winning_trades
+
+        win_rate = (winning_trades / total_trades * 100) if total_trades else 0
+
+        summary = {
             "initial_capital": self.initial_capital,
             "final_balance": final_value,
             "net_profit": total_return,
             "roi": return_pct,
-            "total_trades": len(self.trades),
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
-            "win_rate": win_rate,
-            "trades": self.trades,
-            "equity_curve": self.equity_curve
+            "total_trades": total_trades,
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "win_rate": win_rate
+        }
+        if risk:
+            if len(self.equity):
+                summary.update(risk_metrics(self.equity, self.initial_capital, self.ledger, self.held_bars, self.index))
+            else:
+                summary.update(dict.fromkeys(RISK_FIELDS))
+        return summary
+
+    def symbol_ledgers(self):
+        """
+        Split a portfolio run's trade ledger into {symbol: {field: array}}.
+        """
+        symbol_col = self.ledger["symbol"]
+        order = np.argsort(symbol_col, kind='stable')
+        bounds = np.searchsorted(symbol_col[order], np.arange(len(self.symbols) + 1))
+        return {
+            symbol: {field: self.ledger[field][order[bounds[i]:bounds[i + 1]]] for field in TRADE_FIELDS}
+            for i, symbol in enumerate(self.symbols)
         }
+
+    def get_portfolio_results(self, max_points=None):
+        """
+        Return portfolio metrics, per-symbol stats and ledgers, and the combined
+        equity curve (equity, cash and holdings value) as arrays.
+
+        max_points optionally downsamples the equity curve (see curve_bars).
+        """
+        bars = self.curve_bars(max_points)
+        m = len(self.symbols)
+        symbol_col = self.ledger["symbol"]
+        pnl = self.ledger["pnl"]
+
+        results = self.get_summary()
+        results["symbols"] = {
+            "symbol": list(self.symbols),
+            "total_trades": np.bincount(symbol_col, minlength=m),
+            "winning_trades": np.bincount(symbol_col, weights=pnl > 0, minlength=m).astype(np.int64),
+            "net_profit": np.bincount(symbol_col, weights=pnl, minlength=m),
+            "open_quantity": self.position
+        }
+        results["trades"] = self.symbol_ledgers()
+        results["equity_curve"] = {
+            "index": bars,
+            "timestamp": self._timestamps(bars),
+            "equity": self.equity[bars],
+            "holdings": self.holdings[bars],
+            "cash": self.equity[bars] - self.holdings[bars]
+        }
+        return results
+
+    def monte_carlo(self, paths=10000, method="bootstrap", block_size=None, seed=None):
+        """
+        Resample the trade ledger into `paths` equity paths (see engine.monte_carlo.simulate).
+        """
+        return monte_carlo.simulate(self.ledger['pnl'], self.initial_capital, paths=paths,
+                                    method=method, block_size=block_size, seed=seed)
+
+    def get_columnar_results(self, max_points=None):
+        """
+        Return portfolio metrics with the trade ledger and equity curve as arrays.
+
+        max_points optionally downsamples the equity curve (see curve_bars).
+        """
+        bars = self.curve_bars(max_points)
+        results = self.get_summary()
+        results["trades"] = dict(self.ledger)
+        results["equity_curve"] = self.curve_columns(bars)
+        return results
+
+    def curve_columns(self, bars):
+        """Equity curve points for the given bars as {index, timestamp, equity, price} arrays."""
+        return {
+            "index": bars,
+            "timestamp": self._timestamps(bars),
+            "equity": self.equity[bars],
+            "price": self.close[bars]
+        }
+
+    def get_results(self, max_points=None):
+        """
+        Return portfolio metrics including win/loss stats.
+
+        max_points optionally downsamples the equity curve (see curve_bars).
+        """
+        results = self.get_summary()
+        results["trades"] = self.trades
+        if max_points and len(self.equity) > max_points:
+            results["equity_curve"] = self._equity_records(self.curve_bars(max_points))
+        else:
+            results["equity_curve"] = self.equity_curve
+        return results
@@ -0,0 +1,190 @@
+"""
+Batch backtests: many (dataset, strategy, params) jobs planned together.
+
+Jobs are grouped by dataset and strategy and their signals are generated
+one after another in the calling process, so every indicator that several
+jobs share (the same SMA window, RSI period or breakout lookback on the same
+bars) is computed once and then served from the indicator cache. Identical
+jobs are run once.
+
+The backtests are independent and go to a process pool. Workers read each
+dataset's closes (and timestamps) from a shared memory block and receive only
+the sparse signal events, so a job costs a few bytes per signal to dispatch
+rather than a copy of the bars. Results are yielded as each job finishes; a
+job that fails yields its error without affecting the others.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from engine.backtest_engine import BacktestEngine, signals_to_arrays
+from engine.strategy_runner import load_strategy
+
+# Batches with fewer bars x jobs than this run in process; starting workers costs more than it saves
+INLINE_BAR_JOBS = 2_000_000
+
+# Attached in each worker process by _attach
+_shared = {}
+
+
+def _open_block(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(layouts):
+    """Worker initializer: map every dataset block as (close, index) without copying."""
+    for group, (name, bars, unit, index) in layouts.items():
+        shm = _open_block(name)
+        block = np.ndarray((2 if unit else 1, bars), dtype=np.float64, buffer=shm.buf)
+        if unit:
+            index = pd.DatetimeIndex(block[1].view(f'M8[{unit}]'), name=index, copy=False)
+        _shared[group] = (shm, block[0], index)
+
+
+def _run(close, index, events, codes, prices, initial_capital, max_points):
+    """Engine run from sparse signal events over a dataset's closes."""
+    signal_codes = np.zeros(len(close), dtype=np.int8)
+    signal_codes[events] = codes
+    exec_prices = close.copy()
+    exec_prices[events] = prices
+    engine = BacktestEngine(initial_capital=initial_capital)
+    engine.run_arrays(close, signal_codes, exec_prices, index=index)
+    return engine.get_columnar_results(max_points)
+
+
+def _backtest(group, *args):
+    """_run over a shared dataset block (runs in a worker)."""
+    _, close, index = _shared[group]
+    return _run(close, index, *args)
+
+
+def _layout(df):
+    """
+    Shared memory block with the closes and, for a naive DatetimeIndex, the
+    timestamps of a frame. Returns the block and its layout for _attach:
+    (name, bars, timestamp unit or None, index name or the index itself).
+    """
+    index = df.index
+    unit = index.unit if isinstance(index, pd.DatetimeIndex) and index.tz is None else None
+    rows = [df['close'].to_numpy(dtype=np.float64)]
+    if unit:
+        rows.append(index.asi8.view(np.float64))
+    shm = shared_memory.SharedMemory(create=True, size=max(8 * len(rows) * len(df), 1))
+    np.ndarray((len(rows), len(df)), dtype=np.float64, buffer=shm.buf)[:] = rows
+    # Other indexes are pickled: a RangeIndex is a few bytes, anything else is rare
+    return shm, (shm.name, len(df), unit, index.name if unit else index)
+
+
+def _job_key(job):
+    return (job["group"], job["strategy"].lower(), repr(sorted(job["params"].items())))
+
+
+def run_batch(jobs, initial_capital=100000, max_points=None, include_signals=False, workers=None):
+    """
+    Run a batch of backtests, yielding results as they finish.
+
+    Args:
+        jobs (list): dicts with "df" (OHLCV DataFrame), "group" (hashable id
+            of the dataset; jobs with the same group must have the same bars),
+            "strategy" and "params"
+        initial_capital (float): Starting cash per job
+        max_points (int): Optional point budget for each equity curve
+        include_signals (bool): Also return each job's signal list
+        workers (int): Worker processes (default and at most: CPU count; 1 = in process)
+
+    Yields:
+        (int, dict, str): job position, then the result
+        ({"strategy", "params", "format": "columnar", ["signals"], "backtest"})
+        or None and the error message
+    """
+    jobs = list(jobs)
+    # Identical jobs run once; the others get a copy of the outcome
+    runs = {}
+    for i, job in enumerate(jobs):
+        runs.setdefault(_job_key(job), []).append(i)
+    order = sorted(runs.values(), key=lambda same: (str(jobs[same[0]]["group"]), jobs[same[0]]["strategy"].lower()))
+
+    frames = {}
+    for job in jobs:
+        frames.setdefault(job["group"], job["df"])
+    closes = {group: df['close'].to_numpy(dtype=np.float64) for group, df in frames.items()}
+    # Client-supplied worker counts never exceed the CPUs
+    cpus = os.cpu_count() or 1
+    workers = min(workers or cpus, cpus)
+    if len(order) == 1 or sum(len(jobs[same[0]]["df"]) for same in order) < INLINE_BAR_JOBS:
+        workers = 1
+
+    blocks = {}
+    pool = None
+    try:
+        if workers > 1:
+            layouts = {}
+            for group, df in frames.items():
+                blocks[group], layouts[group] = _layout(df)
+            pool = ProcessPoolExecutor(max_workers=min(workers, len(order)), initializer=_attach, initargs=(layouts,))
+
+        pending = {}
+        for same in order:
+            job = jobs[same[0]]
+            try:
+                signals = load_strategy(job["strategy"]).generate_signals(job["df"], job["params"])
+                codes, exec_prices = signals_to_arrays(signals, closes[job["group"]])
+                events = np.flatnonzero(codes)
+                args = (events, codes[events], exec_prices[events], initial_capital, max_points)
+                header = {"strategy": job["strategy"], "params": job["params"], "format": "columnar"}
+                if include_signals:
+                    header["signals"] = signals.to_columns()
+                if pool is None:
+                    result = dict(header, backtest=_run(closes[job["group"]], job["df"].index, *args))
+                else:
+                    pending[pool.submit(_backtest, job["group"], *args)] = (same, header)
+            except Exception as e:
+                yield from _fan_out(same, None, _error(e))
+                continue
+
+            if pool is None:
+                yield from _fan_out(same, result, None)
+                continue
+            # Hand back finished jobs while signals for the rest are generated
+            for future in [future for future in pending if future.done()]:
+                yield from _collect(future, pending)
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from _collect(future, pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+def _error(e):
+    if isinstance(e, BrokenProcessPool):
+        return "Worker process died"
+    return str(e) or type(e).__name__
+
+
+def _collect(future, pending):
+    same, header = pending.pop(future)
+    try:
+        result = dict(header, backtest=future.result())
+    except Exception as e:
+        yield from _fan_out(same, None, _error(e))
+        return
+    yield from _fan_out(same, result, None)
+
+
+def _fan_out(same, result, error):
+    """Yield one outcome for every position of a job."""
+    for i in same:
+        yield i, result, error
@@ -0,0 +1,198 @@
+"""
+Out-of-core backtests over memory-mapped history.
+
+History files are structured .npy arrays with an optional int64 'ts' column
+(epoch nanoseconds, UTC) and float64 OHLCV columns, the layout the market
+data store writes. run_chunked() memory-maps the file and streams it in
+fixed-size chunks: the strategy's chunk state carries indicator warm-up
+across chunk boundaries and the execution state carries cash, position and
+the open entry. The equity curve is spilled to a temporary file and
+downsampled block by block, so peak memory follows the chunk size rather
+than the length of the history.
+
+Results are identical to run_strategy(df, ..., response_format="columnar",
+include_data=False) on the same bars. Put named history files in
+HISTORY_DIR (default: python_service/history).
+"""
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from engine.backtest_engine import (BacktestEngine, ExecutionState, bars_in_market, execute_signals,
+                                    expand_equity, ledger_arrays, signals_to_arrays)
+from engine.signals import Signals
+from engine.strategy_runner import load_strategy
+
+HISTORY_COLUMNS = ("open", "high", "low", "close", "volume")
+
+DEFAULT_CHUNK_BARS = 1_000_000
+
+HISTORY_DIR = os.environ.get("HISTORY_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "history"))
+
+DATASET_NAME = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+
+
+def history_path(dataset):
+    """
+    Path of the named history file (<dataset>.npy) in HISTORY_DIR.
+
+    Raises FileNotFoundError for unknown datasets.
+    """
+    if not DATASET_NAME.match(dataset):
+        raise ValueError(f"Invalid dataset name: {dataset}")
+    path = os.path.join(HISTORY_DIR, dataset + ".npy")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Unknown dataset: {dataset}")
+    return path
+
+
+def save_history(df, path):
+    """
+    Write an OHLCV DataFrame as a history file.
+
+    A DatetimeIndex is stored in 'ts' (tz-aware indexes are converted to
+    UTC); other indexes are not stored.
+    """
+    index = df.index
+    has_ts = isinstance(index, pd.DatetimeIndex)
+    fields = ([('ts', '<i8')] if has_ts else []) + [(col, '<f8') for col in HISTORY_COLUMNS if col in df.columns]
+    records = np.lib.format.open_memmap(path, mode='w+', dtype=fields, shape=(len(df),))
+    if has_ts:
+        if index.tz is not None:
+            index = index.tz_convert(None)
+        records['ts'] = index.as_unit('ns').asi8
+    for name in records.dtype.names:
+        if name != 'ts':
+            records[name] = df[name].to_numpy(dtype=np.float64)
+    records.flush()
+    del records
+
+
+def open_history(path):
+    """Memory-map a history file as a read-only structured array."""
+    records = np.load(path, mmap_mode='r')
+    if records.dtype.names is None or 'close' not in records.dtype.names:
+        raise ValueError("History must be a structured array with a 'close' column")
+    return records
+
+
+def load_history(path):
+    """Read a whole history file into an OHLCV DataFrame (the in-memory counterpart of run_chunked)."""
+    records = open_history(path)
+    columns = {name: np.array(records[name], dtype=np.float64) for name in records.dtype.names if name != 'ts'}
+    index = HistoryIndex(records['ts'])[slice(None)] if 'ts' in records.dtype.names else None
+    return pd.DataFrame(columns, index=index)
+
+
+def iter_chunks(records, chunk_size):
+    """Yield (first bar, {column: float64 array}) for consecutive chunks of a history."""
+    names = [name for name in records.dtype.names if name != 'ts']
+    for start in range(0, len(records), chunk_size):
+        block = records[start:start + chunk_size]
+        yield start, {name: np.ascontiguousarray(block[name], dtype=np.float64) for name in names}
+
+
+class HistoryIndex:
+    """
+    Timestamps of a memory-mapped history, materialized only for the bars
+    that are looked up (the bars of the returned equity curve).
+    """
+
+    def __init__(self, ts):
+        self.ts = ts
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, bars):
+        return pd.DatetimeIndex(np.asarray(self.ts[bars]).view('M8[ns]'), name='index')
+
+
+def concat_signals(parts):
+    """Join per-chunk Signals whose indices are already global bar numbers."""
+    if not parts:
+        return Signals.empty()
+    values = [part.reason_values for part in parts]
+    return Signals(
+        np.concatenate([part.index for part in parts]),
+        np.concatenate([part.side for part in parts]),
+        np.concatenate([part.price for part in parts]),
+        parts[-1].reasons,
+        np.concatenate(values) if all(v is not None for v in values) else None
+    )
+
+
+def run_chunked(history, strategy_name, params, chunk_size=DEFAULT_CHUNK_BARS, initial_capital=100000,
+                max_points=None, include_signals=False, progress=None):
+    """
+    Backtest a strategy over a history chunk by chunk.
+
+    Args:
+        history (str or np.ndarray): History file path, or a structured array
+            (e.g. from open_history)
+        strategy_name (str): 'sma', 'rsi', or 'breakout'
+        params (dict): Strategy parameters
+        chunk_size (int): Bars per chunk
+        initial_capital (float): Starting cash
+        max_points (int): Optional point budget for the equity curve (None = full resolution)
+        include_signals (bool): Also return the signal list (grows with the history)
+        progress (callable): Optional progress(stage, bars_done, bars_total) hook, called per chunk
+
+    Returns:
+        dict: {"strategy", "format": "columnar", "bars", "chunks", "backtest"}
+        plus "signals" when requested; encode with engine.serialization.dumps.
+    """
+    module = load_strategy(strategy_name)
+    if not hasattr(module, 'chunk_state'):
+        raise ValueError(f"Strategy {strategy_name} does not support chunked runs")
+    chunk_size = int(chunk_size)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    records = open_history(history) if isinstance(history, (str, os.PathLike)) else history
+    if records.dtype.names is None or 'close' not in records.dtype.names:
+        raise ValueError("History must be a structured array with a 'close' column")
+    if progress is None:
+        progress = lambda stage, bars_done=None, bars_total=None: None
+
+    n = len(records)
+    state = module.chunk_state(params)
+    execution = ExecutionState(initial_capital)
+    rows = []
+    signal_parts = []
+    chunks = 0
+
+    with tempfile.TemporaryFile() as spill:
+        equity = np.asarray(np.memmap(spill, dtype=np.float64, mode='w+', shape=(n,))) if n else np.empty(0)
+
+        for start, chunk in iter_chunks(records, chunk_size):
+            progress("backtest", start, n)
+            close = chunk['close']
+            signals = state.update(chunk)
+            codes, exec_prices = signals_to_arrays(signals, close)
+            execution, changes, chunk_rows = execute_signals(codes, exec_prices, execution, offset=start)
+            equity[start:start + len(close)] = expand_equity(changes, close)
+            rows.extend(chunk_rows)
+            if include_signals:
+                signal_parts.append(Signals(signals.index + start, signals.side, signals.price,
+                                            signals.reasons, signals.reason_values))
+            chunks += 1
+        progress("results", n, n)
+
+        engine = BacktestEngine(initial_capital=initial_capital)
+        engine.cash = execution.cash
+        engine.position = execution.position
+        engine.index = HistoryIndex(records['ts']) if 'ts' in records.dtype.names else pd.RangeIndex(n)
+        engine.close = np.asarray(records['close'])
+        engine.equity = equity
+        engine.ledger = ledger_arrays(rows)
+        engine.held_bars = bars_in_market(engine.ledger, n, execution)
+
+        result = {"strategy": strategy_name, "format": "columnar", "bars": n, "chunks": chunks}
+        if include_signals:
+            result["signals"] = concat_signals(signal_parts).to_columns()
+        result["backtest"] = engine.get_columnar_results(max_points)
+        del engine, equity
+    return result
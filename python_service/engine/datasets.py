@@ -0,0 +1,237 @@
+"""
+Process-level registry of uploaded OHLCV datasets.
+
+A client uploads bars once (POST /datasets) and refers to them by id in later
+backtest, sweep and walk-forward requests instead of resending the data. The
+id is a content hash of the columns and timestamps, so uploading the same bars
+again returns the same id.
+
+Datasets are kept as read-only NumPy arrays. get() wraps them in a new
+DataFrame without copying, so a caller that adds or assigns columns changes
+only its own frame. The least recently used datasets are evicted once the
+registry exceeds its byte budget; with a spill directory they are written
+there first and loaded back on the next get().
+
+Configure with DATASET_CACHE_MB (default 512) and DATASET_SPILL_DIR (unset
+disables spilling).
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DATASET_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Field of a spill file holding the timestamps
+TS_FIELD = "__timestamp__"
+
+
+class UnknownDataset(LookupError):
+    pass
+
+
+def dataset_id(columns, ts):
+    """Content hash of a dataset's columns ({name: array}) and datetime64 timestamps (or None)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name, values in sorted(columns.items()):
+        digest.update(f"{name}:{values.dtype.str}:{len(values)};".encode())
+        digest.update(values.tobytes())
+    if ts is not None:
+        digest.update(f"ts:{ts.dtype.str};".encode())
+        digest.update(ts.tobytes())
+    return digest.hexdigest()
+
+
+class Dataset:
+    def __init__(self, columns, ts, index_name='index'):
+        self.columns = columns
+        self.ts = ts
+        self.index_name = index_name
+        self.rows = len(next(iter(columns.values())))
+        self.nbytes = sum(values.nbytes for values in columns.values()) + (ts.nbytes if ts is not None else 0)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Read-only copy of a DataFrame's numeric columns and DatetimeIndex (tz-aware indexes as UTC)."""
+        has_ts = isinstance(df.index, pd.DatetimeIndex)
+        columns = {}
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype.kind not in 'iufb':
+                # Text timestamps are already parsed into the index
+                if has_ts and name == 'timestamp':
+                    continue
+                raise ValueError(f"Dataset column {name} must be numeric")
+            columns[str(name)] = np.array(values)
+        if 'close' not in columns:
+            raise ValueError("Data must include a 'close' column")
+
+        ts = None
+        if has_ts:
+            index = df.index.tz_convert(None) if df.index.tz is not None else df.index
+            ts = index.to_numpy().copy()
+        for values in list(columns.values()) + ([ts] if ts is not None else []):
+            values.flags.writeable = False
+        return cls(columns, ts, df.index.name if has_ts else 'index')
+
+    def frame(self):
+        index = pd.DatetimeIndex(self.ts, name=self.index_name, copy=False) if self.ts is not None else None
+        return pd.DataFrame(self.columns, index=index, copy=False)
+
+    def info(self):
+        span = self.ts is not None and self.rows > 0
+        return {"rows": self.rows, "columns": list(self.columns), "bytes": self.nbytes,
+                "start": str(pd.Timestamp(self.ts[0])) if span else None,
+                "end": str(pd.Timestamp(self.ts[-1])) if span else None}
+
+
+class DatasetRegistry:
+    def __init__(self, max_bytes=512 * 1024 * 1024, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+
+    def configure(self, max_bytes=None, spill_dir=None):
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if spill_dir is not None:
+                self.spill_dir = spill_dir or None
+            self._evict(self.max_bytes)
+
+    def register(self, df):
+        """
+        Store a DataFrame's bars.
+
+        Returns:
+            (str, bool): dataset id and whether it was newly stored
+        """
+        dataset = Dataset.from_frame(df)
+        key = dataset_id(dataset.columns, dataset.ts)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return key, False
+            created = not os.path.exists(self._spill_path(key)) if self.spill_dir else True
+            self._admit(key, dataset)
+        return key, created
+
+    def get(self, key):
+        """
+        DataFrame for a registered dataset (columns are read-only views).
+
+        Raises UnknownDataset for ids that were never registered or were evicted without spilling.
+        """
+        return self.dataset(key).frame()
+
+    def dataset(self, key):
+        with self._lock:
+            dataset = self._entries.get(key)
+            if dataset is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dataset
+            self.misses += 1
+
+        dataset = self._load_spilled(key)
+        with self._lock:
+            if key not in self._entries:
+                self._admit(key, dataset)
+            return self._entries.get(key, dataset)
+
+    def info(self, key):
+        return dict(self.dataset(key).info(), dataset_id=key)
+
+    def delete(self, key):
+        """Remove a dataset from memory and the spill directory; False if it was unknown."""
+        with self._lock:
+            dataset = self._entries.pop(key, None)
+            if dataset is not None:
+                self._bytes -= dataset.nbytes
+        path = self._spill_path(key)
+        spilled = path is not None and os.path.exists(path)
+        if spilled:
+            os.remove(path)
+        return dataset is not None or spilled
+
+    def _admit(self, key, dataset):
+        self._entries[key] = dataset
+        self._bytes += dataset.nbytes
+        # Keep the new entry even when it alone exceeds the budget; it goes on the next admit
+        self._evict(max(self.max_bytes, dataset.nbytes))
+
+    def _evict(self, limit):
+        while self._entries and self._bytes > limit:
+            key, dataset = self._entries.popitem(last=False)
+            self._bytes -= dataset.nbytes
+            self.evictions += 1
+            if self.spill_dir:
+                self._spill(key, dataset)
+
+    def _spill_path(self, key):
+        if not self.spill_dir or not DATASET_ID.match(key):
+            return None
+        return os.path.join(self.spill_dir, key + ".npy")
+
+    def _spill(self, key, dataset):
+        path = self._spill_path(key)
+        if path is None or os.path.exists(path):
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        fields = ([(TS_FIELD, dataset.ts.dtype)] if dataset.ts is not None else []) + [(name, values.dtype) for name, values in dataset.columns.items()]
+        records = np.empty(dataset.rows, dtype=fields)
+        if dataset.ts is not None:
+            records[TS_FIELD] = dataset.ts
+        for name, values in dataset.columns.items():
+            records[name] = values
+        # Write to a temporary name so a concurrent load never sees a partial file
+        partial = path + ".partial"
+        with open(partial, "wb") as f:
+            np.save(f, records)
+        os.replace(partial, path)
+        self.spills += 1
+
+    def _load_spilled(self, key):
+        path = self._spill_path(key)
+        if path is None or not os.path.exists(path):
+            raise UnknownDataset(f"Unknown or evicted dataset: {key}")
+        records = np.load(path)
+        columns = {name: records[name].copy() for name in records.dtype.names if name != TS_FIELD}
+        ts = records[TS_FIELD].copy() if TS_FIELD in records.dtype.names else None
+        for values in list(columns.values()) + ([ts] if ts is not None else []):
+            values.flags.writeable = False
+        return Dataset(columns, ts)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "spill_dir": self.spill_dir,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "spills": self.spills,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+dataset_registry = DatasetRegistry(max_bytes=int(float(os.environ.get("DATASET_CACHE_MB", 512)) * 1024 * 1024),
+                                   spill_dir=os.environ.get("DATASET_SPILL_DIR") or None)
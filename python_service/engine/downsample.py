@@ -0,0 +1,159 @@
+"""
+Shape-preserving downsampling of the equity curve.
+
+Largest-Triangle-Three-Buckets (LTTB) picks one representative bar per
+bucket. Bars that carry meaning on their own (trade entries/exits, the
+drawdown peak and trough, equity and price extremes) are always kept.
+
+Full-length passes run over blocks of BLOCK_BARS bars, so curves can be
+memory-mapped arrays without being copied into memory. Block results are
+identical to whole-array results.
+"""
+import numbers
+
+import numpy as np
+
+BLOCK_BARS = 1 << 18
+
+
+def _blocks(start, stop):
+    return ((b0, min(stop, b0 + BLOCK_BARS)) for b0 in range(start, stop, BLOCK_BARS))
+
+
+def _argbest(start, stop, get_block, kind):
+    """
+    start + np.argmin / np.argmax (kind 'min' / 'max') of bars [start, stop),
+    where get_block(b0, b1) returns bars [b0, b1). Ties and NaN resolve to
+    the first occurrence, as in NumPy.
+    """
+    arg = np.argmin if kind == "min" else np.argmax
+    best_index, best = start, None
+    for b0, b1 in _blocks(start, stop):
+        values = get_block(b0, b1)
+        k = int(arg(values))
+        value = values[k]
+        if best is None or (best == best and (value != value or (value < best if kind == "min" else value > best))):
+            best_index, best = b0 + k, value
+    return best_index
+
+
+def _prefix_sums(y, positions):
+    """
+    np.concatenate([[0.0], np.cumsum(y)])[positions] for sorted positions,
+    accumulated block by block.
+    """
+    out = np.empty(len(positions), dtype=np.float64)
+    total = 0.0
+    lo = np.searchsorted(positions, 0, side='right')
+    out[:lo] = 0.0
+    for b0, b1 in _blocks(0, len(y)):
+        # Starting the cumsum from the running total keeps the additions in order
+        csum = np.cumsum(np.concatenate([[total], y[b0:b1]]))
+        hi = np.searchsorted(positions, b1, side='right')
+        out[lo:hi] = csum[positions[lo:hi] - b0]
+        total = csum[-1]
+        lo = hi
+    return out
+
+
+def lttb(y, n_out):
+    """
+    Select n_out indices of y (x = bar position) with the LTTB algorithm.
+
+    The first and last bars are always selected. Returns all indices when
+    n_out >= len(y) or n_out < 3.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n_out - 2 middle buckets
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # Average point of each bucket, used as the third triangle vertex
+    csum = _prefix_sums(y, edges)
+    counts = np.diff(edges)
+    avg_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    avg_y = (csum[1:] - csum[:-1]) / counts
+    avg_x = np.append(avg_x[1:], n - 1)
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        def area(b0, b1, i=i, a=a):
+            xs = np.arange(b0, b1)
+            return np.abs((a - avg_x[i]) * (y[b0:b1] - y[a]) - (a - xs) * (avg_y[i] - y[a]))
+
+        a = _argbest(int(edges[i]), int(edges[i + 1]), area, "max")
+        selected[i + 1] = a
+    return selected
+
+
+def drawdown_extremes(equity):
+    """
+    Return (peak, trough) bar indices of the maximum drawdown.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    n = len(equity)
+    if n == 0:
+        return 0, 0
+    carry = [-np.inf]
+
+    def drawdown(b0, b1):
+        # The running max continues from the previous block (blocks are visited in order)
+        running_max = np.maximum.accumulate(equity[b0:b1])
+        np.maximum(running_max, carry[0], out=running_max)
+        carry[0] = running_max[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(running_max > 0, equity[b0:b1] / running_max - 1, 0.0)
+
+    trough = _argbest(0, n, drawdown, "min")
+    peak = _argbest(0, trough + 1, lambda b0, b1: equity[b0:b1], "max")
+    return peak, trough
+
+
+def check_max_points(max_points):
+    """Raise ValueError unless max_points is a point budget: None, 0 (full resolution) or positive."""
+    if max_points is None:
+        return
+    if isinstance(max_points, bool) or not isinstance(max_points, numbers.Real) or max_points < 0:
+        raise ValueError(f"max_points must be positive, or null or 0 for full resolution, got {max_points}")
+
+
+def downsample_indices(equity, price, max_points, keep=()):
+    """
+    Choose at most about max_points bars of the equity curve to return.
+
+    Args:
+        equity (np.ndarray): Equity per bar
+        price (np.ndarray): Price per bar
+        max_points (int): Point budget
+        keep (array-like): Bars that must be kept (e.g. trade entries/exits)
+
+    Returns:
+        np.ndarray: Sorted bar indices. May exceed max_points only when the
+        required bars alone do not fit in the budget.
+    """
+    check_max_points(max_points)
+    n = len(equity)
+    if not max_points or n <= max_points:
+        return np.arange(n)
+
+    required = [np.asarray(keep, dtype=np.int64).reshape(-1), np.asarray(drawdown_extremes(equity))]
+    if n:
+        required.append(np.array([
+            _argbest(0, n, lambda b0, b1: equity[b0:b1], "min"),
+            _argbest(0, n, lambda b0, b1: equity[b0:b1], "max"),
+            _argbest(0, n, lambda b0, b1: price[b0:b1], "min"),
+            _argbest(0, n, lambda b0, b1: price[b0:b1], "max")
+        ]))
+    required = np.unique(np.concatenate(required))
+
+    budget = max(int(max_points) - len(required), 3)
+    return np.union1d(lttb(equity, budget), required)
@@ -0,0 +1,206 @@
+"""
+Successive halving and Hyperband over a strategy parameter grid.
+
+Instead of backtesting every combination over the whole history, candidates
+are first evaluated on a short prefix of the bars; the best 1/eta of them by
+the metric are kept and evaluated again on a prefix eta times longer, until
+the survivors run on the full history. Each rung is one vectorized sweep
+(engine.sweep.evaluate_grid) over the surviving combinations. Indicators are
+causal, so a prefix run sees the same signals as the first bars of a full run.
+
+Hyperband runs several such brackets, from many candidates on very short
+prefixes to a few candidates on the full history, which hedges against
+parameters that only pay off later in the data. Its candidates are drawn from
+the grid with a seeded generator.
+
+Once a single candidate is left it skips the remaining prefixes and runs on
+the full history directly.
+
+Cost is counted in bar evaluations (bars x candidates per rung), which is
+what a sweep's CPU time scales with. budget caps it as a fraction of the full
+grid's cost by evaluating fewer (seeded) candidates; results are therefore
+deterministic for a given seed. The budget must cover at least one
+full-history evaluation.
+"""
+import math
+
+import numpy as np
+
+from engine.strategy_runner import load_strategy
+from engine.sweep import build_grid, evaluate_grid, result_table, METRIC_FIELDS
+
+METHODS = ("halving", "hyperband")
+DEFAULT_ETA = 3
+
+# Shortest default prefix; shorter ones are mostly indicator warmup
+MIN_RUNG_BARS = 250
+
+
+def rung_bars(n, rungs, eta, min_bars):
+    """Prefix length of each rung: n * eta**(i - rungs + 1), at least min_bars, the last n."""
+    return [n if i == rungs - 1 else max(min_bars, min(n, int(round(n / eta ** (rungs - 1 - i))))) for i in range(rungs)]
+
+
+def rung_counts(candidates, rungs, eta):
+    """Candidates evaluated in each rung; every rung keeps the best ceil(k / eta)."""
+    counts = [candidates]
+    for _ in range(rungs - 1):
+        counts.append(max(1, math.ceil(counts[-1] / eta)))
+    return counts
+
+
+def rung_plan(candidates, bars, eta):
+    """(candidates, bars) of the rungs that run: a single survivor skips straight to the full history."""
+    counts = rung_counts(candidates, len(bars), eta)
+    return [(k, r) for i, (k, r) in enumerate(zip(counts, bars)) if k > 1 or i == len(bars) - 1]
+
+
+def plan_cost(candidates, bars, eta):
+    return sum(k * r for k, r in rung_plan(candidates, bars, eta))
+
+
+def fit_budget(candidates, bars, eta, limit):
+    """Most candidates whose bracket costs no more than limit bar evaluations (0 if not even one fits)."""
+    if limit is None or plan_cost(candidates, bars, eta) <= limit:
+        return candidates
+    if plan_cost(1, bars, eta) > limit:
+        return 0
+    low, high = 1, candidates
+    while low < high:
+        middle = (low + high + 1) // 2
+        if plan_cost(middle, bars, eta) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def halvings(candidates, eta):
+    """Rungs after the first until ceil(k / eta) leaves one candidate."""
+    count = 0
+    while candidates > 1:
+        candidates = math.ceil(candidates / eta)
+        count += 1
+    return count
+
+
+def run_halving(df, strategy_name, param_ranges, method="halving", eta=DEFAULT_ETA, min_bars=None,
+                budget=None, seed=None, metric="roi", top=None, initial_capital=100000):
+    """
+    Search a parameter grid with successive halving or Hyperband.
+
+    Args:
+        df (pd.DataFrame): OHLCV data
+        strategy_name (str): 'sma', 'rsi', or 'breakout'
+        param_ranges (dict): param -> value, list of values or {"start", "stop", "step"}
+        method (str): "halving" or "hyperband"
+        eta (int): Keep 1/eta of the candidates per rung and grow the prefix eta times
+        min_bars (int): Bars in the shortest prefix (default n / eta**3, at least MIN_RUNG_BARS)
+        budget (float): Fraction (0, 1] of the full grid's bar evaluations to spend at most;
+            ValueError if it is less than one full-history evaluation
+        seed (int): Seed for drawing candidates (Hyperband, or when budget limits them)
+        metric (str): Summary field to maximize (see engine.sweep.METRIC_FIELDS)
+        top (int): Optionally return only the best `top` full-history results
+
+    Returns:
+        dict: {
+            "strategy", "method", "combinations", "params",
+            "best": {param: value, ...metrics} on the full history,
+            "rungs": [{"bracket", "rung", "bars", "candidates"}],
+            "cost": {"bar_evaluations", "full_grid_bar_evaluations", "saved"},
+            "results": {column: list} for every combination run on the full history
+        }
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {list(METHODS)})")
+    if metric not in METRIC_FIELDS:
+        raise ValueError(f"Unknown metric: {metric} (expected one of {list(METRIC_FIELDS)})")
+    eta = int(eta)
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    if budget is not None and not 0 < budget <= 1:
+        raise ValueError("budget must be a fraction in (0, 1]")
+    module = load_strategy(strategy_name)
+    if not hasattr(module, 'generate_signal_grid'):
+        raise ValueError(f"Strategy {strategy_name} does not support parameter sweeps")
+
+    n = len(df)
+    if n == 0:
+        raise ValueError("Empty data provided")
+    names, grid = build_grid(param_ranges)
+    combinations = len(next(iter(grid.values()))) if grid else 1
+    min_bars = min(n, max(1, int(min_bars))) if min_bars else min(n, max(MIN_RUNG_BARS, n // eta ** 3))
+    # Most rungs the data allows: prefixes from min_bars growing eta times up to n
+    max_rungs = 1
+    while n / eta ** max_rungs >= min_bars:
+        max_rungs += 1
+
+    full_cost = combinations * n
+    limit = budget * full_cost if budget is not None else None
+    if limit is not None and limit < n:
+        raise ValueError(f"budget must cover at least one full-history evaluation ({n / full_cost:.4g} of this grid)")
+    rng = np.random.default_rng(seed)
+
+    if method == "halving":
+        brackets = [(combinations, min(max_rungs, halvings(combinations, eta) + 1))]
+    else:
+        brackets = []
+        for s in range(max_rungs - 1, -1, -1):
+            candidates = min(combinations, math.ceil(max_rungs / (s + 1) * eta ** s))
+            # No rungs past the one that leaves a single candidate; a bracket
+            # holding the whole grid is the same at every seed, so it runs once
+            bracket = (candidates, min(s + 1, halvings(candidates, eta) + 1))
+            if candidates < combinations or bracket not in brackets:
+                brackets.append(bracket)
+
+    rungs = []
+    spent = 0
+    final = {}
+    for bracket, (candidates, count) in enumerate(brackets):
+        bars = rung_bars(n, count, eta, min_bars)
+        # Budget a bracket leaves unspent (or cannot use at all) goes to the later ones
+        share = (limit - spent) / (len(brackets) - bracket) if limit is not None else None
+        candidates = fit_budget(candidates, bars, eta, share)
+        if candidates == 0:
+            continue
+        if candidates == combinations:
+            alive = np.arange(combinations)
+        else:
+            alive = np.sort(rng.choice(combinations, size=candidates, replace=False))
+
+        plan = rung_plan(candidates, bars, eta)
+        for rung, (keep, length) in enumerate(zip([k for k, _ in plan[1:]] + [None], [r for _, r in plan])):
+            subgrid = {name: grid[name][alive] for name in names}
+            metrics = evaluate_grid(df.iloc[:length], module, subgrid, initial_capital)
+            rungs.append({"bracket": bracket, "rung": rung, "bars": length, "candidates": len(alive)})
+            spent += len(alive) * length
+            if keep is None:
+                for j, position in enumerate(alive.tolist()):
+                    final[position] = {field: metrics[field][j] for field in METRIC_FIELDS}
+                break
+            # Ties keep the earlier grid position
+            alive = alive[np.sort(np.argsort(-metrics[metric], kind="stable")[:keep])]
+
+    positions = np.array(sorted(final))
+    table_metrics = {field: np.array([final[p][field] for p in positions.tolist()]) for field in METRIC_FIELDS}
+    order = np.argsort(-table_metrics[metric], kind="stable")
+    if top:
+        order = order[:int(top)]
+    selected = {name: grid[name][positions] for name in names}
+    table = result_table(names, selected, table_metrics, order)
+    best = {column: values[0] for column, values in table.items()}
+
+    return {
+        "strategy": strategy_name,
+        "method": method,
+        "combinations": combinations,
+        "params": names,
+        "best": best,
+        "rungs": rungs,
+        "cost": {
+            "bar_evaluations": spent,
+            "full_grid_bar_evaluations": full_cost,
+            "saved": 1 - spent / full_cost
+        },
+        "results": table
+    }
@@ -0,0 +1,399 @@
+"""
+Incremental (O(1) per bar) indicators and execution for live signal generation.
+
+Each indicator keeps rolling state and reproduces the batch kernels in
+engine.indicators bit for bit: the moving average follows pandas' Kahan
+compensated rolling sum, Wilder averages follow pandas' adjust=False EWM
+recursion, and rolling extremes use monotonic deques.
+
+update_many() advances the same state over a whole block of bars, which is
+what chunked backtests (engine.chunked) use to carry warm-up across chunks.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from engine.signals import BUY, SELL, SIDE_NAMES
+
+NAN = float('nan')
+
+# Candle fields the live strategy states read
+PRICE_FIELDS = ("close", "high", "low")
+
+
+class RollingMean:
+    """Incremental counterpart of indicators.sma."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_count = 0
+        self.prev_value = None
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.sum + y
+        self.compensation_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        # Runs of identical values return the value itself, as pandas does
+        if value == self.prev_value:
+            self.same_count += 1
+        else:
+            self.same_count = 1
+        self.prev_value = value
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.sum + y
+        self.compensation_remove = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+    def update(self, value):
+        value = float(value)
+        if self.window == 1 or self.prev_value is None:
+            # pandas restarts the sum whenever the window no longer overlaps the previous one
+            self.__init__(self.window)
+            self.prev_value = value
+            self.same_count = 0
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+
+        if self.nobs < self.window:
+            return NAN
+        result = self.sum / self.nobs
+        if self.same_count >= self.nobs:
+            return self.prev_value
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+    def update_many(self, values):
+        """
+        update() for every value of an array, returning the means as an array.
+
+        The compensated sum is sequential, so this is the same recursion with
+        the state held in locals.
+        """
+        values = np.asarray(values, dtype=np.float64).tolist()
+        out = np.empty(len(values))
+        start = 0
+        if values and (self.window == 1 or self.prev_value is None):
+            out[0] = self.update(values[0])
+            start = 1
+        if self.window == 1:
+            for j in range(start, len(values)):
+                out[j] = self.update(values[j])
+            return out
+
+        window = self.window
+        # Previous window values followed by the new ones; history[k - window] leaves the window at k
+        history = list(self.values) + values[start:]
+        offset = len(self.values)
+        nobs, neg_ct, total = self.nobs, self.neg_ct, self.sum
+        compensation_add, compensation_remove = self.compensation_add, self.compensation_remove
+        same_count, prev_value = self.same_count, self.prev_value
+        copysign = math.copysign
+
+        for k in range(offset, len(history)):
+            if k >= window:
+                old = history[k - window]
+                if old == old:
+                    nobs -= 1
+                    y = -old - compensation_remove
+                    t = total + y
+                    compensation_remove = t - total - y
+                    total = t
+                    if copysign(1.0, old) < 0:
+                        neg_ct -= 1
+            value = history[k]
+            if value == value:
+                nobs += 1
+                y = value - compensation_add
+                t = total + y
+                compensation_add = t - total - y
+                total = t
+                if copysign(1.0, value) < 0:
+                    neg_ct += 1
+                if value == prev_value:
+                    same_count += 1
+                else:
+                    same_count = 1
+                prev_value = value
+
+            if nobs < window:
+                result = NAN
+            elif same_count >= nobs:
+                result = prev_value
+            else:
+                result = total / nobs
+                if (neg_ct == 0 and result < 0) or (neg_ct == nobs and result > 0):
+                    result = 0.0
+            out[start + k - offset] = result
+
+        self.values = deque(history[-window:])
+        self.nobs, self.neg_ct, self.sum = nobs, neg_ct, total
+        self.compensation_add, self.compensation_remove = compensation_add, compensation_remove
+        self.same_count, self.prev_value = same_count, prev_value
+        return out
+
+
+class WilderAverage:
+    """Incremental ewm(alpha=1/period, min_periods=period, adjust=False).mean()."""
+
+    def __init__(self, period):
+        self.period = period
+        # pandas converts alpha to a center of mass and back
+        alpha = 1 / period
+        self.alpha = 1.0 / (1.0 + (1 - alpha) / alpha)
+        self.old_wt = 1.0
+        self.weighted = NAN
+        self.nobs = 0
+
+    def update(self, value):
+        value = float(value)
+        observed = value == value
+        self.nobs += observed
+        if self.weighted == self.weighted:
+            self.old_wt *= 1.0 - self.alpha
+            if observed:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * value) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif observed:
+            self.weighted = value
+        return self.weighted if self.nobs >= self.period else NAN
+
+    def update_many(self, values):
+        """
+        update() for every value of an array, returning the averages as an array.
+
+        Without missing values pandas' recursion continues exactly from the
+        carried average when that average is the first value of the series,
+        so the block is computed by pandas itself.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if np.isnan(values).any() or self.old_wt != 1.0:
+            return np.array([self.update(value) for value in values.tolist()])
+        if not len(values):
+            return values.copy()
+        seeded = self.weighted == self.weighted
+        series = np.concatenate([[self.weighted], values]) if seeded else values
+        out = pd.Series(series).ewm(alpha=1 / self.period, adjust=False).mean().to_numpy()
+        if seeded:
+            out = out[1:]
+        nobs = self.nobs + np.arange(1, len(values) + 1)
+        self.nobs += len(values)
+        self.weighted = out[-1]
+        self.old_wt = 1.0
+        return np.where(nobs < self.period, np.nan, out)
+
+
+class WilderRSI:
+    """Incremental counterpart of indicators.wilder_rsi."""
+
+    def __init__(self, period=14):
+        self.avg_gain = WilderAverage(period)
+        self.avg_loss = WilderAverage(period)
+        self.prev = NAN
+
+    def update(self, value):
+        value = float(value)
+        delta = value - self.prev
+        self.prev = value
+        avg_gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+        if avg_gain != avg_gain or avg_loss != avg_loss:
+            return NAN
+        if avg_loss == 0:
+            return NAN if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def update_many(self, values):
+        """update() for every value of an array, returning the RSI as an array."""
+        values = np.asarray(values, dtype=np.float64)
+        delta = np.diff(values, prepend=self.prev)
+        if len(values):
+            self.prev = float(values[-1])
+        avg_gain = self.avg_gain.update_many(np.where(delta > 0, delta, 0.0))
+        avg_loss = self.avg_loss.update_many(np.where(delta < 0, -delta, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+            return 100 - (100 / (1 + rs))
+
+
+class RollingExtreme:
+    """
+    Incremental counterpart of indicators.rolling_max / rolling_min with a
+    monotonic deque of (bar, value); lag=1 excludes the current bar.
+    """
+
+    def __init__(self, window, kind="max", lag=0):
+        self.window = window
+        self.better = (lambda a, b: a >= b) if kind == "max" else (lambda a, b: a <= b)
+        self.lag = lag
+        self.pending = deque()
+        self.candidates = deque()
+        self.valid = deque()
+        self.nobs = 0
+        self.bar = -1
+
+    def update(self, value):
+        value = float(value)
+        if self.lag:
+            # The lagged series starts with NaN and trails the input by `lag` bars
+            self.pending.append(value)
+            value = self.pending.popleft() if len(self.pending) > self.lag else NAN
+        self.bar += 1
+
+        observed = value == value
+        self.valid.append(observed)
+        self.nobs += observed
+        if len(self.valid) > self.window:
+            self.nobs -= self.valid.popleft()
+
+        if observed:
+            while self.candidates and self.better(value, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((self.bar, value))
+        while self.candidates and self.candidates[0][0] <= self.bar - self.window:
+            self.candidates.popleft()
+
+        if self.nobs < self.window or not self.candidates:
+            return NAN
+        return self.candidates[0][1]
+
+
+class LiveEngine:
+    """
+    Bar-by-bar counterpart of BacktestEngine.run_arrays (all-in/all-out sizing).
+    """
+
+    def __init__(self, initial_capital=100000):
+        self.initial_capital = initial_capital
+        self.cash = initial_capital
+        self.position = 0
+        self.entry_price = 0
+        self.entry_index = 0
+        self.trades = []
+
+    def update(self, i, close, code=0, exec_price=None):
+        """
+        Apply the signal code for bar i and return (equity, closed trade or None).
+        """
+        exec_price = close if exec_price is None else exec_price
+        trade = None
+        if code == BUY and self.position == 0:
+            quantity = self.cash // exec_price
+            if quantity > 0:
+                self.position = quantity
+                self.cash -= quantity * exec_price
+                self.entry_price = exec_price
+                self.entry_index = i
+        elif code == SELL and self.position > 0:
+            revenue = self.position * exec_price
+            cost = self.position * self.entry_price
+            pnl = revenue - cost
+            trade = {
+                "entry_index": self.entry_index,
+                "exit_index": i,
+                "entry_price": self.entry_price,
+                "exit_price": exec_price,
+                "quantity": self.position,
+                "pnl": pnl,
+                "pnl_pct": (pnl / cost) * 100 if cost > 0 else 0
+            }
+            self.cash += revenue
+            self.trades.append(trade)
+            self.position = 0
+            self.entry_price = 0
+        return self.cash + self.position * close, trade
+
+
+def clean_candle(candle):
+    """
+    Validate a live candle and return a copy with its price fields as floats.
+
+    Raises ValueError for anything a live state could not apply, before any
+    state has changed.
+    """
+    if not isinstance(candle, dict):
+        raise ValueError("Candle must be an object")
+    if 'close' not in candle:
+        raise ValueError("Candle must include 'close'")
+    cleaned = dict(candle)
+    for name in PRICE_FIELDS:
+        if name in candle:
+            try:
+                cleaned[name] = float(candle[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"Candle '{name}' must be a number, got {candle[name]!r}")
+    return cleaned
+
+
+class LiveSession:
+    """
+    One live stream: a strategy's incremental state plus a LiveEngine.
+
+    Feed candles ({timestamp, open, high, low, close, volume}) one at a time
+    with update(); each returns the bar's signal (or None), indicator values
+    and the updated equity. update_many() applies a list of candles, all or
+    none: a malformed candle (ValueError) leaves the session unchanged.
+    """
+
+    def __init__(self, strategy, params, initial_capital=100000):
+        if not hasattr(strategy, 'live_state'):
+            raise ValueError(f"Strategy {strategy.__name__} does not support live updates")
+        self.state = strategy.live_state(params)
+        self.engine = LiveEngine(initial_capital)
+        self.bars = 0
+
+    def update(self, candle):
+        return self._apply(clean_candle(candle))
+
+    def update_many(self, candles):
+        # Every candle is validated before the first one is applied
+        return [self._apply(candle) for candle in [clean_candle(candle) for candle in candles]]
+
+    def _apply(self, candle):
+        i = self.bars
+        self.bars += 1
+        close = candle['close']
+        signal = self.state.update(candle)
+
+        code = signal[0] if signal else 0
+        equity, trade = self.engine.update(i, close, code)
+        update = {
+            "index": i,
+            "timestamp": candle.get('timestamp', i),
+            "signal": None,
+            "indicators": dict(self.state.indicators),
+            "price": close,
+            "equity": equity,
+            "cash": self.engine.cash,
+            "position": self.engine.position,
+            "trade": trade
+        }
+        if signal:
+            update["signal"] = {"index": i, "signal": SIDE_NAMES[code], "price": close, "reason": signal[1]}
+        return update
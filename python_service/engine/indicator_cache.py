@@ -0,0 +1,120 @@
+"""
+Process-level LRU cache for indicator arrays.
+
+Entries are keyed by a content hash of the dataset's OHLCV columns plus the
+indicator name and its parameters, so repeated runs over the same bars with
+different strategy parameters reuse every indicator they share.
+
+Configure with the INDICATOR_CACHE_MB environment variable (0 disables).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def fingerprint(df):
+    """
+    Content hash of the OHLCV columns of a DataFrame.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for col in OHLCV_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = np.ascontiguousarray(df[col].to_numpy())
+        digest.update(f"{col}:{values.dtype.str}:{len(values)};".encode())
+        digest.update(values.tobytes() if values.dtype.kind != 'O' else repr(values.tolist()).encode())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024, enabled=True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_bytes > 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_bytes=None, enabled=None):
+        """Resize or enable/disable the cache. Disabling also clears it."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if enabled is not None:
+                self.enabled = enabled
+            self.enabled = self.enabled and self.max_bytes > 0
+            self._evict(0 if not self.enabled else self.max_bytes)
+
+    def fingerprint(self, df):
+        """Dataset key for get_or_compute, or None when the cache is disabled."""
+        return fingerprint(df) if self.enabled else None
+
+    def get_or_compute(self, dataset_key, name, params, compute):
+        """
+        Return the cached indicator for (dataset_key, name, params), computing it on a miss.
+
+        Args:
+            dataset_key (str): Result of fingerprint(df); None bypasses the cache
+            name (str): Indicator name, e.g. 'sma'
+            params (dict): Indicator parameters
+            compute (callable): Zero-argument function returning the indicator array
+
+        Returns:
+            np.ndarray: Read-only indicator array
+        """
+        if dataset_key is None or not self.enabled:
+            return compute()
+
+        key = (dataset_key, name, tuple(sorted(params.items())))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = np.asarray(compute())
+        value.flags.writeable = False
+
+        with self._lock:
+            if key not in self._entries and value.nbytes <= self.max_bytes:
+                self._entries[key] = value
+                self._bytes += value.nbytes
+                self._evict(self.max_bytes)
+        return value
+
+    def _evict(self, limit):
+        while self._entries and self._bytes > limit:
+            _, value = self._entries.popitem(last=False)
+            self._bytes -= value.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+indicator_cache = IndicatorCache(max_bytes=int(float(os.environ.get("INDICATOR_CACHE_MB", 256)) * 1024 * 1024))
@@ -0,0 +1,93 @@
+"""
+Vectorized indicator and crossover kernels shared by all strategies.
+
+Every kernel takes an array-like of prices and returns a float64 NumPy array
+of the same length, with NaN wherever the indicator is not yet defined.
+"""
+import numpy as np
+import pandas as pd
+
+
+def as_array(values):
+    """Return values as a flat, contiguous float64 array."""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64).reshape(-1))
+
+
+def shift(values, periods=1):
+    """
+    Shift values forward by `periods` bars, filling the gap with NaN.
+
+    2D arrays (bars x parameter sets) are shifted along the bar axis.
+    """
+    values = values if isinstance(values, np.ndarray) and values.ndim == 2 else as_array(values)
+    out = np.full(values.shape, np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def sma(values, window):
+    """Simple moving average over `window` bars."""
+    return pd.Series(as_array(values)).rolling(window=window).mean().to_numpy()
+
+
+def ema(values, length):
+    """
+    Exponential moving average seeded with the SMA of the first `length` bars.
+    """
+    values = as_array(values).copy()
+    if len(values) < length:
+        return np.full_like(values, np.nan)
+    seed = values[:length].mean()
+    values[:length - 1] = np.nan
+    values[length - 1] = seed
+    return pd.Series(values).ewm(span=length, adjust=False).mean().to_numpy()
+
+
+def rolling_std(values, window):
+    """Sample standard deviation over `window` bars."""
+    return pd.Series(as_array(values)).rolling(window=window).std().to_numpy()
+
+
+def rolling_max(values, window, lag=0):
+    """Rolling maximum over `window` bars, optionally lagged to exclude the current bar."""
+    values = as_array(values)
+    if lag:
+        values = shift(values, lag)
+    return pd.Series(values).rolling(window=window).max().to_numpy()
+
+
+def rolling_min(values, window, lag=0):
+    """Rolling minimum over `window` bars, optionally lagged to exclude the current bar."""
+    values = as_array(values)
+    if lag:
+        values = shift(values, lag)
+    return pd.Series(values).rolling(window=window).min().to_numpy()
+
+
+def wilder_rsi(values, period=14):
+    """
+    Calculate RSI using Wilder's Smoothing method (EMA with alpha = 1/period).
+    """
+    delta = np.diff(as_array(values), prepend=np.nan)
+
+    # NaN deltas count as zero movement, matching delta.where(delta > 0, 0.0)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    avg_gain = pd.Series(gain).ewm(alpha=1 / period, min_periods=period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(loss).ewm(alpha=1 / period, min_periods=period, adjust=False).mean().to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def crossed_above(fast, slow):
+    """True where `fast` moves from <= `slow` on the previous bar to > `slow`."""
+    return (shift(fast) <= shift(slow)) & (np.asarray(fast) > np.asarray(slow))
+
+
+def crossed_below(fast, slow):
+    """True where `fast` moves from >= `slow` on the previous bar to < `slow`."""
+    return (shift(fast) >= shift(slow)) & (np.asarray(fast) < np.asarray(slow))
@@ -0,0 +1,160 @@
+"""
+Fast OHLCV ingestion: columnar JSON and raw binary payloads.
+
+Both formats decode straight into NumPy arrays without per-row validation.
+
+Binary layout (all integers little-endian):
+
+    b"OHLC"                 4-byte magic
+    uint32                  header length H
+    H bytes                 UTF-8 JSON header, e.g.
+                            {"symbol": "AAPL", "strategy": "sma", "params": {...},
+                             "rows": N, "columns": [{"name": "close", "dtype": "<f8"}, ...]}
+                            Optional keys mirror StrategyRequest: "response_format",
+                            "include_data", "output_columns", "max_points",
+                            "include_timings", "include_memory" and "compact".
+    padding                 zero bytes up to the next multiple of 8
+    column buffers          one per header column, in order, N * itemsize bytes each,
+                            each padded to a multiple of 8 bytes
+"""
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"OHLC"
+ALIGNMENT = 8
+ALLOWED_DTYPES = {"<f8", "<f4", "<i8", "<i4"}
+
+
+def timestamp_index(values):
+    """
+    Convert timestamps to a DatetimeIndex: integers are epoch seconds,
+    anything else is parsed by pd.to_datetime.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return pd.DatetimeIndex(pd.to_datetime(values, unit='s'), name='index')
+    return pd.DatetimeIndex(pd.to_datetime(values), name='index')
+
+
+def frame_from_columns(columns):
+    """
+    Build an OHLCV DataFrame from a dict of equally long columns (lists or arrays).
+    """
+    if not columns:
+        raise ValueError("Empty data provided")
+
+    arrays = {}
+    for name, values in columns.items():
+        arrays[name] = values if isinstance(values, np.ndarray) else np.asarray(values)
+
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) != 1:
+        raise ValueError("All data columns must have the same length")
+    if lengths == {0}:
+        raise ValueError("Empty data provided")
+    if 'close' not in arrays:
+        raise ValueError("Data must include a 'close' column")
+
+    index = None
+    if 'timestamp' in arrays:
+        index = timestamp_index(arrays['timestamp'])
+
+    return pd.DataFrame(arrays, index=index, copy=False)
+
+
+def compact_frame(df):
+    """
+    Compact copy of an OHLCV frame: float prices as float32, integer columns
+    (volume) as int32 when they fit, and the timestamp column dropped when the
+    DatetimeIndex (int64 epoch values) already holds it. Roughly halves the
+    memory a frame holds; indicators still compute in float64 (see
+    indicators.as_array), but prices are rounded to about 7 significant digits.
+    """
+    columns = {}
+    for name, series in df.items():
+        if name == 'timestamp' and isinstance(df.index, pd.DatetimeIndex):
+            continue
+        values = series.to_numpy()
+        if values.dtype.kind == 'f':
+            values = values.astype(np.float32, copy=False)
+        elif values.dtype.kind in 'iu' and values.dtype.itemsize > 4 and len(values):
+            info = np.iinfo(np.int32)
+            if info.min <= values.min() and values.max() <= info.max:
+                values = values.astype(np.int32)
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _padded(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def decode_binary(body):
+    """
+    Decode a binary OHLCV payload.
+
+    Returns:
+        (dict, pd.DataFrame): request header and the OHLCV frame
+    """
+    view = memoryview(body)
+    if len(view) < 8 or bytes(view[:4]) != MAGIC:
+        raise ValueError("Invalid binary payload: bad magic")
+
+    (header_len,) = struct.unpack_from("<I", view, 4)
+    if 8 + header_len > len(view):
+        raise ValueError("Invalid binary payload: truncated header")
+    try:
+        header = json.loads(bytes(view[8:8 + header_len]))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid binary payload header: {e}")
+    if not isinstance(header, dict):
+        raise ValueError("Invalid binary payload header: expected an object")
+
+    rows = header.get("rows", 0)
+    if not isinstance(rows, int) or isinstance(rows, bool) or rows < 0:
+        raise ValueError(f"Invalid binary payload header: rows must be a non-negative integer, got {rows!r}")
+    specs = header.get("columns", [])
+    if not isinstance(specs, list) or not all(isinstance(col, dict) and isinstance(col.get("name"), str) for col in specs):
+        raise ValueError("Invalid binary payload header: columns must be objects with a string 'name'")
+    offset = _padded(8 + header_len)
+    columns = {}
+    for col in specs:
+        dtype = col.get("dtype", "<f8")
+        if dtype not in ALLOWED_DTYPES:
+            raise ValueError(f"Unsupported column dtype: {dtype}")
+        dtype = np.dtype(dtype)
+        size = rows * dtype.itemsize
+        if offset + size > len(view):
+            raise ValueError(f"Invalid binary payload: column {col['name']} is truncated")
+        columns[col["name"]] = np.frombuffer(view, dtype=dtype, count=rows, offset=offset)
+        offset += _padded(size)
+
+    return header, frame_from_columns(columns)
+
+
+def encode_binary(columns, **header):
+    """
+    Encode a dict of column arrays into the binary payload format (used by clients and tests).
+    """
+    arrays = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    for name, values in arrays.items():
+        if values.dtype.kind == 'f':
+            arrays[name] = values.astype("<f8", copy=False)
+        elif values.dtype.kind in 'iu':
+            arrays[name] = values.astype("<i8", copy=False)
+
+    rows = len(next(iter(arrays.values()))) if arrays else 0
+    header = dict(header, rows=rows, columns=[{"name": name, "dtype": values.dtype.str} for name, values in arrays.items()])
+    header_bytes = json.dumps(header).encode()
+
+    parts = [MAGIC, struct.pack("<I", len(header_bytes)), header_bytes]
+    length = 8 + len(header_bytes)
+    parts.append(b"\0" * (_padded(length) - length))
+    for values in arrays.values():
+        raw = values.tobytes()
+        parts.append(raw)
+        parts.append(b"\0" * (_padded(len(raw)) - len(raw)))
+    return b"".join(parts)
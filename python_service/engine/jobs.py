@@ -0,0 +1,188 @@
+"""
+In-process job queue for long backtests.
+
+Jobs run on a bounded thread pool. Each job reports progress (stage and bars
+processed) through a callback, can be cancelled while queued or at the next
+progress checkpoint, and keeps its serialized result for a retention window
+after it finishes. No external broker is involved.
+
+Configure with JOB_WORKERS (default 2), JOB_QUEUE_MAX (pending + running
+jobs, default 100) and JOB_RETENTION_SECONDS (default 600).
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue has no free slot."""
+
+
+class Job:
+    def __init__(self, job_id, kind):
+        self.id = job_id
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = None
+        self.bars_done = 0
+        self.bars_total = 0
+        self.error = None
+        # True when the job failed on its input (a ValueError), not internally
+        self.invalid = False
+        self.result = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.future = None
+        # Incremented on every change so streams can wait for updates
+        self.version = 0
+
+    def snapshot(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "bars_done": self.bars_done,
+            "bars_total": self.bars_total,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobQueue:
+    def __init__(self, workers=2, max_jobs=100, retention_seconds=600):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.retention_seconds = retention_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        return self._pool
+
+    def _purge(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _update(self, job, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def submit(self, fn, kind="backtest"):
+        """
+        Queue fn(progress) and return the job id.
+
+        fn receives a progress(stage, bars_done, bars_total) callback, which
+        raises JobCancelled once the job is cancelled, and returns the result
+        (stored as is, typically serialized bytes).
+        """
+        with self._lock:
+            self._purge()
+            active = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+            if active >= self.max_jobs:
+                raise QueueFull(f"Job queue is full ({self.max_jobs} jobs)")
+            job = Job(uuid.uuid4().hex, kind)
+            self._jobs[job.id] = job
+        job.future = self._executor().submit(self._run, job, fn)
+        return job.id
+
+    def _run(self, job, fn):
+        if job.cancel_requested:
+            self._update(job, status=CANCELLED, finished_at=time.time())
+            return
+
+        def progress(stage, bars_done=None, bars_total=None):
+            if job.cancel_requested:
+                raise JobCancelled()
+            fields = {"stage": stage}
+            if bars_done is not None:
+                fields["bars_done"] = bars_done
+            if bars_total is not None:
+                fields["bars_total"] = bars_total
+            self._update(job, **fields)
+
+        self._update(job, status=RUNNING, started_at=time.time())
+        try:
+            result = fn(progress)
+        except JobCancelled:
+            self._update(job, status=CANCELLED, finished_at=time.time())
+        except Exception as e:
+            invalid = isinstance(e, ValueError)
+            self._update(job, status=FAILED, error=str(e) if invalid else "Internal Server Error", invalid=invalid,
+                         finished_at=time.time())
+            if not invalid:
+                import traceback
+                traceback.print_exc()
+        else:
+            self._update(job, status=DONE, result=result, finished_at=time.time())
+
+    def get(self, job_id):
+        """Return the job, or None if it is unknown or past its retention window."""
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs never start; running jobs stop at their next
+        progress checkpoint. Returns the job, or None if unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        with self._changed:
+            job.cancel_requested = True
+            if job.future is not None and job.future.cancel():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+            job.version += 1
+            self._changed.notify_all()
+        return job
+
+    def wait(self, job, version, timeout=None):
+        """Block until job.version differs from version (or timeout); return the new version."""
+        with self._changed:
+            self._changed.wait_for(lambda: job.version != version, timeout=timeout)
+            return job.version
+
+    def stats(self):
+        with self._lock:
+            self._purge()
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"workers": self.workers, "max_jobs": self.max_jobs, "retention_seconds": self.retention_seconds, "jobs": counts}
+
+
+job_queue = JobQueue(
+    workers=int(os.environ.get("JOB_WORKERS", 2)),
+    max_jobs=int(os.environ.get("JOB_QUEUE_MAX", 100)),
+    retention_seconds=float(os.environ.get("JOB_RETENTION_SECONDS", 600))
+)
@@ -0,0 +1,329 @@
+"""
+Per-stage request timing and Prometheus metrics.
+
+Endpoints time their stages (request parsing, DataFrame construction, signal
+generation, the engine run, result building, record cleaning and
+serialization) with a StageTimer. Timings are returned in a Server-Timing
+header, optionally in the response body, and aggregated into histograms that
+/metrics renders in the Prometheus text format.
+
+Timers created with memory=True (or from trace_memory() on) also trace
+allocations (tracemalloc) and record the bytes each stage allocated and its
+peak, plus the request's peak.
+Tracing is process-wide and slows allocation-heavy code, so it is opt-in per
+request; overlapping traced requests see each other's allocations.
+
+Set METRICS_ENABLED=0 to disable; timers are then a shared no-op object and
+nothing is recorded (memory-tracing timers are still returned).
+"""
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from bisect import bisect_left
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BAR_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+MEMORY_BUCKETS = tuple(float(1 << shift) for shift in range(20, 34))
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _start_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class StageTimer:
+    """
+    Lap timer for one request. Each lap(stage) records the time since the
+    previous lap (or the start) under that stage; repeated stages add up.
+    """
+
+    def __init__(self, endpoint, started=None, memory=False):
+        self.endpoint = endpoint
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.stages = {}
+        self.memory = None
+        if memory:
+            self.trace_memory()
+
+    def trace_memory(self):
+        """Start tracing allocations now; only stages lapped from here on record memory."""
+        if self.memory is not None:
+            return
+        _start_tracing()
+        # Tracing stops on close(), or when the timer is garbage collected
+        self._stop_tracing = weakref.finalize(self, _stop_tracing)
+        self.memory = {}
+        self.peak_bytes = 0
+        self._baseline = self._mark = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+        if self.memory is not None and self._stop_tracing.alive:
+            current, peak = tracemalloc.get_traced_memory()
+            usage = self.memory.setdefault(stage, {"allocated_bytes": 0, "peak_bytes": 0})
+            usage["allocated_bytes"] += current - self._mark
+            usage["peak_bytes"] = max(usage["peak_bytes"], peak - self._mark)
+            self.peak_bytes = max(self.peak_bytes, peak - self._baseline)
+            tracemalloc.reset_peak()
+            self._mark = current
+
+    def close(self):
+        """Stop tracing memory (laps after this record time only)."""
+        if self.memory is not None:
+            self._stop_tracing()
+
+    def memory_report(self):
+        """
+        Peak bytes above the request's starting point, and per stage the net
+        bytes allocated (negative when it freed more) and the stage's peak.
+        """
+        if self.memory is None:
+            return None
+        return {"peak_bytes": self.peak_bytes, "stages": {stage: dict(usage) for stage, usage in self.memory.items()}}
+
+    def total(self):
+        return self._last - self.started
+
+    def milliseconds(self):
+        """Stage timings in milliseconds, for the response body."""
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()}
+
+    def headers(self):
+        """Server-Timing header with every stage and the total so far."""
+        entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.stages.items()]
+        entries.append(f"total;dur={self.total() * 1000:.3f}")
+        headers = {"Server-Timing": ", ".join(entries)}
+        if self.memory is not None:
+            headers["X-Peak-Memory"] = str(self.peak_bytes)
+        return headers
+
+
+class NullTimer:
+    """Timer used when metrics are disabled."""
+    endpoint = None
+    stages = {}
+    memory = None
+
+    def lap(self, stage):
+        pass
+
+    def close(self):
+        pass
+
+    def memory_report(self):
+        return None
+
+    def total(self):
+        return 0.0
+
+    def milliseconds(self):
+        return {}
+
+    def headers(self):
+        return None
+
+
+NULL_TIMER = NullTimer()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._request_seconds = {}
+        self._stage_seconds = {}
+        self._bars = {}
+        self._peak_bytes = {}
+        self._responses = {}
+
+    def timer(self, endpoint, started=None, memory=False):
+        """
+        New StageTimer for a request, or NULL_TIMER when disabled.
+
+        started is the perf_counter() time the request arrived (see
+        RequestClock); time until the first lap is then request parsing.
+        memory=True also traces the request's allocations.
+        """
+        if not self.enabled and not memory:
+            return NULL_TIMER
+        return StageTimer(endpoint, started, memory=memory)
+
+    def trace_memory(self, timer):
+        """
+        Start tracing a request's allocations once it turns out to want them
+        (e.g. after decoding a header). Returns the timer, or a new memory
+        timer in place of NULL_TIMER when disabled.
+        """
+        if timer is NULL_TIMER:
+            return StageTimer(timer.endpoint, memory=True)
+        timer.trace_memory()
+        return timer
+
+    def observe(self, timer, strategy=None, bars=None):
+        """Aggregate a finished request's timings (and its bar count) into the histograms."""
+        if not self.enabled or timer is NULL_TIMER:
+            return
+        key = (timer.endpoint, strategy or "")
+        with self._lock:
+            self._histogram(self._request_seconds, key, STAGE_BUCKETS).observe(timer.total())
+            for stage, seconds in timer.stages.items():
+                self._histogram(self._stage_seconds, key + (stage,), STAGE_BUCKETS).observe(seconds)
+            if bars is not None:
+                self._histogram(self._bars, key, BAR_BUCKETS).observe(bars)
+            if timer.memory is not None:
+                self._histogram(self._peak_bytes, key, MEMORY_BUCKETS).observe(float(timer.peak_bytes))
+
+    def count_response(self, endpoint, status):
+        if not self.enabled:
+            return
+        key = (endpoint, status)
+        with self._lock:
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    @staticmethod
+    def _histogram(histograms, key, buckets):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    def reset(self):
+        with self._lock:
+            self._request_seconds.clear()
+            self._stage_seconds.clear()
+            self._bars.clear()
+            self._peak_bytes.clear()
+            self._responses.clear()
+
+    def render(self, caches=None, jobs=None):
+        """
+        Prometheus text exposition of all metrics.
+
+        Args:
+            caches (dict): cache name -> stats() dict with hits, misses,
+                evictions, entries and bytes
+            jobs (dict): status -> number of jobs
+        """
+        lines = []
+
+        def histograms(name, help_text, series, label_names):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(series.items()):
+                labels = _labels(**dict(zip(label_names, key)))
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound if bound == "+Inf" else _format(bound)}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {_format(histogram.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        def samples(name, kind, help_text, values):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in values:
+                lines.append(f"{name}{{{labels}}} {_format(value)}")
+
+        with self._lock:
+            histograms("backtest_request_duration_seconds", "Request latency by endpoint and strategy.",
+                       self._request_seconds, ("endpoint", "strategy"))
+            histograms("backtest_stage_duration_seconds", "Latency of each request stage.",
+                       self._stage_seconds, ("endpoint", "strategy", "stage"))
+            histograms("backtest_bars", "Bars per request.", self._bars, ("endpoint", "strategy"))
+            histograms("backtest_request_peak_bytes", "Peak traced memory of requests that asked for memory accounting.",
+                       self._peak_bytes, ("endpoint", "strategy"))
+            samples("http_responses_total", "counter", "Responses by route and status code.",
+                    [(_labels(endpoint=endpoint, status=status), count)
+                     for (endpoint, status), count in sorted(self._responses.items())])
+
+        caches = caches or {}
+        for field, kind, help_text in (("hits", "counter", "Cache hits."),
+                                       ("misses", "counter", "Cache misses."),
+                                       ("evictions", "counter", "Cache evictions.")):
+            samples(f"cache_{field}_total", kind, help_text,
+                    [(_labels(cache=name), stats.get(field, 0)) for name, stats in caches.items()])
+        samples("cache_hit_ratio", "gauge", "Hits / lookups since start.",
+                [(_labels(cache=name), stats["hits"] / (stats["hits"] + stats["misses"]) if stats["hits"] + stats["misses"] else 0.0)
+                 for name, stats in caches.items()])
+        samples("cache_entries", "gauge", "Entries currently cached.",
+                [(_labels(cache=name), stats.get("entries", 0)) for name, stats in caches.items()])
+        samples("cache_bytes", "gauge", "Bytes currently cached.",
+                [(_labels(cache=name), stats.get("bytes", 0)) for name, stats in caches.items()])
+        if jobs is not None:
+            samples("backtest_jobs", "gauge", "Retained jobs by status.",
+                    [(_labels(status=status), count) for status, count in sorted(jobs.items())])
+        return "\n".join(lines) + "\n"
+
+
+class RequestClock:
+    """
+    ASGI middleware that stamps each HTTP request with its arrival time
+    (request.state.received) and counts responses per route and status.
+    """
+
+    def __init__(self, app, metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope.setdefault("state", {})["received"] = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                self.metrics.count_response(getattr(route, "path", "unmatched"), message["status"])
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+metrics = Metrics(enabled=os.environ.get("METRICS_ENABLED", "1").lower() not in ("0", "false", "no"))
@@ -0,0 +1,116 @@
+"""
+Monte Carlo resampling of a backtest's trade ledger.
+
+With all-in/all-out sizing the account is flat between trades, so each trade
+is a return on the equity before it: pnl_k / (initial + pnl_0 + ... + pnl_k-1).
+Resampling those returns (plain or circular block bootstrap) and compounding
+them reproduces alternative trade orders. Paths are generated as
+(paths x trades) matrices, a block of paths at a time.
+"""
+import numpy as np
+
+METHODS = ("bootstrap", "block")
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Upper bound on paths x trades per call
+MAX_CELLS = 50_000_000
+
+# Upper bound on paths x trades held in memory per block
+BLOCK_CELLS = 4_000_000
+
+
+def trade_returns(pnl, initial_capital):
+    """
+    Per-trade return on equity for a sequential all-in trade ledger.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    equity_before = initial_capital + np.concatenate([[0.0], np.cumsum(pnl)[:-1]])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(equity_before > 0, pnl / equity_before, 0.0)
+
+
+def resample_indices(n_trades, paths, method="bootstrap", block_size=None, rng=None):
+    """
+    Trade indices for every path, shape (paths, n_trades).
+
+    'bootstrap' draws trades independently; 'block' draws circular blocks of
+    block_size consecutive trades (default: about sqrt(n_trades)) to keep
+    streaks and serial correlation.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method: {method}")
+    rng = rng if rng is not None else np.random.default_rng()
+    if method == "bootstrap":
+        return rng.integers(0, n_trades, size=(paths, n_trades))
+
+    block_size = int(block_size or max(1, round(np.sqrt(n_trades))))
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(paths, blocks, 1))
+    idx = (starts + np.arange(block_size)) % n_trades
+    return idx.reshape(paths, blocks * block_size)[:, :n_trades]
+
+
+def simulate(pnl, initial_capital, paths=10000, method="bootstrap", block_size=None, percentiles=DEFAULT_PERCENTILES, seed=None):
+    """
+    Resample a trade ledger into `paths` equity paths.
+
+    Args:
+        pnl (np.ndarray): Trade P&L in execution order
+        initial_capital (float): Starting equity
+        paths (int): Number of simulated paths
+        method (str): 'bootstrap' or 'block'
+        block_size (int): Trades per block for method='block'
+        percentiles (tuple): Percentiles to report
+        seed (int): Optional seed for reproducible paths
+
+    Returns:
+        dict: percentile bands of final equity, ROI and max drawdown (%),
+        plus the probability of ending below the initial capital
+    """
+    paths = int(paths)
+    if paths <= 0:
+        raise ValueError("paths must be positive")
+    returns = trade_returns(pnl, initial_capital)
+    n_trades = len(returns)
+    if paths * max(n_trades, 1) > MAX_CELLS:
+        raise ValueError(f"paths x trades exceeds {MAX_CELLS}")
+
+    if n_trades:
+        rng = np.random.default_rng(seed)
+        final_equity = np.empty(paths)
+        max_drawdown = np.empty(paths)
+        # Blocks draw from one generator in order, so results match a single (paths x trades) draw
+        rows = max(1, BLOCK_CELLS // n_trades)
+        for start in range(0, paths, rows):
+            block = slice(start, min(start + rows, paths))
+            idx = resample_indices(n_trades, block.stop - block.start, method, block_size, rng)
+            growth = returns[idx]
+            del idx
+            growth += 1.0
+            equity = np.cumprod(growth, axis=1, out=growth)
+            equity *= initial_capital
+
+            # Drawdown against the running peak, starting from the initial capital
+            peak = np.maximum.accumulate(equity, axis=1)
+            np.maximum(peak, initial_capital, out=peak)
+            np.divide(equity, peak, out=peak)
+            max_drawdown[block] = (1.0 - peak.min(axis=1)) * 100
+            final_equity[block] = equity[:, -1]
+    else:
+        final_equity = np.full(paths, float(initial_capital))
+        max_drawdown = np.zeros(paths)
+
+    q = np.asarray(percentiles, dtype=np.float64)
+    return {
+        "method": method,
+        "paths": paths,
+        "trades": n_trades,
+        "percentiles": q,
+        "final_equity": np.percentile(final_equity, q),
+        "roi": (np.percentile(final_equity, q) - initial_capital) / initial_capital * 100,
+        "max_drawdown": np.percentile(max_drawdown, q),
+        "probability_of_loss": float(np.mean(final_equity < initial_capital))
+    }
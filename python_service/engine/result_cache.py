@@ -0,0 +1,279 @@
+"""
+Content-addressed cache of serialized backtest results.
+
+Keys hash the dataset (all columns and the index, or the id of a registered
+dataset), the source of the strategy module and of the engine modules that
+shape a result, the normalized parameters and the response options. Editing
+a strategy or the engine therefore never serves a stale result, including
+from the disk tier after a restart.
+
+Values are the encoded JSON bytes, so a hit skips the backtest and the
+serialization. The memory tier is an LRU bounded in bytes; with a directory
+configured, results are also written there and found again after they leave
+memory. Concurrent requests for the same key compute it once.
+
+Configure with RESULT_CACHE_MB (default 128, 0 disables), RESULT_CACHE_DIR
+(unset disables the disk tier) and RESULT_CACHE_DISK_MB (default 1024).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Modules besides the strategy whose code changes a result
+ENGINE_MODULES = ("backtest_engine", "downsample", "indicators", "risk", "serialization", "signals", "strategy_runner")
+
+_source_digests = {}
+
+
+def source_digest(path):
+    """Hash of a source file, computed once per process."""
+    digest = _source_digests.get(path)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = _source_digests[path] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return digest
+
+
+def code_version(module):
+    """Version of the code producing a strategy's results: its module plus the engine modules."""
+    engine_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = [module.__file__] + [os.path.join(engine_dir, name + ".py") for name in ENGINE_MODULES]
+    return hashlib.blake2b("".join(source_digest(path) for path in paths).encode(), digest_size=16).hexdigest()
+
+
+def frame_digest(df):
+    """Content hash of a DataFrame: column names, dtypes and values, and the index."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name, series in df.items():
+        values = series.to_numpy()
+        digest.update(f"{name}:{values.dtype.str}:{len(values)};".encode())
+        if values.dtype.kind in 'biufmM':
+            digest.update(np.ascontiguousarray(values).view(np.uint8))
+        else:
+            digest.update(repr(values.tolist()).encode())
+    index = df.index
+    digest.update(f"index:{type(index).__name__}:{index.dtype};".encode())
+    if isinstance(index, pd.RangeIndex):
+        digest.update(f"{index.start}:{index.stop}:{index.step}".encode())
+    elif index.dtype.kind in 'iufmM':
+        digest.update(np.ascontiguousarray(index.to_numpy()).view(np.uint8))
+    else:
+        digest.update(repr(index.tolist()).encode())
+    return digest.hexdigest()
+
+
+def normalize_params(params):
+    """Parameters in a canonical form: integral floats as ints (strategies cast them anyway)."""
+    def normal(value):
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, dict):
+            return {str(k): normal(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normal(v) for v in value]
+        return value
+    return normal(dict(params))
+
+
+def result_key(dataset, module, params, **options):
+    """
+    Cache key for a strategy run.
+
+    Args:
+        dataset (str): frame_digest() of the data, or a registered dataset id
+        module: Strategy module
+        params (dict): Strategy parameters
+        options: Response options that change the result (format, columns, ...)
+    """
+    text = json.dumps([dataset, module.__name__, code_version(module), normalize_params(params), options],
+                      sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes=128 * 1024 * 1024, directory=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.enabled = max_bytes > 0
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_bytes=None, directory=None, max_disk_bytes=None):
+        """Resize the memory tier (0 disables the cache) or change the disk tier ('' disables it)."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+                self.enabled = max_bytes > 0
+            if directory is not None:
+                self.directory = directory or None
+            if max_disk_bytes is not None:
+                self.max_disk_bytes = max_disk_bytes
+            self._evict(self.max_bytes if self.enabled else 0)
+
+    def get(self, key):
+        """Cached bytes for key, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return content
+
+        content = self._read(key)
+        with self._lock:
+            if content is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, content)
+        return content
+
+    def put(self, key, content):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(key, content)
+        self._write(key, content)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return (content, hit): the cached bytes for key, or compute() stored under key.
+
+        While one caller computes a key, others asking for it wait for that
+        result instead of computing it again.
+        """
+        if not self.enabled:
+            return compute(), False
+        while True:
+            content = self.get(key)
+            if content is not None:
+                return content, True
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            event.wait()
+            # The other caller may have failed; then the next loop computes
+
+        try:
+            content = compute()
+            self.put(key, content)
+            return content, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def _store(self, key, content):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        if len(content) > self.max_bytes:
+            return
+        self._entries[key] = content
+        self._bytes += len(content)
+        self._evict(self.max_bytes)
+
+    def _evict(self, limit):
+        while self._entries and self._bytes > limit:
+            _, content = self._entries.popitem(last=False)
+            self._bytes -= len(content)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                content = f.read()
+            # Recently read files are the last to be pruned
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return None
+        return content
+
+    def _write(self, key, content):
+        if not self.directory or len(content) > self.max_disk_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        partial = f"{path}.{threading.get_ident()}.partial"
+        with open(partial, "wb") as f:
+            f.write(content)
+        os.replace(partial, path)
+        self._prune()
+
+    def _prune(self):
+        """Delete the least recently used files until the disk tier fits max_disk_bytes."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def disk_usage(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return 0, 0
+        sizes = [entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        return len(sizes), sum(sizes)
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and self.directory and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+
+    def stats(self):
+        disk_entries, disk_bytes = self.disk_usage()
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+                "hits": self.hits + self.disk_hits,
+                "memory_hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+
+result_cache = ResultCache(max_bytes=int(float(os.environ.get("RESULT_CACHE_MB", 128)) * 1024 * 1024),
+                           directory=os.environ.get("RESULT_CACHE_DIR") or None,
+                           max_disk_bytes=int(float(os.environ.get("RESULT_CACHE_DISK_MB", 1024)) * 1024 * 1024))
@@ -0,0 +1,152 @@
+"""
+Risk and performance metrics from an equity curve and a trade ledger.
+
+The equity curve is scanned once, in fixed blocks of bars, carrying the
+running peak and the previous bar's equity across blocks. Blocks are the
+same for in-memory and memory-mapped curves, so a chunked run reports the
+same figures as an in-memory one. Bars with missing (NaN) equity, such as
+the gaps between stitched walk-forward windows, are skipped.
+
+Returns are per bar. Sharpe and Sortino ratios are annualized with the
+number of bars per year implied by the index timestamps, or with
+DEFAULT_BARS_PER_YEAR (daily bars) when there are none.
+"""
+import numpy as np
+import pandas as pd
+
+BLOCK_BARS = 1 << 18
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+DEFAULT_BARS_PER_YEAR = 252
+
+
+def bars_per_year(index, n):
+    """Bars per year implied by the first and last timestamps of index."""
+    if index is not None and n > 1:
+        ends = index[np.array([0, n - 1])]
+        if isinstance(ends, pd.DatetimeIndex):
+            span = (ends[1] - ends[0]).total_seconds()
+            if span > 0:
+                return (n - 1) * SECONDS_PER_YEAR / span
+    return DEFAULT_BARS_PER_YEAR
+
+
+def equity_statistics(equity):
+    """
+    One blockwise pass over the equity curve.
+
+    Returns:
+        dict: max_drawdown (fraction of the peak), max_drawdown_duration (bars
+        from a peak until equity is back at it, or until the last bar), and
+        the count, mean, sum of squared deviations and sum of squared
+        negative values of the per-bar returns
+    """
+    n = len(equity)
+    peak = -np.inf
+    last_peak = 0
+    prev = np.nan
+    max_drawdown = 0.0
+    max_duration = 0
+    count, mean, m2, downside = 0, 0.0, 0.0, 0.0
+
+    for b0 in range(0, n, BLOCK_BARS):
+        block = np.asarray(equity[b0:b0 + BLOCK_BARS], dtype=np.float64)
+        bars = np.arange(b0, b0 + len(block))
+
+        # fmax skips the NaN bars between stitched windows
+        running_max = np.fmax.accumulate(block)
+        np.fmax(running_max, peak, out=running_max)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where((running_max > 0) & ~np.isnan(block), 1 - block / running_max, 0.0)
+        max_drawdown = max(max_drawdown, float(drawdown.max()))
+
+        # Bars since the equity last stood at its running peak
+        peaks = np.maximum.accumulate(np.where(block >= running_max, bars, -1))
+        np.maximum(peaks, last_peak, out=peaks)
+        max_duration = max(max_duration, int((bars - peaks).max()))
+        peak, last_peak = running_max[-1], int(peaks[-1])
+
+        previous = np.concatenate([[prev], block[:-1]])
+        valid = (previous > 0) & ~np.isnan(block)
+        returns = block[valid] / previous[valid] - 1
+        prev = block[-1]
+
+        # Chan et al. pairwise update of the mean and squared deviations
+        k = len(returns)
+        if k:
+            block_mean = returns.mean()
+            block_m2 = float(np.square(returns - block_mean).sum())
+            delta = block_mean - mean
+            total = count + k
+            mean += delta * k / total
+            m2 += block_m2 + delta * delta * count * k / total
+            count = total
+            downside += float(np.square(np.minimum(returns, 0.0)).sum())
+
+    return {
+        "max_drawdown": max_drawdown,
+        "max_drawdown_duration": max_duration,
+        "returns": count,
+        "mean_return": mean,
+        "m2": m2,
+        "downside": downside
+    }
+
+
+def risk_metrics(equity, initial_capital, ledger, held_bars=0, index=None):
+    """
+    Extended summary metrics for a backtest.
+
+    Args:
+        equity (np.ndarray): Equity per bar (may be memory-mapped)
+        initial_capital (float): Starting equity
+        ledger (dict): Trade ledger arrays (entry_index, exit_index, pnl, ...)
+        held_bars (int): Bars with an open position
+        index: Optional bar labels; timestamps set the annualization
+
+    Returns:
+        dict: max_drawdown (%), max_drawdown_duration (bars), sharpe_ratio,
+        sortino_ratio, cagr (%), profit_factor, exposure (% of bars in the
+        market) and avg_trade_duration (bars). Undefined ratios are None.
+    """
+    n = len(equity)
+    stats = equity_statistics(equity)
+    periods = bars_per_year(index, n)
+    mean = stats["mean_return"]
+
+    sharpe = sortino = None
+    if stats["returns"] > 1 and stats["m2"] > 0:
+        sharpe = mean / np.sqrt(stats["m2"] / (stats["returns"] - 1)) * np.sqrt(periods)
+    if stats["returns"] and stats["downside"] > 0:
+        sortino = mean / np.sqrt(stats["downside"] / stats["returns"]) * np.sqrt(periods)
+
+    cagr = None
+    years = (n - 1) / periods
+    if years > 0 and initial_capital > 0:
+        final_value = float(equity[n - 1])
+        if np.isnan(final_value):
+            cagr = None
+        elif final_value > 0:
+            # Short spans compound to values beyond float range; those are reported as undefined
+            with np.errstate(over='ignore'):
+                growth = np.float64(final_value / initial_capital) ** (1 / years)
+            cagr = float((growth - 1) * 100) if np.isfinite(growth) else None
+        else:
+            cagr = -100.0
+
+    pnl = ledger["pnl"]
+    gross_profit = float(pnl[pnl > 0].sum())
+    gross_loss = -float(pnl[pnl < 0].sum())
+    durations = ledger["exit_index"] - ledger["entry_index"]
+
+    return {
+        "max_drawdown": stats["max_drawdown"] * 100,
+        "max_drawdown_duration": stats["max_drawdown_duration"],
+        "sharpe_ratio": None if sharpe is None else float(sharpe),
+        "sortino_ratio": None if sortino is None else float(sortino),
+        "cagr": cagr,
+        "profit_factor": gross_profit / gross_loss if gross_loss > 0 else None,
+        "exposure": held_bars / n * 100 if n else 0.0,
+        "avg_trade_duration": float(durations.mean()) if len(durations) else None
+    }
@@ -0,0 +1,89 @@
+"""
+Fast JSON serialization for backtest results.
+
+Results may contain NumPy arrays (columnar mode). With orjson installed they
+are encoded natively, NaN becoming null. Without it, arrays are converted to
+lists with NaN mapped to None in one vectorized step and encoded with json.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def column_to_list(values):
+    """Convert an array-like column to a JSON-ready list, with NaN/NaT as None."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        out = values.astype(object)
+        out[~np.isfinite(values)] = None
+        return out.tolist()
+    if values.dtype.kind in 'biu':
+        return values.tolist()
+    out = values.astype(object)
+    out[pd.isna(values)] = None
+    return out.tolist()
+
+
+def select_columns(df, columns=None):
+    """
+    Reset the index of df and keep only the requested columns ('index' is always kept).
+    """
+    frame = df.reset_index()
+    if columns is None:
+        return frame
+    unknown = sorted(set(columns) - set(frame.columns))
+    if unknown:
+        raise ValueError(f"Unknown data columns: {', '.join(unknown)}")
+    keep = [col for col in columns if col != 'index']
+    return frame[(['index'] if 'index' in frame.columns else []) + keep]
+
+
+def frame_columns(df, columns=None):
+    """
+    Convert a DataFrame (index included) into {column: array}.
+
+    Datetime values become strings; numeric columns stay NumPy arrays.
+
+    Args:
+        df (pd.DataFrame): Data with indicators
+        columns (list): Optional subset of columns to return ('index' is always kept)
+    """
+    frame = select_columns(df, columns)
+
+    result = {}
+    for name, series in frame.items():
+        values = series.to_numpy()
+        if values.dtype.kind in 'biuf':
+            result[str(name)] = np.ascontiguousarray(values)
+        elif values.dtype.kind == 'M':
+            result[str(name)] = series.astype(str).tolist()
+        else:
+            result[str(name)] = column_to_list(values)
+    return result
+
+
+def _jsonable(obj):
+    if isinstance(obj, dict):
+        return {k: _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return column_to_list(obj)
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not np.isfinite(obj):
+        return None
+    return obj
+
+
+def dumps(obj):
+    """Serialize a result (dicts, lists, scalars and NumPy arrays) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_jsonable(obj), separators=(',', ':')).encode()
@@ -0,0 +1,109 @@
+"""
+Columnar signal container produced by the strategy kernels.
+
+Signals are stored as parallel arrays (bar index, side, price). Reason strings
+are only formatted when a signal is materialized as a dict, so generating
+signals costs no per-bar Python work.
+"""
+import numpy as np
+
+from engine.backtest_engine import BUY, SELL
+
+SIDE_NAMES = {BUY: "BUY", SELL: "SELL"}
+
+
+class Signals:
+    def __init__(self, index, side, price, reasons=None, reason_values=None, labels=None, indicators=None):
+        """
+        Args:
+            index (np.ndarray): Integer bar position of each signal
+            side (np.ndarray): BUY (1) or SELL (-1) per signal
+            price (np.ndarray): Execution price per signal
+            reasons (dict): side -> reason template, formatted with `value=`
+            reason_values (np.ndarray): Optional value per signal passed to the template
+            labels (pd.Index): Optional index labels, reported as strings instead of bar positions
+            indicators (dict): Optional column name -> per-bar indicator array for the response data
+        """
+        self.index = np.asarray(index, dtype=np.int64)
+        self.side = np.asarray(side, dtype=np.int8)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.reasons = reasons or {}
+        self.reason_values = reason_values
+        self.labels = labels
+        self.indicators = indicators or {}
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8), np.empty(0))
+
+    @classmethod
+    def from_masks(cls, buy, sell, price, reasons=None, reason_values=None, labels=None, indicators=None):
+        """
+        Build signals from boolean BUY/SELL masks over all bars.
+
+        BUY takes precedence where both masks are set.
+        """
+        buy = np.asarray(buy, dtype=bool)
+        sell = np.asarray(sell, dtype=bool) & ~buy
+        index = np.flatnonzero(buy | sell)
+        side = np.where(buy[index], BUY, SELL)
+        price = np.asarray(price, dtype=np.float64)[index]
+        if reason_values is not None:
+            reason_values = np.asarray(reason_values)[index]
+        if labels is not None:
+            labels = labels[index]
+        return cls(index, side, price, reasons, reason_values, labels, indicators)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return Signals(
+                self.index[key], self.side[key], self.price[key], self.reasons,
+                self.reason_values[key] if self.reason_values is not None else None,
+                self.labels[key] if self.labels is not None else None,
+                self.indicators
+            )
+        return self._record(key, self.index[key].item(), self.side[key].item(), self.price[key].item())
+
+    def reason(self, k):
+        """Format the reason string for the k-th signal."""
+        template = self.reasons.get(self.side[k].item())
+        if template is None:
+            return None
+        value = self.reason_values[k].item() if self.reason_values is not None else None
+        return template.format(value=value)
+
+    def _record(self, k, index, side, price):
+        return {
+            "index": str(self.labels[k]) if self.labels is not None else index,
+            "signal": SIDE_NAMES[side],
+            "price": price,
+            "reason": self.reason(k)
+        }
+
+    def to_records(self):
+        """Materialize signals as a list of dicts (the API format)."""
+        return [
+            self._record(k, index, side, price)
+            for k, (index, side, price) in enumerate(zip(self.index.tolist(), self.side.tolist(), self.price.tolist()))
+        ]
+
+    def to_columns(self):
+        """Return signals as {field: array or list} (columnar API format)."""
+        return {
+            "index": [str(label) for label in self.labels] if self.labels is not None else self.index,
+            "signal": [SIDE_NAMES[side] for side in self.side.tolist()],
+            "price": self.price,
+            "reason": [self.reason(k) for k in range(len(self))]
+        }
+
+    def to_codes(self, n):
+        """Return a per-bar signal code array of length n (BUY=1, SELL=-1, HOLD=0)."""
+        codes = np.zeros(n, dtype=np.int8)
+        codes[self.index] = self.side
+        return codes
@@ -1,6 +1,16 @@
 import pandas as pd
+import numpy as np
 import importlib
-from engine.backtest_engine import BacktestEngine
+from engine.backtest_engine import BacktestEngine, signals_to_arrays
+from engine.downsample import check_max_points
+from engine.serialization import select_columns, frame_columns, dumps
+from engine.jobs import JobCancelled
+from engine.metrics import NULL_TIMER
+
+RESPONSE_FORMATS = ("records", "columnar")
+
+# Rows per NDJSON line in stream_strategy
+STREAM_CHUNK_ROWS = 10_000
 
 STRATEGY_MAP = {
     "sma": "strategies.sma_crossover",
@@ -8,7 +18,16 @@ STRATEGY_MAP = {
     "breakout": "strategies.breakout"
 }
 
-def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
+def load_strategy(strategy_name: str):
+    """
+    Resolve a strategy name ('sma', 'rsi', 'breakout') to its module.
+    """
+    module_name = STRATEGY_MAP.get(strategy_name.lower())
+    if not module_name:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    return importlib.import_module(module_name)
+
+def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict, response_format="records", include_data=True, columns=None, max_points=None, progress=None, timer=NULL_TIMER):
     """
     Dynamically load and run a strategy, then execute backtest.
     
@@ -16,6 +35,13 @@ def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
         df (pd.DataFrame): OHLCV data
         strategy_name (str): 'sma', 'rsi', or 'breakout'
         params (dict): Strategy parameters
+        response_format (str): 'records' (lists of dicts) or 'columnar' (dicts of arrays)
+        include_data (bool): Whether to echo the indicator-augmented data back
+        columns (list): Optional subset of data columns to return
+        max_points (int): Optional point budget for the equity curve (None = full resolution)
+        progress (callable): Optional progress(stage, bars_done, bars_total) hook, called between
+            stages and every engine.backtest_engine.PROGRESS_BLOCK_BARS bars of the backtest
+        timer (StageTimer): Optional timer; laps 'signals', 'backtest', 'results' and 'clean'
         
     Returns:
         dict: {
@@ -24,12 +50,21 @@ def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
             "data": list,
             "backtest": dict
         }
+        In columnar mode signals, data, trades and equity_curve are
+        {column: array} instead and the result should be encoded with
+        engine.serialization.dumps.
     """
     
     # 1. Resolve module name
     module_name = STRATEGY_MAP.get(strategy_name.lower())
     if not module_name:
         raise ValueError(f"Unknown strategy: {strategy_name}")
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown response format: {response_format}")
+    check_max_points(max_points)
+    if progress is None:
+        progress = lambda stage, bars_done=None, bars_total=None: None
+    bars = len(df)
     
     try:
         # 2. Dynamic Import
@@ -40,26 +75,41 @@ def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
             raise ImportError(f"Module {module_name} missing generate_signals()")
             
         # 4. Run Strategy
-        # Note: df is modified in-place by strategy to add indicators
+        # Note: strategies read indicators from the shared cache and never modify df
+        progress("signals", 0, bars)
         signals = module.generate_signals(df, params)
+        timer.lap("signals")
         
         # 5. Run Backtest
+        progress("backtest", 0, bars)
         engine = BacktestEngine(initial_capital=100000)
-        engine.run(df, signals)
-        backtest_results = engine.get_results()
+        engine.run(df, signals, progress=progress)
+        timer.lap("backtest")
+        progress("results", bars, bars)
         
         # 6. Prepare Return Data
         # Returns data with indicators included 
-        # Note: NaN values will be handled by convert_to_python_type function below
-        data_with_indicators = df.reset_index()
-        
-        # Convert index to string for JSON serialization
-        if 'index' in data_with_indicators.columns:
-             data_with_indicators['index'] = data_with_indicators['index'].astype(str)
+        data_with_indicators = df.assign(**getattr(signals, 'indicators', {}))
+
+        if response_format == "columnar":
+            # NaN handling and encoding happen vectorized in engine.serialization
+            result = {
+                "strategy": strategy_name,
+                "format": "columnar",
+                "signals": signals.to_columns() if hasattr(signals, 'to_columns') else frame_columns(pd.DataFrame(list(signals)).set_index('index'))
+            }
+            if include_data:
+                result["data"] = frame_columns(data_with_indicators, columns)
+            timer.lap("clean")
+            result["backtest"] = engine.get_columnar_results(max_points)
+            timer.lap("results")
+            return result
+
+        backtest_results = engine.get_results(max_points)
+        timer.lap("results")
         
         # Convert to dict and ensure all types are JSON-serializable
         # This removes numpy/pandas types that cause serialization issues
-        import json
         import numpy as np
         
         def convert_to_python_type(val):
@@ -69,16 +119,32 @@ def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
                 return float(val) if isinstance(val, np.floating) else int(val)
             return val
         
-        data_records = data_with_indicators.to_dict(orient='records')
-        # Clean the data
-        cleaned_data = []
-        for record in data_records:
-            cleaned_data.append({k: convert_to_python_type(v) for k, v in record.items()})
-        
+        result = {"strategy": strategy_name}
+
         # Clean signals
         cleaned_signals = []
         for sig in signals:
             cleaned_signals.append({k: convert_to_python_type(v) for k, v in sig.items()})
+        result["signals"] = cleaned_signals
+        
+        if include_data:
+            # Note: NaN values are handled by convert_to_python_type
+            data_with_indicators = select_columns(data_with_indicators, columns)
+            
+            # Convert index to string for JSON serialization
+            if 'index' in data_with_indicators.columns:
+                 data_with_indicators['index'] = data_with_indicators['index'].astype(str)
+            
+            # float32 prices (compact frames) echo their shortest decimal form, as orjson writes them
+            for name in data_with_indicators.columns[data_with_indicators.dtypes == np.float32]:
+                data_with_indicators[name] = data_with_indicators[name].astype(str).astype(np.float64)
+
+            data_records = data_with_indicators.to_dict(orient='records')
+            # Clean the data
+            cleaned_data = []
+            for record in data_records:
+                cleaned_data.append({k: convert_to_python_type(v) for k, v in record.items()})
+            result["data"] = cleaned_data
         
         # Clean backtest results
         def clean_dict(d):
@@ -89,16 +155,114 @@ def run_strategy(df: pd.DataFrame, strategy_name: str, params: dict):
             else:
                 return convert_to_python_type(d)
         
-        cleaned_backtest = clean_dict(backtest_results)
-        
-        return {
-            "strategy": strategy_name,
-            "signals": cleaned_signals,
-            "data": cleaned_data,
-            "backtest": cleaned_backtest
-        }
+        result["backtest"] = clean_dict(backtest_results)
+        timer.lap("clean")
+        return result
         
+    except ValueError:
+        raise
+    except JobCancelled:
+        raise
     except ImportError as e:
         raise ImportError(f"Failed to import strategy {strategy_name}: {str(e)}")
     except Exception as e:
         raise RuntimeError(f"Error running strategy {strategy_name}: {str(e)}")
+
+def stream_strategy(df: pd.DataFrame, strategy_name: str, params: dict, include_data=True, columns=None, max_points=None, chunk_rows=STREAM_CHUNK_ROWS, include_timings=False, include_memory=False, timer=NULL_TIMER):
+    """
+    Run a strategy and backtest, then return an iterator of NDJSON lines (bytes).
+
+    The signals and the engine run happen before this returns, so invalid
+    requests raise as in run_strategy. The lines are then encoded one at a
+    time, so no full response is held in memory:
+
+        {"type": "summary", "strategy", "format": "ndjson", "bars", "backtest": get_summary(), "rows": {section: count}}
+        {"type": <section>, "offset": first row, "columns": {column: [values]}}   repeated
+        {"type": "end"}   plus "timings" (ms) with include_timings and "memory"
+                          (timer.memory_report()) with include_memory
+
+    Sections come in the order signals, trades, equity_curve, data, each in
+    chunks of at most chunk_rows rows with the columns of the columnar format.
+
+    Args:
+        timer (StageTimer): Optional timer; laps 'signals' and 'backtest' before
+            returning and 'stream' once the last line is encoded
+    """
+    module = load_strategy(strategy_name)
+    check_max_points(max_points)
+    chunk_rows = max(1, int(chunk_rows))
+
+    signals = module.generate_signals(df, params)
+    timer.lap("signals")
+    engine = BacktestEngine(initial_capital=100000)
+    engine.run(df, signals)
+    timer.lap("backtest")
+
+    bars = engine.curve_bars(max_points)
+    data = df.assign(**getattr(signals, 'indicators', {})) if include_data else None
+    if include_data and columns is not None:
+        # Unknown columns must fail before the first line is sent
+        select_columns(data.iloc[:0], columns)
+    rows = {"signals": len(signals), "trades": len(engine.ledger['pnl']), "equity_curve": len(bars), "data": len(df) if include_data else 0}
+
+    def sections():
+        yield "signals", lambda a, b: signals[a:b].to_columns()
+        yield "trades", lambda a, b: {field: values[a:b] for field, values in engine.ledger.items()}
+        yield "equity_curve", lambda a, b: engine.curve_columns(bars[a:b])
+        yield "data", lambda a, b: frame_columns(data.iloc[a:b], columns)
+
+    def lines():
+        yield dumps({"type": "summary", "strategy": strategy_name, "format": "ndjson", "bars": len(df),
+                     "backtest": engine.get_summary(), "rows": rows}) + b"\n"
+        for section, chunk in sections():
+            for start in range(0, rows[section], chunk_rows):
+                yield dumps({"type": section, "offset": start, "columns": chunk(start, start + chunk_rows)}) + b"\n"
+        timer.lap("stream")
+        end = {"type": "end"}
+        if include_timings:
+            end["timings"] = timer.milliseconds()
+        if include_memory:
+            end["memory"] = timer.memory_report()
+        yield dumps(end) + b"\n"
+
+    return lines()
+
+def run_portfolio_strategy(frames: dict, strategy_name: str, params: dict, sizing="equal", fraction=None, max_points=None, initial_capital=100000):
+    """
+    Run one strategy on several symbols and backtest them as a single portfolio with shared cash.
+
+    Args:
+        frames (dict): symbol -> OHLCV DataFrame; bars are aligned on the index
+        strategy_name (str): 'sma', 'rsi', or 'breakout'
+        params (dict): Strategy parameters (shared by all symbols)
+        sizing (str): 'equal' or 'fraction' (see BacktestEngine.run_portfolio)
+        fraction (float): Fraction of equity per position for sizing='fraction'
+        max_points (int): Optional point budget for the equity curve
+
+    Returns:
+        dict: {"strategy", "format": "columnar", "backtest"} where backtest is
+        BacktestEngine.get_portfolio_results(); encode with engine.serialization.dumps.
+    """
+    if not frames:
+        raise ValueError("No symbols provided")
+    module = load_strategy(strategy_name)
+
+    # Align closes on the union of bars; a symbol's last price carries over its gaps
+    close = pd.concat({symbol: df['close'] for symbol, df in frames.items()}, axis=1).sort_index()
+    if not close.index.is_unique:
+        raise ValueError("Bars must have unique timestamps per symbol")
+    prices = close.ffill().to_numpy(dtype=np.float64)
+
+    codes = np.zeros(prices.shape, dtype=np.int8)
+    for j, df in enumerate(frames.values()):
+        signals = module.generate_signals(df, params)
+        symbol_codes, _ = signals_to_arrays(signals, df['close'].to_numpy(dtype=np.float64))
+        codes[close.index.get_indexer(df.index), j] = symbol_codes
+
+    engine = BacktestEngine(initial_capital=initial_capital)
+    engine.run_portfolio(prices, codes, symbols=list(frames), sizing=sizing, fraction=fraction, index=close.index)
+    return {
+        "strategy": strategy_name,
+        "format": "columnar",
+        "backtest": engine.get_portfolio_results(max_points)
+    }
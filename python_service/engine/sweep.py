@@ -0,0 +1,222 @@
+"""
+Parameter sweeps: evaluate a whole strategy parameter grid over one dataset.
+
+Indicators are computed once per distinct window (shared across every
+combination that uses it), signal codes are produced as a 2D array over the
+parameter axis and the all-in/all-out state machine is evaluated for all
+combinations at once, stepping trade by trade instead of bar by bar.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from engine.backtest_engine import BacktestEngine, BUY, SELL
+from engine.strategy_runner import load_strategy
+
+MAX_COMBINATIONS = 100000
+
+# Upper bound on bars x combinations held in memory per block
+BLOCK_CELLS = 4_000_000
+
+METRIC_FIELDS = ("final_balance", "roi", "total_trades", "winning_trades", "win_rate")
+
+
+def expand_range(spec):
+    """
+    Expand a parameter range into a list of values.
+
+    Accepts a scalar, a list of values, or {"start", "stop", "step"} with an
+    inclusive stop.
+    """
+    if isinstance(spec, dict):
+        start, stop = spec["start"], spec["stop"]
+        step = spec.get("step", 1)
+        if step <= 0:
+            raise ValueError("Range step must be positive")
+        return np.arange(start, stop + step / 2, step).tolist()
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    return [spec]
+
+
+def build_grid(param_ranges):
+    """
+    Build the cartesian product of parameter ranges as columnar arrays.
+
+    Returns:
+        (list, dict): parameter names and {name: np.ndarray} with one entry per combination
+    """
+    names = list(param_ranges)
+    values = [expand_range(param_ranges[name]) for name in names]
+
+    total = int(np.prod([len(v) for v in values])) if values else 1
+    if total == 0:
+        raise ValueError("Parameter grid is empty")
+    if total > MAX_COMBINATIONS:
+        raise ValueError(f"Parameter grid has {total} combinations (max {MAX_COMBINATIONS})")
+
+    columns = list(zip(*itertools.product(*values))) if values else []
+    return names, {name: np.asarray(col) for name, col in zip(names, columns)}
+
+
+def evaluate_codes(close, codes, initial_capital=100000):
+    """
+    Run the BacktestEngine state machine for every column of a signal code matrix.
+
+    Args:
+        close (np.ndarray): Close price per bar (also used as execution price)
+        codes (np.ndarray): Signal codes, shape (bars, combinations)
+        initial_capital (float): Starting cash for every combination
+
+    Returns:
+        dict: metric name -> np.ndarray with one value per combination
+    """
+    n, c = codes.shape
+    columns = np.arange(c)
+
+    # Signal events as (column, row) pairs, ordered by column then bar
+    row, col = np.nonzero(codes)
+    order = np.argsort(col, kind="stable")
+    row, col = row[order], col[order]
+    code = codes[row, col]
+
+    # A signal only changes state when it differs from the previous signal
+    # in its column (starting flat, so leading SELLs are ignored).
+    first = np.searchsorted(col, columns)
+    prev_code = np.empty_like(code)
+    prev_code[1:] = code[:-1]
+    prev_code[first[first < len(code)]] = SELL
+    effective = code != prev_code
+    row, col = row[effective], col[effective]
+
+    # Effective events alternate BUY, SELL, BUY, ... within each column
+    first = np.searchsorted(col, columns)
+    rank = np.arange(len(col)) - first[col]
+    trade = rank // 2
+    is_exit = (rank % 2).astype(bool)
+
+    # Order columns by number of entries so step t only touches the prefix
+    # of columns that still have an entry at t.
+    entries = np.bincount(col[~is_exit], minlength=c)
+    by_entries = np.argsort(-entries, kind="stable")
+    slot = np.empty(c, dtype=np.int64)
+    slot[by_entries] = columns
+    active = np.searchsorted(-entries[by_entries], -np.arange(entries.max(initial=0)), side='left')
+
+    entry_price = np.full((c, len(active)), np.nan)
+    exit_price = np.full((c, len(active)), np.nan)
+    entry_price[slot[col[~is_exit]], trade[~is_exit]] = close[row[~is_exit]]
+    exit_price[slot[col[is_exit]], trade[is_exit]] = close[row[is_exit]]
+
+    cash = np.full(c, float(initial_capital))
+    open_quantity = np.zeros(c)
+    total_trades = np.zeros(c, dtype=np.int64)
+    winning_trades = np.zeros(c, dtype=np.int64)
+    unfilled = np.zeros(c, dtype=bool)
+
+    with np.errstate(invalid='ignore'):
+        for t, m in enumerate(active.tolist()):
+            buy_price = entry_price[:m, t]
+            sell_price = exit_price[:m, t]
+            has_exit = ~np.isnan(sell_price)
+
+            quantity = np.floor_divide(cash[:m], buy_price)
+            unfilled[:m] |= ~(quantity > 0)
+            cash[:m] -= quantity * buy_price
+
+            revenue = quantity * sell_price
+            pnl = revenue - quantity * buy_price
+            cash[:m] = np.where(has_exit, cash[:m] + revenue, cash[:m])
+            total_trades[:m] += has_exit
+            winning_trades[:m] += has_exit & (pnl > 0)
+            open_quantity[:m] = np.where(has_exit, 0.0, quantity)
+
+    final_balance = cash + open_quantity * close[-1] if n else cash
+    unfilled = unfilled[slot]
+
+    final_balance, total_trades, winning_trades = final_balance[slot], total_trades[slot], winning_trades[slot]
+    results = {
+        "final_balance": final_balance,
+        "roi": (final_balance - initial_capital) / initial_capital * 100,
+        "total_trades": total_trades,
+        "winning_trades": winning_trades,
+        "win_rate": np.divide(winning_trades, total_trades, out=np.zeros(c), where=total_trades > 0) * 100
+    }
+
+    # A BUY the cash cannot cover leaves the position flat, which breaks the
+    # strict alternation above. Those columns are replayed with the engine.
+    for j in np.flatnonzero(unfilled).tolist():
+        engine = BacktestEngine(initial_capital=initial_capital)
+        engine.run_arrays(close, codes[:, j])
+        metrics = engine.get_summary(risk=False)
+        for field in METRIC_FIELDS:
+            results[field][j] = metrics[field]
+
+    return results
+
+
+def evaluate_grid(df, module, grid, initial_capital=100000):
+    """
+    Metrics of every combination of a columnar grid (see build_grid) over df.
+
+    Returns:
+        dict: metric name -> np.ndarray with one value per combination
+    """
+    combinations = len(next(iter(grid.values()))) if grid else 1
+    close = df['close'].to_numpy(dtype=float)
+
+    chunk_size = max(1, BLOCK_CELLS // max(len(close), 1))
+    metrics = {field: np.zeros(combinations) for field in METRIC_FIELDS}
+    for block, codes in module.generate_signal_grid(df, grid, chunk_size=chunk_size):
+        block_metrics = evaluate_codes(close, codes, initial_capital)
+        for field in METRIC_FIELDS:
+            metrics[field][block] = block_metrics[field]
+    return metrics
+
+
+def result_table(names, grid, metrics, order):
+    """Columnar sweep results for the combinations at positions order."""
+    table = {name: grid[name][order].tolist() for name in names}
+    for field in METRIC_FIELDS:
+        values = metrics[field][order]
+        table[field] = values.astype(int).tolist() if field.endswith("_trades") else values.tolist()
+    return table
+
+
+def run_sweep(df: pd.DataFrame, strategy_name: str, param_ranges: dict, top=None, initial_capital=100000):
+    """
+    Evaluate every combination of param_ranges for a strategy in one pass.
+
+    Args:
+        df (pd.DataFrame): OHLCV data
+        strategy_name (str): 'sma', 'rsi', or 'breakout'
+        param_ranges (dict): param -> value, list of values or {"start", "stop", "step"}
+        top (int): Optionally return only the best `top` combinations by ROI
+
+    Returns:
+        dict: {
+            "strategy": str,
+            "combinations": int,
+            "params": list,
+            "results": {column: list}
+        }
+    """
+    module = load_strategy(strategy_name)
+    if not hasattr(module, 'generate_signal_grid'):
+        raise ValueError(f"Strategy {strategy_name} does not support parameter sweeps")
+
+    names, grid = build_grid(param_ranges)
+    combinations = len(next(iter(grid.values()))) if grid else 1
+    metrics = evaluate_grid(df, module, grid, initial_capital)
+
+    order = np.argsort(-metrics["roi"], kind="stable")
+    if top:
+        order = order[:int(top)]
+
+    return {
+        "strategy": strategy_name,
+        "combinations": combinations,
+        "params": names,
+        "results": result_table(names, grid, metrics, order)
+    }
@@ -0,0 +1,199 @@
+"""
+Walk-forward optimization.
+
+The dataset is split into train/test windows (rolling or anchored). Each train
+window is optimized with a parameter sweep in a worker process; the workers
+read the OHLCV columns from one shared memory block instead of receiving a
+pickled copy. The chosen parameters are then backtested on the following test
+window, and the test windows are stitched into one out-of-sample equity curve
+where each window starts with the equity the previous one ended with.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from engine.backtest_engine import BacktestEngine, signals_to_arrays, TRADE_FIELDS
+from engine.strategy_runner import load_strategy
+from engine.sweep import run_sweep
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Attached in each worker process by _attach
+_shared = {}
+
+
+def make_windows(n, train_size, test_size, step=None, anchored=False):
+    """
+    Split n bars into (train_start, train_end, test_start, test_end) windows.
+
+    Rolling windows keep train_size bars of training history; anchored windows
+    always train from bar 0. Test windows advance by step (default test_size)
+    and the last one is truncated at n.
+    """
+    train_size, test_size = int(train_size), int(test_size)
+    step = int(step or test_size)
+    if train_size <= 0 or test_size <= 0 or step <= 0:
+        raise ValueError("train_size, test_size and step must be positive")
+    if train_size >= n:
+        raise ValueError(f"train_size must be smaller than the number of bars ({n})")
+
+    windows = []
+    for test_start in range(train_size, n, step):
+        train_start = 0 if anchored else test_start - train_size
+        windows.append((train_start, test_start, test_start, min(test_start + test_size, n)))
+    return windows
+
+
+def _attach(name, columns, bars):
+    """Worker initializer: map the shared OHLCV block into a DataFrame without copying."""
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        shm = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((len(columns), bars), dtype=np.float64, buffer=shm.buf)
+    _shared["shm"] = shm
+    _shared["df"] = pd.DataFrame({col: block[i] for i, col in enumerate(columns)}, copy=False)
+
+
+def _optimize_window(strategy_name, param_ranges, train_start, train_end, initial_capital):
+    """Best parameters by ROI on one train window (runs in a worker)."""
+    train = _shared["df"].iloc[train_start:train_end]
+    sweep = run_sweep(train, strategy_name, param_ranges, top=1, initial_capital=initial_capital)
+    table = sweep["results"]
+    params = {name: table[name][0] for name in sweep["params"]}
+    return params, table["roi"][0]
+
+
+def _share_frame(df):
+    columns = [col for col in OHLCV_COLUMNS if col in df.columns]
+    block = np.stack([df[col].to_numpy(dtype=np.float64) for col in columns])
+    shm = shared_memory.SharedMemory(create=True, size=max(block.nbytes, 1))
+    np.ndarray(block.shape, dtype=np.float64, buffer=shm.buf)[:] = block
+    return shm, columns
+
+
+def optimize_windows(df, strategy_name, param_ranges, windows, workers=None, initial_capital=100000):
+    """
+    Optimize every train window, in parallel when workers != 1.
+
+    Returns:
+        list: (params, train_roi) per window
+    """
+    shm, columns = _share_frame(df)
+    try:
+        initargs = (shm.name, columns, len(df))
+        jobs = [(strategy_name, param_ranges, w[0], w[1], initial_capital) for w in windows]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(windows) == 1:
+            _attach(*initargs)
+            try:
+                return [_optimize_window(*job) for job in jobs]
+            finally:
+                _shared.pop("df", None)
+                _shared.pop("shm").close()
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(windows)), initializer=_attach, initargs=initargs) as pool:
+            futures = [pool.submit(_optimize_window, *job) for job in jobs]
+            return [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def run_walk_forward(df: pd.DataFrame, strategy_name: str, param_ranges: dict, train_size, test_size,
+                     step=None, anchored=False, workers=None, initial_capital=100000, max_points=None):
+    """
+    Optimize on each train window, trade the best parameters on the following
+    test window and stitch the out-of-sample results.
+
+    Indicators for a test window are computed from the start of its train
+    window, so they are warmed up on the first test bar. Open positions are
+    marked to market at the end of each test window; the next window starts
+    flat with that equity as cash. With step > test_size the bars between test
+    windows are not traded and are left out of the stitched curve and metrics.
+
+    Args:
+        df (pd.DataFrame): OHLCV data
+        strategy_name (str): 'sma', 'rsi', or 'breakout'
+        param_ranges (dict): param -> value, list of values or {"start", "stop", "step"}
+        train_size (int): Bars per train window (initial window when anchored)
+        test_size (int): Bars per test window
+        step (int): Bars between consecutive windows (default test_size)
+        anchored (bool): Train from bar 0 instead of a rolling window
+        workers (int): Worker processes (default: CPU count, 1 = in process)
+        max_points (int): Optional point budget for the equity curve
+
+    Returns:
+        dict: {"strategy", "windows": {column: array}, "backtest": columnar results}
+    """
+    module = load_strategy(strategy_name)
+    if step and int(step) < int(test_size):
+        raise ValueError("step must be at least test_size so test windows do not overlap")
+    windows = make_windows(len(df), train_size, test_size, step=step, anchored=anchored)
+    optimized = optimize_windows(df, strategy_name, param_ranges, windows, workers=workers, initial_capital=initial_capital)
+
+    close = df['close'].to_numpy(dtype=np.float64)
+    equity = np.full(len(df), np.nan)
+    ledgers = []
+    capital = initial_capital
+    held = 0
+    table = {"train_start": [], "test_start": [], "test_end": [], "train_roi": [], "test_roi": [], "test_trades": []}
+    params_table = {name: [] for name in param_ranges}
+
+    for (train_start, _, test_start, test_end), (params, train_roi) in zip(windows, optimized):
+        # Signals over train + test so indicators are warm at test_start
+        history = df.iloc[train_start:test_end]
+        codes, exec_prices = signals_to_arrays(module.generate_signals(history, params), close[train_start:test_end])
+        offset = test_start - train_start
+
+        engine = BacktestEngine(initial_capital=capital)
+        engine.run_arrays(close[test_start:test_end], codes[offset:], exec_prices[offset:])
+        summary = engine.get_summary(risk=False)
+
+        equity[test_start:test_end] = engine.equity
+        ledger = dict(engine.ledger)
+        ledger["entry_index"] = ledger["entry_index"] + test_start
+        ledger["exit_index"] = ledger["exit_index"] + test_start
+        ledgers.append(ledger)
+        held += engine.held_bars
+
+        table["train_start"].append(train_start)
+        table["test_start"].append(test_start)
+        table["test_end"].append(test_end)
+        table["train_roi"].append(train_roi)
+        table["test_roi"].append(summary["roi"])
+        table["test_trades"].append(summary["total_trades"])
+        for name in params_table:
+            params_table[name].append(params.get(name))
+        capital = summary["final_balance"]
+
+    # Stitch the out-of-sample windows into one engine result over the tested
+    # bars only; positions maps its bars back to bars of df
+    positions = np.concatenate([np.arange(test_start, test_end) for _, _, test_start, test_end in windows])
+    index = df.index[positions]
+    stitched = BacktestEngine(initial_capital=initial_capital)
+    stitched.index = None if isinstance(df.index, pd.RangeIndex) else index
+    stitched.close = close[positions]
+    stitched.equity = equity[positions]
+    stitched.held_bars = held
+    stitched.ledger = {
+        field: np.searchsorted(positions, values) if field.endswith("_index") else values
+        for field, values in ((field, np.concatenate([ledger[field] for ledger in ledgers])) for field in TRADE_FIELDS)
+    }
+
+    backtest = stitched.get_columnar_results(max_points)
+    curve = backtest["equity_curve"]
+    curve["index"] = positions[curve["index"]]
+    if stitched.index is None:
+        curve["timestamp"] = curve["index"].tolist()
+    backtest["trades"]["entry_index"] = positions[backtest["trades"]["entry_index"]]
+    backtest["trades"]["exit_index"] = positions[backtest["trades"]["exit_index"]]
+    return {
+        "strategy": strategy_name,
+        "mode": "anchored" if anchored else "rolling",
+        "windows": dict(table, params=params_table),
+        "backtest": backtest
+    }
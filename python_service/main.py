@@ -1,16 +1,207 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Body, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+import json
 import pandas as pd
-from engine.strategy_runner import run_strategy
+from engine.strategy_runner import run_strategy, stream_strategy, run_portfolio_strategy, load_strategy, RESPONSE_FORMATS
+from engine.backtest_engine import BacktestEngine
+from engine.incremental import LiveSession
+from engine.sweep import run_sweep
+from engine.halving import run_halving, DEFAULT_ETA
+from engine.walk_forward import run_walk_forward
+from engine.batch import run_batch
+from engine.downsample import check_max_points
+from engine.chunked import run_chunked, history_path, DEFAULT_CHUNK_BARS
+from engine.indicator_cache import indicator_cache
+from engine.datasets import dataset_registry, UnknownDataset
+from engine.result_cache import result_cache, result_key, frame_digest
+from engine.ingest import frame_from_columns, compact_frame, decode_binary
+from engine.serialization import dumps
+from engine.jobs import job_queue, QueueFull, FINISHED, DONE, FAILED
+from engine.metrics import metrics, RequestClock, NULL_TIMER
 
 app = FastAPI()
+if metrics.enabled:
+    app.add_middleware(RequestClock, metrics=metrics)
+
+# Equity curves longer than this are downsampled unless full resolution is requested
+DEFAULT_MAX_POINTS = 2000
 
 class StrategyRequest(BaseModel):
     symbol: str
     strategy: str # sma_crossover, rsi_mean_reversion, etc
     params: Dict[str, Any]
-    data: List[Dict[str, Any]] # List of {timestamp, open, high, low, close, volume}
+    # List of {timestamp, open, high, low, close, volume}, or columnar {column: [values]}
+    data: Optional[Union[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+    dataset: Optional[str] = None # Id from POST /datasets, instead of data
+    response_format: str = "records" # "records", "columnar" or "ndjson" (streamed, see stream_strategy)
+    include_data: bool = True # Echo the indicator-augmented data back
+    columns: Optional[List[str]] = None # Subset of data columns to return
+    max_points: Optional[int] = DEFAULT_MAX_POINTS # Equity curve point budget; null or 0 for full resolution
+    include_timings: bool = False # Add per-stage timings (ms) to the response as "timings"
+    include_memory: bool = False # Add peak memory and bytes allocated per stage as "memory" (traces allocations; slower)
+    compact: bool = False # Hold inline data as float32 prices and integer timestamps (see compact_frame)
+
+class SweepRequest(BaseModel):
+    symbol: str
+    strategy: str
+    params: Dict[str, Any] # param -> value, list of values, or {start, stop, step}
+    data: Optional[Union[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+    dataset: Optional[str] = None
+    top: Optional[int] = None # Only return the best N combinations by ROI
+    search: str = "grid" # "grid" (every combination), "halving" or "hyperband" (see engine/halving.py)
+    eta: int = DEFAULT_ETA # halving/hyperband: keep 1/eta of the candidates per rung
+    min_bars: Optional[int] = None # halving/hyperband: bars in the shortest prefix
+    budget: Optional[float] = None # halving/hyperband: max fraction of the full grid's bar evaluations
+    seed: Optional[int] = None
+    metric: str = "roi" # halving/hyperband: summary field to maximize
+
+class MonteCarloRequest(BaseModel):
+    symbol: str
+    strategy: str
+    params: Dict[str, Any]
+    data: Optional[Union[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+    dataset: Optional[str] = None
+    paths: int = 10000 # Number of resampled equity paths
+    method: str = "bootstrap" # "bootstrap" or "block"
+    block_size: Optional[int] = None # Trades per block for method="block" (default ~sqrt(trades))
+    seed: Optional[int] = None
+
+class WalkForwardRequest(BaseModel):
+    symbol: str
+    strategy: str
+    params: Dict[str, Any] # param -> value, list of values, or {start, stop, step}
+    data: Optional[Union[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+    dataset: Optional[str] = None
+    train_size: int # Bars per train window
+    test_size: int # Bars per out-of-sample test window
+    step: Optional[int] = None # Bars between windows (default test_size)
+    anchored: bool = False # Train from the first bar instead of a rolling window
+    workers: Optional[int] = None # Worker processes (default: CPU count)
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+
+class ChunkedBacktestRequest(BaseModel):
+    dataset: str # History file <dataset>.npy in HISTORY_DIR (see engine/chunked.py)
+    strategy: str
+    params: Dict[str, Any]
+    chunk_size: int = DEFAULT_CHUNK_BARS # Bars held in memory at a time
+    include_signals: bool = False # The signal list grows with the history
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+
+class BatchJob(BaseModel):
+    strategy: str
+    params: Dict[str, Any]
+    dataset: Optional[str] = None # Id from POST /datasets; jobs on the same dataset share indicators
+    data: Optional[Union[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+
+class BatchRequest(BaseModel):
+    jobs: List[BatchJob]
+    include_signals: bool = False
+    workers: Optional[int] = None # Worker processes (default and at most: CPU count, 1 = in process)
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+
+class DatasetRequest(BaseModel):
+    symbol: Optional[str] = None
+    data: Union[List[Dict[str, Any]], Dict[str, List[Any]]] # Same formats as StrategyRequest.data
+    compact: bool = False # Store float32 prices and integer timestamps (see compact_frame)
+
+class PortfolioRequest(BaseModel):
+    strategy: str
+    params: Dict[str, Any]
+    # symbol -> OHLCV data in either StrategyRequest format; bars are aligned on timestamp
+    data: Dict[str, Union[List[Dict[str, Any]], Dict[str, List[Any]]]]
+    sizing: str = "equal" # "equal" (equity / n_symbols) or "fraction"
+    fraction: Optional[float] = None # Fraction of equity per position for sizing="fraction"
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+
+def build_dataframe(data, compact=False):
+    # Columnar payloads go straight into NumPy without per-row handling
+    if isinstance(data, dict):
+        df = frame_from_columns(data)
+        return compact_frame(df) if compact else df
+
+    # Convert input list of dicts to DataFrame
+    df = pd.DataFrame(data)
+    if df.empty:
+        raise HTTPException(status_code=400, detail="Empty data provided")
+    
+    # Ensure correct types and index
+    # Assuming input has 'timestamp' or index is just 0..N
+    if 'timestamp' in df.columns:
+        df['index'] = pd.to_datetime(df['timestamp'], unit='s') if df['timestamp'].dtype == 'int64' else pd.to_datetime(df['timestamp'])
+        df.set_index('index', inplace=True)
+        
+    required_cols = ['open', 'high', 'low', 'close', 'volume']
+    for col in required_cols:
+        if col not in df.columns:
+            # Try case insensitive mapping
+            pass 
+    
+    return compact_frame(df) if compact else df
+
+def request_frame(request):
+    # Registered datasets come back as frames over the registry's read-only arrays
+    if request.dataset is not None:
+        try:
+            return dataset_registry.get(request.dataset)
+        except UnknownDataset as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    if request.data is None:
+        raise HTTPException(status_code=400, detail="Provide either data or dataset")
+    return build_dataframe(request.data, compact=getattr(request, "compact", False))
+
+def request_timer(http_request, memory=False):
+    # Everything before the endpoint runs (body read, JSON decode, validation) counts as parsing
+    route = http_request.scope.get("route")
+    timer = metrics.timer(getattr(route, "path", http_request.url.path), getattr(http_request.state, "received", None), memory=memory)
+    timer.lap("parse")
+    if timer.memory is not None:
+        # Parsing happened before tracing started
+        del timer.memory["parse"]
+    return timer
+
+def ndjson_response(lines, timer=NULL_TIMER, strategy=None, bars=None):
+    # Stage timings so far go in the header; the whole stream is observed once it ends
+    headers = timer.headers()
+
+    def observed():
+        yield from lines
+        metrics.observe(timer, strategy, bars)
+        timer.close()
+
+    return StreamingResponse(observed(), media_type="application/x-ndjson", headers=headers)
+
+def strategy_result_key(dataset, df, strategy, params, **options):
+    # Registered datasets are already content-addressed; inline data is hashed
+    source = f"dataset:{dataset}" if dataset is not None else f"data:{frame_digest(df)}"
+    return result_key(source, load_strategy(strategy), params, strategy=strategy, **options)
+
+def cached_json_response(key, run, timer=NULL_TIMER, strategy=None, bars=None):
+    # A hit skips the run and the serialization; identical concurrent requests run once
+    def compute():
+        content = dumps(run())
+        timer.lap("serialize")
+        return content
+
+    content, hit = result_cache.get_or_compute(key, compute)
+    if hit:
+        timer.lap("cache")
+    else:
+        # Hits are counted by the results cache (cache_hits_total); their
+        # sub-millisecond timings would skew the run histograms
+        metrics.observe(timer, strategy, bars)
+    timer.close()
+    headers = dict(timer.headers() or {}, **{"X-Cache": "HIT" if hit else "MISS"})
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def json_response(result, timer=NULL_TIMER, strategy=None, bars=None):
+    # Encode directly with the fast encoder instead of FastAPI's per-item jsonable_encoder
+    content = dumps(result)
+    timer.lap("serialize")
+    metrics.observe(timer, strategy, bars)
+    timer.close()
+    return Response(content=content, media_type="application/json", headers=timer.headers())
 
 @app.get("/")
 def read_root():
@@ -20,35 +211,315 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/cache-stats")
+def cache_stats():
+    return {"indicators": indicator_cache.stats(), "datasets": dataset_registry.stats(), "results": result_cache.stats()}
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(caches={"indicators": indicator_cache.stats(), "datasets": dataset_registry.stats(), "results": result_cache.stats()}, jobs=job_queue.stats()["jobs"]),
+                             media_type="text/plain; version=0.0.4")
+
 @app.post("/test")
 def test_endpoint(payload: Dict[str, Any]):
     return {"status": "ok", "payload_received": payload}
 
+def register_dataset(df):
+    dataset_id, created = dataset_registry.register(df)
+    return dict(dataset_registry.info(dataset_id), created=created)
+
+@app.post("/datasets")
+def upload_dataset(request: DatasetRequest):
+    """
+    Store OHLCV bars and return their id for the dataset field of later requests.
+    Uploading the same bars again returns the same id.
+    """
+    try:
+        return json_response(register_dataset(build_dataframe(request.data, compact=request.compact)))
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/datasets/binary")
+def upload_dataset_binary(body: bytes = Body(..., media_type="application/octet-stream")):
+    """
+    Same as POST /datasets with a binary OHLCV payload (see engine/ingest.py).
+    """
+    try:
+        header, df = decode_binary(body)
+        return json_response(register_dataset(compact_frame(df) if header.get('compact') else df))
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.get("/datasets")
+def dataset_stats():
+    return dataset_registry.stats()
+
+@app.get("/datasets/{dataset_id}")
+def dataset_info(dataset_id: str):
+    try:
+        return dataset_registry.info(dataset_id)
+    except UnknownDataset as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.delete("/datasets/{dataset_id}")
+def delete_dataset(dataset_id: str):
+    if not dataset_registry.delete(dataset_id):
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset_id}")
+    return {"dataset_id": dataset_id, "deleted": True}
+
 @app.post("/run-strategy")
 @app.post("/run-backtest")
-def execute_strategy(request: StrategyRequest):
-    try:
-        # Convert input list of dicts to DataFrame
-        df = pd.DataFrame(request.data)
-        if df.empty:
-            raise HTTPException(status_code=400, detail="Empty data provided")
-        
-        # Ensure correct types and index
-        # Assuming input has 'timestamp' or index is just 0..N
-        if 'timestamp' in df.columns:
-            df['index'] = pd.to_datetime(df['timestamp'], unit='s') if df['timestamp'].dtype == 'int64' else pd.to_datetime(df['timestamp'])
-            df.set_index('index', inplace=True)
-            
-        required_cols = ['open', 'high', 'low', 'close', 'volume']
-        for col in required_cols:
-            if col not in df.columns:
-                # Try case insensitive mapping
-                pass 
+def execute_strategy(request: StrategyRequest, http_request: Request):
+    try:
+        timer = request_timer(http_request, memory=request.include_memory)
+        df = request_frame(request)
+        timer.lap("dataframe")
+        if request.response_format == "ndjson":
+            lines = stream_strategy(df, request.strategy, request.params,
+                                    include_data=request.include_data,
+                                    columns=request.columns,
+                                    max_points=request.max_points,
+                                    include_timings=request.include_timings,
+                                    include_memory=request.include_memory,
+                                    timer=timer)
+            return ndjson_response(lines, timer, request.strategy.lower(), len(df))
                 
         # Run
-        result = run_strategy(df, request.strategy, request.params)
-        return result
+        def run():
+            return run_strategy(df, request.strategy, request.params,
+                                response_format=request.response_format,
+                                include_data=request.include_data,
+                                columns=request.columns,
+                                max_points=request.max_points,
+                                timer=timer)
+
+        if request.include_timings or request.include_memory:
+            # Timings and memory describe this request's run, so it is neither cached nor served from the cache
+            result = run()
+            if request.include_timings:
+                result["timings"] = timer.milliseconds()
+            if request.include_memory:
+                result["memory"] = timer.memory_report()
+            return json_response(result, timer, request.strategy.lower(), len(df))
+        key = strategy_result_key(request.dataset, df, request.strategy, request.params,
+                                  response_format=request.response_format,
+                                  include_data=request.include_data,
+                                  columns=request.columns,
+                                  max_points=request.max_points)
+        return cached_json_response(key, run, timer, request.strategy.lower(), len(df))
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/run-backtest-binary")
+def execute_strategy_binary(http_request: Request, body: bytes = Body(..., media_type="application/octet-stream")):
+    """
+    Same as /run-backtest, but the request is a binary OHLCV payload (see engine/ingest.py).
+    """
+    try:
+        timer = request_timer(http_request)
+        header, df = decode_binary(body)
+        if header.get('include_memory'):
+            # Not known before decoding, so parsing and the decode itself are not traced
+            timer = metrics.trace_memory(timer)
+        if header.get('compact'):
+            df = compact_frame(df)
+        timer.lap("dataframe")
+        if 'strategy' not in header:
+            raise ValueError("Binary payload header must include 'strategy'")
+        if header.get('response_format') == "ndjson":
+            lines = stream_strategy(df, header['strategy'], header.get('params', {}),
+                                    include_data=header.get('include_data', True),
+                                    columns=header.get('output_columns'),
+                                    max_points=header.get('max_points', DEFAULT_MAX_POINTS),
+                                    include_timings=header.get('include_timings', False),
+                                    include_memory=header.get('include_memory', False),
+                                    timer=timer)
+            return ndjson_response(lines, timer, header['strategy'].lower(), len(df))
+        options = {"response_format": header.get('response_format', "records"),
+                   "include_data": header.get('include_data', True),
+                   "columns": header.get('output_columns'),
+                   "max_points": header.get('max_points', DEFAULT_MAX_POINTS)}
+
+        def run():
+            return run_strategy(df, header['strategy'], header.get('params', {}), timer=timer, **options)
+
+        if header.get('include_timings') or header.get('include_memory'):
+            result = run()
+            if header.get('include_timings'):
+                result["timings"] = timer.milliseconds()
+            if header.get('include_memory'):
+                result["memory"] = timer.memory_report()
+            return json_response(result, timer, header['strategy'].lower(), len(df))
+        key = strategy_result_key(None, df, header['strategy'], header.get('params', {}), **options)
+        return cached_json_response(key, run, timer, header['strategy'].lower(), len(df))
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/run-backtest-chunked")
+def execute_strategy_chunked(request: ChunkedBacktestRequest, http_request: Request):
+    """
+    Backtest a server-side history file chunk by chunk with bounded memory.
+    """
+    try:
+        timer = request_timer(http_request)
+        result = run_chunked(history_path(request.dataset), request.strategy, request.params,
+                             chunk_size=request.chunk_size,
+                             max_points=request.max_points,
+                             include_signals=request.include_signals)
+        timer.lap("backtest")
+        return json_response(result, timer, request.strategy.lower(), result["bars"])
+        
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/sweep")
+def sweep_strategy(request: SweepRequest, http_request: Request):
+    try:
+        timer = request_timer(http_request)
+        df = request_frame(request)
+        timer.lap("dataframe")
+        if request.search == "grid":
+            result = run_sweep(df, request.strategy, request.params, top=request.top)
+        else:
+            result = run_halving(df, request.strategy, request.params, method=request.search,
+                                 eta=request.eta, min_bars=request.min_bars, budget=request.budget,
+                                 seed=request.seed, metric=request.metric, top=request.top)
+        timer.lap("sweep")
+        return json_response(result, timer, request.strategy.lower(), len(df))
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/run-backtest-batch")
+def execute_batch(request: BatchRequest, http_request: Request):
+    """
+    Run many backtests together and stream one NDJSON line per job as it
+    finishes: {"job": position, "status": "done", "result": {...}} or
+    {"job": position, "status": "failed", "error": "..."}.
+    """
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="No jobs provided")
+    try:
+        check_max_points(request.max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    timer = request_timer(http_request)
+    jobs, failed = [], []
+    for i, job in enumerate(request.jobs):
+        try:
+            df = request_frame(job)
+        except (HTTPException, ValueError) as e:
+            # Bad inline data fails its own job, not the batch
+            failed.append((i, getattr(e, "detail", str(e))))
+            continue
+        # Jobs on one registered dataset share a group; inline data is never assumed equal
+        group = job.dataset if job.dataset is not None else f"data:{i}"
+        jobs.append((i, {"df": df, "group": group, "strategy": job.strategy, "params": job.params}))
+    timer.lap("dataframe")
+    bars = sum(len(job["df"]) for _, job in jobs)
+
+    def lines():
+        for i, error in failed:
+            yield dumps({"job": i, "status": "failed", "error": error}) + b"\n"
+        positions = [i for i, _ in jobs]
+        for k, result, error in run_batch([job for _, job in jobs],
+                                           max_points=request.max_points,
+                                           include_signals=request.include_signals,
+                                           workers=request.workers):
+            if error is None:
+                yield dumps({"job": positions[k], "status": "done", "result": result}) + b"\n"
+            else:
+                yield dumps({"job": positions[k], "status": "failed", "error": error}) + b"\n"
+        timer.lap("batch")
+        metrics.observe(timer, "batch", bars)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=timer.headers())
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: StrategyRequest):
+    """
+    Queue a backtest (same body as /run-backtest) and return its job id.
+    """
+    try:
+        if request.response_format == "ndjson":
+            raise ValueError("Jobs return one JSON document; use response_format 'records' or 'columnar'")
+        # Bad input is a 400 here, as from /run-backtest, rather than a failed job
+        load_strategy(request.strategy)
+        if request.response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format: {request.response_format}")
+        check_max_points(request.max_points)
+        df = request_frame(request)
+
+        def job(progress):
+            # Timed from the job's start; time spent queued is not a stage
+            timer = metrics.timer("/jobs", memory=request.include_memory)
+            result = run_strategy(df, request.strategy, request.params,
+                                  response_format=request.response_format,
+                                  include_data=request.include_data,
+                                  columns=request.columns,
+                                  max_points=request.max_points,
+                                  progress=progress,
+                                  timer=timer)
+            if request.include_timings:
+                result["timings"] = timer.milliseconds()
+            if request.include_memory:
+                result["memory"] = timer.memory_report()
+            progress("serialize")
+            content = dumps(result)
+            timer.lap("serialize")
+            metrics.observe(timer, request.strategy.lower(), len(df))
+            timer.close()
+            return content
+
+        job_id = job_queue.submit(job)
+        return {"job_id": job_id, "status": job_queue.get(job_id).status}
+
+    except HTTPException:
+        raise
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -56,6 +527,177 @@ def execute_strategy(request: StrategyRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+def get_job_or_404(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+@app.get("/jobs")
+def job_stats():
+    return job_queue.stats()
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    return get_job_or_404(job_id).snapshot()
+
+@app.get("/jobs/{job_id}/events")
+def job_events(job_id: str):
+    """
+    Stream the job status as NDJSON, one line per change, until it finishes.
+    """
+    job = get_job_or_404(job_id)
+
+    def events():
+        version = None
+        while True:
+            if version is not None:
+                version = job_queue.wait(job, version, timeout=15)
+            else:
+                version = job.version
+            snapshot = job.snapshot()
+            yield dumps(snapshot) + b"\n"
+            if snapshot["status"] in FINISHED:
+                return
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    job = get_job_or_404(job_id)
+    if job.status != DONE:
+        detail = f"Job is {job.status}" + (f": {job.error}" if job.error else "")
+        # Failed jobs answer as /run-backtest would have; unfinished or cancelled ones conflict
+        status_code = (400 if job.invalid else 500) if job.status == FAILED else 409
+        raise HTTPException(status_code=status_code, detail=detail)
+    return Response(content=job.result, media_type="application/json")
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    get_job_or_404(job_id)
+    return job_queue.cancel(job_id).snapshot()
+
+@app.post("/monte-carlo")
+def monte_carlo(request: MonteCarloRequest, http_request: Request):
+    try:
+        timer = request_timer(http_request)
+        df = request_frame(request)
+        timer.lap("dataframe")
+        signals = load_strategy(request.strategy).generate_signals(df, request.params)
+        timer.lap("signals")
+        engine = BacktestEngine(initial_capital=100000)
+        engine.run(df, signals)
+        timer.lap("backtest")
+        simulation = engine.monte_carlo(paths=request.paths, method=request.method,
+                                        block_size=request.block_size, seed=request.seed)
+        timer.lap("monte_carlo")
+        return json_response({
+            "strategy": request.strategy,
+            "backtest": engine.get_summary(),
+            "monte_carlo": simulation
+        }, timer, request.strategy.lower(), len(df))
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/walk-forward")
+def walk_forward(request: WalkForwardRequest, http_request: Request):
+    try:
+        timer = request_timer(http_request)
+        df = request_frame(request)
+        timer.lap("dataframe")
+        result = run_walk_forward(df, request.strategy, request.params,
+                                  request.train_size, request.test_size,
+                                  step=request.step,
+                                  anchored=request.anchored,
+                                  workers=request.workers,
+                                  max_points=request.max_points)
+        timer.lap("walk_forward")
+        return json_response(result, timer, request.strategy.lower(), len(df))
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.post("/run-portfolio")
+def execute_portfolio(request: PortfolioRequest, http_request: Request):
+    try:
+        timer = request_timer(http_request)
+        frames = {symbol: build_dataframe(data) for symbol, data in request.data.items()}
+        timer.lap("dataframe")
+        result = run_portfolio_strategy(frames, request.strategy, request.params,
+                                        sizing=request.sizing,
+                                        fraction=request.fraction,
+                                        max_points=request.max_points)
+        timer.lap("portfolio")
+        return json_response(result, timer, request.strategy.lower(), sum(len(df) for df in frames.values()))
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@app.websocket("/ws/live")
+async def live_signals(websocket: WebSocket):
+    """
+    Live signal stream with O(1) work per candle.
+
+    The first message selects the strategy: {"strategy", "params", "initial_capital"}.
+    Every following message is a candle {timestamp, open, high, low, close, volume}
+    (answered with one "update") or a list of candles, e.g. history to warm up
+    the state (answered with one "updates" message).
+    """
+    async def receive_json():
+        # Decoded here rather than by receive_json() so malformed frames become error replies
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        return json.loads(message.get("text") or message.get("bytes") or "")
+
+    await websocket.accept()
+    try:
+        try:
+            config = await receive_json()
+            if not isinstance(config, dict):
+                raise ValueError("The first message must be an object with the strategy")
+            session = LiveSession(load_strategy(config.get('strategy', '')), config.get('params', {}),
+                                  initial_capital=config.get('initial_capital', 100000))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            await websocket.send_text(dumps({"type": "error", "detail": str(e)}).decode())
+            await websocket.close(code=1008)
+            return
+        await websocket.send_text(dumps({"type": "ready", "strategy": config['strategy']}).decode())
+
+        while True:
+            try:
+                # json.JSONDecodeError is a ValueError
+                message = await receive_json()
+                if isinstance(message, list):
+                    response = {"type": "updates", "updates": session.update_many(message)}
+                else:
+                    response = dict(session.update(message), type="update")
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                response = {"type": "error", "detail": str(e)}
+            await websocket.send_text(dumps(response).decode())
+
+    except WebSocketDisconnect:
+        pass
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
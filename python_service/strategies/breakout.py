@@ -1,4 +1,8 @@
-import pandas as pd
+import numpy as np
+from engine.indicators import rolling_max, rolling_min
+from engine.indicator_cache import indicator_cache
+from engine.signals import Signals, BUY, SELL
+from engine.incremental import RollingExtreme
 
 def required_parameters():
     return {
@@ -14,42 +18,138 @@ def generate_signals(df, params):
     lookback = int(params.get("lookback", 20))
     
     if len(df) <= lookback:
-        return []
+        return Signals.empty()
 
     # Calculate Rolling Max High and Min Low of the *previous* periods
-    # Shift by 1 to exclude current candle from the range
-    df['Rolling_Max'] = df['high'].shift(1).rolling(window=lookback).max()
-    df['Rolling_Min'] = df['low'].shift(1).rolling(window=lookback).min()
+    # Lag by 1 to exclude current candle from the range
+    key = indicator_cache.fingerprint(df)
+    upper_bound = indicator_cache.get_or_compute(key, "rolling_max", {"lookback": lookback, "lag": 1}, lambda: rolling_max(df['high'], lookback, lag=1))
+    lower_bound = indicator_cache.get_or_compute(key, "rolling_min", {"lookback": lookback, "lag": 1}, lambda: rolling_min(df['low'], lookback, lag=1))
     
-    signals = []
-    
-    # Iterate
-    # Start from lookback index
-    for i in range(lookback, len(df)):
-        # Check for NaN (due to shift and rolling)
-        if pd.isna(df['Rolling_Max'].iloc[i]) or pd.isna(df['Rolling_Min'].iloc[i]):
-            continue
-            
-        close_price = df['close'].iloc[i]
-        upper_bound = df['Rolling_Max'].iloc[i]
-        lower_bound = df['Rolling_Min'].iloc[i]
-        
-        # Breakout High (BUY)
-        if close_price > upper_bound:
-            signals.append({
-                "index": i,
-                "signal": "BUY",
-                "price": close_price,
-                "reason": "Breakout High"
-            })
-            
-        # Breakout Low (SELL)
-        elif close_price < lower_bound:
-            signals.append({
-                "index": i,
-                "signal": "SELL",
-                "price": close_price,
-                "reason": "Breakout Low"
-            })
-            
-    return signals
+    close = df['close'].to_numpy(dtype=float)
+
+    # Start from lookback index and skip NaN bounds (due to lag and rolling)
+    valid = (np.arange(len(close)) >= lookback) & ~np.isnan(upper_bound) & ~np.isnan(lower_bound)
+
+    return Signals.from_masks(
+        (close > upper_bound) & valid,
+        (close < lower_bound) & valid,
+        close,
+        reasons={BUY: "Breakout High", SELL: "Breakout Low"},
+        indicators={"Rolling_Max": upper_bound, "Rolling_Min": lower_bound}
+    )
+
+def generate_signal_grid(df, grid, chunk_size=256):
+    """
+    Yield per-bar signal codes (bars x parameter sets) for a parameter grid.
+
+    Rolling bounds are computed once per distinct lookback. Codes are yielded
+    in blocks of at most chunk_size columns.
+    """
+    close = df['close'].to_numpy(dtype=float)
+    lookback = np.asarray(grid.get("lookback", 20), dtype=int).reshape(-1)
+
+    key = indicator_cache.fingerprint(df)
+    lookbacks = np.unique(lookback)
+    upper_table = np.column_stack([
+        indicator_cache.get_or_compute(key, "rolling_max", {"lookback": lb, "lag": 1}, lambda lb=lb: rolling_max(df['high'], lb, lag=1))
+        for lb in lookbacks.tolist()
+    ])
+    lower_table = np.column_stack([
+        indicator_cache.get_or_compute(key, "rolling_min", {"lookback": lb, "lag": 1}, lambda lb=lb: rolling_min(df['low'], lb, lag=1))
+        for lb in lookbacks.tolist()
+    ])
+    bars = np.arange(len(close))[:, None]
+    column = close[:, None]
+
+    for start in range(0, len(lookback), chunk_size):
+        block = slice(start, start + chunk_size)
+        cols = np.searchsorted(lookbacks, lookback[block])
+        upper_bound = upper_table[:, cols]
+        lower_bound = lower_table[:, cols]
+        valid = (bars >= lookback[block]) & ~np.isnan(upper_bound) & ~np.isnan(lower_bound)
+
+        buy = (column > upper_bound) & valid
+        codes = np.zeros(upper_bound.shape, dtype=np.int8)
+        codes[(column < lower_bound) & valid] = SELL
+        codes[buy] = BUY
+        yield block, codes
+
+class LiveState:
+    """
+    Incremental generate_signals: update() takes one candle and returns
+    (code, reason) for that bar, or None.
+    """
+
+    def __init__(self, params):
+        self.lookback = int(params.get("lookback", 20))
+        # Monotonic deques over the previous lookback highs/lows
+        self.upper = RollingExtreme(self.lookback, "max", lag=1)
+        self.lower = RollingExtreme(self.lookback, "min", lag=1)
+        self.bar = -1
+        self.indicators = {"Rolling_Max": np.nan, "Rolling_Min": np.nan}
+
+    def update(self, candle):
+        # Convert before touching any state, so a bad candle changes nothing
+        close = float(candle['close'])
+        high = float(candle.get('high', close))
+        low = float(candle.get('low', close))
+        self.bar += 1
+        upper_bound = self.upper.update(high)
+        lower_bound = self.lower.update(low)
+        self.indicators = {"Rolling_Max": upper_bound, "Rolling_Min": lower_bound}
+
+        if self.bar < self.lookback or upper_bound != upper_bound or lower_bound != lower_bound:
+            return None
+        if close > upper_bound:
+            return BUY, "Breakout High"
+        if close < lower_bound:
+            return SELL, "Breakout Low"
+        return None
+
+def live_state(params):
+    """
+    Rolling state for live updates (O(1) per bar, identical to generate_signals).
+    """
+    return LiveState(params)
+
+class ChunkState:
+    """
+    Chunked generate_signals: update() takes the next block of bars
+    ({column: array}) and returns its Signals, indexed within the block.
+
+    Rolling extremes are exact, so each chunk is computed together with the
+    previous lookback highs/lows.
+    """
+
+    def __init__(self, params):
+        self.lookback = int(params.get("lookback", 20))
+        self.tail_high = np.empty(0)
+        self.tail_low = np.empty(0)
+        self.bars = 0
+
+    def update(self, chunk):
+        close = np.asarray(chunk['close'], dtype=float)
+        high = np.concatenate([self.tail_high, np.asarray(chunk['high'], dtype=float)])
+        low = np.concatenate([self.tail_low, np.asarray(chunk['low'], dtype=float)])
+        carried = len(self.tail_high)
+        upper_bound = rolling_max(high, self.lookback, lag=1)[carried:]
+        lower_bound = rolling_min(low, self.lookback, lag=1)[carried:]
+        valid = (np.arange(self.bars, self.bars + len(close)) >= self.lookback) & ~np.isnan(upper_bound) & ~np.isnan(lower_bound)
+        self.tail_high = high[-self.lookback:]
+        self.tail_low = low[-self.lookback:]
+        self.bars += len(close)
+
+        return Signals.from_masks(
+            (close > upper_bound) & valid,
+            (close < lower_bound) & valid,
+            close,
+            reasons={BUY: "Breakout High", SELL: "Breakout Low"},
+            indicators={"Rolling_Max": upper_bound, "Rolling_Min": lower_bound}
+        )
+
+def chunk_state(params):
+    """
+    Carried state for chunked runs (identical to generate_signals over all chunks).
+    """
+    return ChunkState(params)
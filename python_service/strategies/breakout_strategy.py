@@ -1,4 +1,7 @@
-import pandas as pd
+import numpy as np
+from engine.indicators import rolling_max, rolling_min
+from engine.indicator_cache import indicator_cache
+from engine.signals import Signals, BUY, SELL
 
 def required_parameters():
     return {
@@ -11,28 +14,19 @@ def generate_signals(df, params):
     # Calculate rolling High Max and Low Min excluding current row (strictly speaking, breakout of PREVIOUS high)
     # Typically breakout is: Close > Max(High of last N days)
     
-    df['Rolling_Max'] = df['high'].shift(1).rolling(window=lookback).max()
-    df['Rolling_Min'] = df['low'].shift(1).rolling(window=lookback).min()
+    key = indicator_cache.fingerprint(df)
+    upper_bound = indicator_cache.get_or_compute(key, "rolling_max", {"lookback": lookback, "lag": 1}, lambda: rolling_max(df['high'], lookback, lag=1))
+    lower_bound = indicator_cache.get_or_compute(key, "rolling_min", {"lookback": lookback, "lag": 1}, lambda: rolling_min(df['low'], lookback, lag=1))
     
-    signals = []
-    
-    for i, row in df.iterrows():
-        if pd.isna(row['Rolling_Max']):
-            continue
-            
-        if row['close'] > row['Rolling_Max']:
-            signals.append({
-                "index": str(i), 
-                "signal": "BUY", 
-                "price": row['close'],
-                "reason": "Breakout High"
-            })
-        elif row['close'] < row['Rolling_Min']:
-            signals.append({
-                "index": str(i), 
-                "signal": "SELL", 
-                "price": row['close'],
-                "reason": "Breakout Low"
-            })
-            
-    return signals
+    close = df['close'].to_numpy(dtype=float)
+    valid = ~np.isnan(upper_bound)
+
+    # Signals are labelled with the frame's index rather than the bar position
+    return Signals.from_masks(
+        (close > upper_bound) & valid,
+        (close < lower_bound) & valid,
+        close,
+        reasons={BUY: "Breakout High", SELL: "Breakout Low"},
+        labels=df.index,
+        indicators={"Rolling_Max": upper_bound, "Rolling_Min": lower_bound}
+    )
@@ -1,5 +1,9 @@
-import pandas as pd
 import numpy as np
+import pandas as pd
+from engine.indicators import wilder_rsi
+from engine.indicator_cache import indicator_cache
+from engine.signals import Signals, BUY, SELL
+from engine.incremental import WilderRSI
 
 def required_parameters():
     return {
@@ -12,28 +16,7 @@ def calculate_rsi(series, period=14):
     """
     Calculate RSI using Wilder's Smoothing method (Standard).
     """
-    delta = series.diff()
-    
-    # Get gains (positive delta) and losses (negative delta)
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
-    
-    # Calculate initial average gain/loss
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-    
-    # Calculate smoothed averages (Wilder's Method)
-    # The first value is the simple average, subsequent are smoothed
-    # We can use ewm (Exponential Weighted Moving Average) with alpha=1/period to approximate Wilder's
-    # Wilder's Smoothing is equivalent to EMA with alpha = 1/period
-    
-    avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi
+    return pd.Series(wilder_rsi(series, period), index=series.index)
 
 def generate_signals(df, params):
     """
@@ -44,48 +27,135 @@ def generate_signals(df, params):
     overbought = int(params.get("overbought", 70))
     
     if len(df) < period:
-        return []
+        return Signals.empty()
 
-    # Calculate RSI using pure pandas
+    close = df['close'].to_numpy(dtype=float)
     try:
-        rsi_series = calculate_rsi(df['close'], period)
+        key = indicator_cache.fingerprint(df)
+        rsi = indicator_cache.get_or_compute(key, "rsi", {"period": period}, lambda: wilder_rsi(close, period))
     except Exception as e:
         print(f"Error calculating RSI: {e}")
-        return []
+        return Signals.empty()
 
-    if rsi_series is None:
-        return []
+    # Start from period index (NaN RSI never compares true)
+    warm = np.arange(len(close)) >= period
 
-    signals = []
-    
-    # Iterate
-    # Start from period index
-    for i in range(period, len(df)):
-        rsi_val = rsi_series.iloc[i]
-        
-        # Check for NaN
-        if pd.isna(rsi_val):
-            continue
-            
-        price = df['close'].iloc[i]
-        
-        # MEAN REVERSION LOGIC:
-        # Buy when RSI dips below oversold (indicating it's cheap)
-        if rsi_val < oversold:
-            signals.append({
-                "index": i,
-                "signal": "BUY",
-                "price": price,
-                "reason": f"RSI {rsi_val:.2f} < {oversold}"
-            })
-            
-        # Sell when RSI goes above overbought
-        elif rsi_val > overbought:
-            signals.append({
-                "index": i,
-                "signal": "SELL",
-                "price": price,
-                "reason": f"RSI {rsi_val:.2f} > {overbought}"
-            })
-            
-    return signals
+    # MEAN REVERSION LOGIC:
+    # Buy when RSI dips below oversold (indicating it's cheap)
+    # Sell when RSI goes above overbought
+    return Signals.from_masks(
+        (rsi < oversold) & warm,
+        (rsi > overbought) & warm,
+        close,
+        reasons={
+            BUY: f"RSI {{value:.2f}} < {oversold}",
+            SELL: f"RSI {{value:.2f}} > {overbought}"
+        },
+        reason_values=rsi,
+        indicators={"RSI": rsi}
+    )
+
+def generate_signal_grid(df, grid, chunk_size=256):
+    """
+    Yield per-bar signal codes (bars x parameter sets) for a parameter grid.
+
+    RSI is computed once per distinct period and shared across thresholds.
+    Codes are yielded in blocks of at most chunk_size columns.
+    """
+    close = df['close'].to_numpy(dtype=float)
+    period, oversold, overbought = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(grid.get("period", 14), dtype=int)),
+        np.asarray(grid.get("oversold", 30), dtype=int),
+        np.asarray(grid.get("overbought", 70), dtype=int)
+    )
+
+    key = indicator_cache.fingerprint(df)
+    periods = np.unique(period)
+    table = np.column_stack([
+        indicator_cache.get_or_compute(key, "rsi", {"period": p}, lambda p=p: wilder_rsi(close, p))
+        for p in periods.tolist()
+    ])
+    bars = np.arange(len(close))[:, None]
+
+    for start in range(0, len(period), chunk_size):
+        block = slice(start, start + chunk_size)
+        rsi = table[:, np.searchsorted(periods, period[block])]
+        warm = bars >= period[block]
+
+        buy = (rsi < oversold[block]) & warm
+        codes = np.zeros(rsi.shape, dtype=np.int8)
+        codes[(rsi > overbought[block]) & warm] = SELL
+        codes[buy] = BUY
+        yield block, codes
+
+class LiveState:
+    """
+    Incremental generate_signals: update() takes one candle and returns
+    (code, reason) for that bar, or None.
+    """
+
+    def __init__(self, params):
+        self.period = int(params.get("period", 14))
+        self.oversold = int(params.get("oversold", 30))
+        self.overbought = int(params.get("overbought", 70))
+        self.rsi = WilderRSI(self.period)
+        self.bar = -1
+        self.indicators = {"RSI": np.nan}
+
+    def update(self, candle):
+        # Convert before touching any state, so a bad candle changes nothing
+        close = float(candle['close'])
+        self.bar += 1
+        rsi = self.rsi.update(close)
+        self.indicators = {"RSI": rsi}
+
+        if self.bar < self.period:
+            return None
+        if rsi < self.oversold:
+            return BUY, f"RSI {rsi:.2f} < {self.oversold}"
+        if rsi > self.overbought:
+            return SELL, f"RSI {rsi:.2f} > {self.overbought}"
+        return None
+
+def live_state(params):
+    """
+    Rolling state for live updates (O(1) per bar, identical to generate_signals).
+    """
+    return LiveState(params)
+
+class ChunkState:
+    """
+    Chunked generate_signals: update() takes the next block of bars
+    ({column: array}) and returns its Signals, indexed within the block.
+    """
+
+    def __init__(self, params):
+        self.period = int(params.get("period", 14))
+        self.oversold = int(params.get("oversold", 30))
+        self.overbought = int(params.get("overbought", 70))
+        self.rsi = WilderRSI(self.period)
+        self.bars = 0
+
+    def update(self, chunk):
+        close = np.asarray(chunk['close'], dtype=float)
+        rsi = self.rsi.update_many(close)
+        warm = np.arange(self.bars, self.bars + len(close)) >= self.period
+        self.bars += len(close)
+
+        return Signals.from_masks(
+            (rsi < self.oversold) & warm,
+            (rsi > self.overbought) & warm,
+            close,
+            reasons={
+                BUY: f"RSI {{value:.2f}} < {self.oversold}",
+                SELL: f"RSI {{value:.2f}} > {self.overbought}"
+            },
+            reason_values=rsi,
+            indicators={"RSI": rsi}
+        )
+
+def chunk_state(params):
+    """
+    Carried state for chunked runs (identical to generate_signals over all chunks).
+    """
+    return ChunkState(params)
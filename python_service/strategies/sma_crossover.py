@@ -1,4 +1,8 @@
-import pandas as pd
+import numpy as np
+from engine.indicators import sma, crossed_above, crossed_below
+from engine.indicator_cache import indicator_cache
+from engine.signals import Signals, BUY, SELL
+from engine.incremental import RollingMean
 
 def required_parameters():
     return {
@@ -14,41 +18,138 @@ def generate_signals(df, params):
     long_window = int(params.get("long_window", 50))
     
     if len(df) < long_window:
-        return []
+        return Signals.empty()
 
-    # Calculate SMAs
-    df['SMA_Short'] = df['close'].rolling(window=short_window).mean()
-    df['SMA_Long'] = df['close'].rolling(window=long_window).mean()
+    # Calculate SMAs (shared through the indicator cache)
+    close = df['close'].to_numpy(dtype=float)
+    key = indicator_cache.fingerprint(df)
+    sma_short = indicator_cache.get_or_compute(key, "sma", {"window": short_window}, lambda: sma(close, short_window))
+    sma_long = indicator_cache.get_or_compute(key, "sma", {"window": long_window}, lambda: sma(close, long_window))
     
-    signals = []
-    
-    # Iterate to find crossovers
-    # Start from long_window index to ensure we have data
-    for i in range(long_window, len(df)):
-        # Current and Previous values
-        curr_short = df['SMA_Short'].iloc[i]
-        curr_long = df['SMA_Long'].iloc[i]
-        prev_short = df['SMA_Short'].iloc[i-1]
-        prev_long = df['SMA_Long'].iloc[i-1]
-        
-        # Check for Golden Cross (BUY)
-        # Short crosses above Long
-        if prev_short <= prev_long and curr_short > curr_long:
-            signals.append({
-                "index": i,
-                "signal": "BUY",
-                "price": df['close'].iloc[i],
-                "reason": f"SMA {short_window} crossed above SMA {long_window}"
-            })
-            
-        # Check for Death Cross (SELL)
-        # Short crosses below Long
-        elif prev_short >= prev_long and curr_short < curr_long:
-            signals.append({
-                "index": i,
-                "signal": "SELL",
-                "price": df['close'].iloc[i],
-                "reason": f"SMA {short_window} crossed below SMA {long_window}"
-            })
-            
-    return signals
+    # Crossovers are only considered from long_window onwards to ensure we have data
+    warm = np.arange(len(close)) >= long_window
+
+    # Golden Cross (BUY): Short crosses above Long
+    # Death Cross (SELL): Short crosses below Long
+    return Signals.from_masks(
+        crossed_above(sma_short, sma_long) & warm,
+        crossed_below(sma_short, sma_long) & warm,
+        close,
+        reasons={
+            BUY: f"SMA {short_window} crossed above SMA {long_window}",
+            SELL: f"SMA {short_window} crossed below SMA {long_window}"
+        },
+        indicators={"SMA_Short": sma_short, "SMA_Long": sma_long}
+    )
+
+def generate_signal_grid(df, grid, chunk_size=256):
+    """
+    Yield per-bar signal codes (bars x parameter sets) for a parameter grid.
+
+    Each distinct window is computed once and shared by every parameter set
+    that uses it. Codes are yielded in blocks of at most chunk_size columns.
+    """
+    close = df['close'].to_numpy(dtype=float)
+    short_window, long_window = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(grid.get("short_window", 20), dtype=int)),
+        np.atleast_1d(np.asarray(grid.get("long_window", 50), dtype=int))
+    )
+
+    key = indicator_cache.fingerprint(df)
+    windows = np.unique(np.concatenate([short_window, long_window]))
+    table = np.column_stack([
+        indicator_cache.get_or_compute(key, "sma", {"window": w}, lambda w=w: sma(close, w))
+        for w in windows.tolist()
+    ])
+
+    for start in range(0, len(short_window), chunk_size):
+        block = slice(start, start + chunk_size)
+        # The sign of (short - long) is the same comparison the crossover uses.
+        # NaN spreads never compare true, which also enforces the warm-up period.
+        spread = table[:, np.searchsorted(windows, short_window[block])] - table[:, np.searchsorted(windows, long_window[block])]
+        prev_spread, spread = spread[:-1], spread[1:]
+
+        codes = np.zeros((len(close), spread.shape[1]), dtype=np.int8)
+        buy = (prev_spread <= 0) & (spread > 0)
+        sell = (prev_spread >= 0) & (spread < 0)
+        np.subtract(buy.view(np.int8), sell.view(np.int8), out=codes[1:])
+        yield block, codes
+
+class LiveState:
+    """
+    Incremental generate_signals: update() takes one candle and returns
+    (code, reason) for that bar, or None.
+    """
+
+    def __init__(self, params):
+        self.short_window = int(params.get("short_window", 20))
+        self.long_window = int(params.get("long_window", 50))
+        self.sma_short = RollingMean(self.short_window)
+        self.sma_long = RollingMean(self.long_window)
+        self.bar = -1
+        self.indicators = {"SMA_Short": np.nan, "SMA_Long": np.nan}
+
+    def update(self, candle):
+        # Convert before touching any state, so a bad candle changes nothing
+        close = float(candle['close'])
+        self.bar += 1
+        prev_short, prev_long = self.indicators["SMA_Short"], self.indicators["SMA_Long"]
+        short = self.sma_short.update(close)
+        long = self.sma_long.update(close)
+        self.indicators = {"SMA_Short": short, "SMA_Long": long}
+
+        if self.bar < self.long_window:
+            return None
+        if prev_short <= prev_long and short > long:
+            return BUY, f"SMA {self.short_window} crossed above SMA {self.long_window}"
+        if prev_short >= prev_long and short < long:
+            return SELL, f"SMA {self.short_window} crossed below SMA {self.long_window}"
+        return None
+
+def live_state(params):
+    """
+    Rolling state for live updates (O(1) per bar, identical to generate_signals).
+    """
+    return LiveState(params)
+
+class ChunkState:
+    """
+    Chunked generate_signals: update() takes the next block of bars
+    ({column: array}) and returns its Signals, indexed within the block.
+    """
+
+    def __init__(self, params):
+        self.short_window = int(params.get("short_window", 20))
+        self.long_window = int(params.get("long_window", 50))
+        self.sma_short = RollingMean(self.short_window)
+        self.sma_long = RollingMean(self.long_window)
+        self.bars = 0
+        self.last = (np.nan, np.nan)
+
+    def update(self, chunk):
+        close = np.asarray(chunk['close'], dtype=float)
+        sma_short = self.sma_short.update_many(close)
+        sma_long = self.sma_long.update_many(close)
+        prev_short = np.concatenate([[self.last[0]], sma_short[:-1]])
+        prev_long = np.concatenate([[self.last[1]], sma_long[:-1]])
+        warm = np.arange(self.bars, self.bars + len(close)) >= self.long_window
+        if len(close):
+            self.last = (sma_short[-1], sma_long[-1])
+        self.bars += len(close)
+
+        return Signals.from_masks(
+            (prev_short <= prev_long) & (sma_short > sma_long) & warm,
+            (prev_short >= prev_long) & (sma_short < sma_long) & warm,
+            close,
+            reasons={
+                BUY: f"SMA {self.short_window} crossed above SMA {self.long_window}",
+                SELL: f"SMA {self.short_window} crossed below SMA {self.long_window}"
+            },
+            indicators={"SMA_Short": sma_short, "SMA_Long": sma_long}
+        )
+
+def chunk_state(params):
+    """
+    Carried state for chunked runs (identical to generate_signals over all chunks).
+    """
+    return ChunkState(params)
@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine import batch
+from engine.batch import run_batch
+from engine.indicator_cache import indicator_cache
+from engine.serialization import dumps
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def make_jobs(df):
+    specs = [
+        ("sma", {"short_window": 5, "long_window": 20}),
+        ("sma", {"short_window": 10, "long_window": 20}),
+        ("rsi", {"period": 14, "oversold": 30, "overbought": 70}),
+        ("breakout", {"lookback": 10}),
+        ("sma", {"short_window": 5, "long_window": 20}),
+        ("nope", {})
+    ]
+    return [{"df": df, "group": "walk", "strategy": strategy, "params": params} for strategy, params in specs]
+
+def check_outcomes(df, jobs, outcomes):
+    assert sorted(outcomes) == list(range(len(jobs)))
+    for i, job in enumerate(jobs):
+        result, error = outcomes[i]
+        if job["strategy"] == "nope":
+            assert result is None and "Unknown strategy" in error
+            continue
+        expected = run_strategy(df, job["strategy"], job["params"], response_format="columnar", max_points=100)
+        assert dumps(result["backtest"]) == dumps(expected["backtest"])
+
+def test_batch_matches_single_runs_and_shares_indicators():
+    df = generate_walk_data(n=800)
+    df.index = pd.date_range("2024-01-01", periods=len(df), freq="min", name="index")
+    jobs = make_jobs(df)
+
+    indicator_cache.clear()
+    misses = indicator_cache.stats()["misses"]
+    outcomes = {i: (result, error) for i, result, error in run_batch(jobs, max_points=100, workers=1)}
+    # SMA 5, 10 and 20 once each, RSI 14, breakout high and low
+    assert indicator_cache.stats()["misses"] - misses == 6
+    check_outcomes(df, jobs, outcomes)
+
+def test_batch_process_pool(monkeypatch):
+    monkeypatch.setattr(batch, "INLINE_BAR_JOBS", 0)
+    df = generate_walk_data(n=800)
+    df.index = pd.date_range("2024-01-01", periods=len(df), freq="s", name="index")
+    jobs = make_jobs(df)
+    outcomes = {i: (result, error) for i, result, error in run_batch(jobs, max_points=100, workers=2)}
+    check_outcomes(df, jobs, outcomes)
+
+def test_batch_workers_capped_at_cpu_count(monkeypatch):
+    monkeypatch.setattr(batch, "INLINE_BAR_JOBS", 0)
+    monkeypatch.setattr(batch.os, "cpu_count", lambda: 2)
+    pools = []
+
+    class RecordingPool(batch.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            pools.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", RecordingPool)
+    df = generate_walk_data(n=300)
+    jobs = make_jobs(df)
+    outcomes = {i: (result, error) for i, result, error in run_batch(jobs, max_points=100, workers=500)}
+    assert pools == [2]
+    check_outcomes(df, jobs, outcomes)
+
+def test_batch_endpoint():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300).items()}
+    dataset_id = client.post("/datasets", json={"data": data}).json()["dataset_id"]
+    body = {"jobs": [
+        {"dataset": dataset_id, "strategy": "sma", "params": {"short_window": 5, "long_window": 20}},
+        {"dataset": "0" * 32, "strategy": "sma", "params": {}},
+        {"data": data, "strategy": "rsi", "params": {"period": 14}, },
+        {"dataset": dataset_id, "strategy": "nope", "params": {}}
+    ], "max_points": None, "workers": 1}
+
+    response = client.post("/run-backtest-batch", json=body)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = {line["job"]: line for line in map(json.loads, response.iter_lines()) if line}
+    assert [lines[i]["status"] for i in range(4)] == ["done", "failed", "done", "failed"]
+
+    single = client.post("/run-backtest", json={"symbol": "T", "strategy": "sma", "params": {"short_window": 5, "long_window": 20},
+                                                "data": data, "response_format": "columnar", "max_points": None}).json()
+    assert lines[0]["result"]["backtest"] == single["backtest"]
+    assert client.post("/run-backtest-batch", json={"jobs": []}).status_code == 400
+
+    # Malformed inline data fails only its own job
+    bad = client.post("/run-backtest-batch", json={"jobs": [
+        {"data": {"close": [1, 2, 3], "open": [1, 2]}, "strategy": "sma", "params": {}},
+        {"data": data, "strategy": "rsi", "params": {"period": 14}}
+    ], "workers": 1})
+    assert bad.status_code == 200
+    lines = {line["job"]: line for line in map(json.loads, bad.iter_lines()) if line}
+    assert lines[0]["status"] == "failed" and "same length" in lines[0]["error"]
+    assert lines[1]["status"] == "done"
@@ -0,0 +1,28 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import copy
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from bench import synthetic_ohlcv, run_suite, compare
+
+def test_synthetic_data_is_deterministic():
+    assert synthetic_ohlcv(100).equals(synthetic_ohlcv(100))
+    df = synthetic_ohlcv(100)
+    assert (df['high'] >= df['low']).all()
+
+def test_suite_records_every_stage_and_detects_regressions():
+    suite = run_suite(sizes=[300], strategies=["sma"], repeat=1, memory=True)
+    stages = [row["stage"] for row in suite["results"]]
+    assert stages == ["generate_signals", "engine_run", "engine_results", "run_strategy_columnar", "run_strategy_records"]
+    assert all(row["peak_bytes"] > 0 for row in suite["results"])
+
+    slower = copy.deepcopy(suite)
+    for row in slower["results"]:
+        row["seconds"] = row["seconds"] * 2 + 0.01
+    assert compare(suite, suite) == []
+    assert len(compare(suite, slower)) == len(stages)
@@ -0,0 +1,73 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine import chunked
+from engine.chunked import save_history, load_history, open_history, run_chunked
+from engine.incremental import RollingMean, WilderRSI
+from engine.indicators import sma, wilder_rsi
+from engine.strategy_runner import run_strategy
+from engine.serialization import dumps
+from test_engine_modes import generate_walk_data
+
+STRATEGIES = {
+    "sma": {"short_window": 5, "long_window": 20},
+    "rsi": {"period": 14, "oversold": 30, "overbought": 70},
+    "breakout": {"lookback": 20}
+}
+
+def walk_frame(n=3000):
+    return pd.DataFrame(generate_walk_data(n=n), index=pd.date_range("2024-01-01", periods=n, freq="min", name="index"))
+
+def test_update_many_matches_batch_kernels_across_splits():
+    close = walk_frame()['close'].to_numpy().copy()
+    close[100:110] = close[99]
+    cuts = [0, 1, 1, 50, 777, 2000, len(close)]
+
+    mean = RollingMean(20)
+    rsi = WilderRSI(14)
+    means = np.concatenate([mean.update_many(close[a:b]) for a, b in zip(cuts[:-1], cuts[1:])])
+    rsis = np.concatenate([rsi.update_many(close[a:b]) for a, b in zip(cuts[:-1], cuts[1:])])
+    assert np.array_equal(means, sma(close, 20), equal_nan=True)
+    assert np.array_equal(rsis, wilder_rsi(close, 14), equal_nan=True)
+
+def test_chunked_run_matches_in_memory(tmp_path):
+    path = str(tmp_path / "walk.npy")
+    save_history(walk_frame(), path)
+    df = load_history(path)
+
+    for strategy, params in STRATEGIES.items():
+        expected = run_strategy(df, strategy, params, response_format="columnar", include_data=False, max_points=500)
+        for chunk_size in (333, 1000, 10000):
+            result = run_chunked(path, strategy, params, chunk_size=chunk_size, max_points=500, include_signals=True)
+            assert result["chunks"] == -(-len(df) // chunk_size)
+            assert dumps(result["backtest"]) == dumps(expected["backtest"]), (strategy, chunk_size)
+            assert dumps(result["signals"]) == dumps(expected["signals"]), (strategy, chunk_size)
+
+def test_chunked_history_without_timestamps():
+    frame = walk_frame(1000).reset_index(drop=True)
+    records = np.empty(len(frame), dtype=[(col, '<f8') for col in chunked.HISTORY_COLUMNS])
+    for col in chunked.HISTORY_COLUMNS:
+        records[col] = frame[col]
+    expected = run_strategy(frame, "sma", STRATEGIES["sma"], response_format="columnar", include_data=False)
+    result = run_chunked(records, "sma", STRATEGIES["sma"], chunk_size=128)
+    assert dumps(result["backtest"]) == dumps(expected["backtest"])
+
+def test_chunked_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked, "HISTORY_DIR", str(tmp_path))
+    save_history(walk_frame(), str(tmp_path / "walk.npy"))
+    client = TestClient(app)
+    body = {"dataset": "walk", "strategy": "rsi", "params": STRATEGIES["rsi"], "chunk_size": 700}
+
+    response = client.post("/run-backtest-chunked", json=body)
+    assert response.status_code == 200
+    assert response.json()["bars"] == 3000 and "signals" not in response.json()
+    assert client.post("/run-backtest-chunked", json=dict(body, dataset="missing")).status_code == 404
+    assert client.post("/run-backtest-chunked", json=dict(body, dataset="../walk")).status_code == 400
+    assert client.post("/run-backtest-chunked", json=dict(body, chunk_size=0)).status_code == 400
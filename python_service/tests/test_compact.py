@@ -0,0 +1,89 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import tracemalloc
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.ingest import compact_frame, frame_from_columns, encode_binary
+from engine.metrics import StageTimer
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def test_compact_frame():
+    df = generate_walk_data(n=1000)
+    columns = {k: v.to_numpy() for k, v in df.items()}
+    columns['timestamp'] = np.arange(1_700_000_000, 1_700_000_000 + 60 * len(df), 60)
+    full = frame_from_columns(columns)
+    compact = compact_frame(full)
+
+    assert 'timestamp' not in compact.columns
+    assert compact.index.equals(full.index)
+    assert compact['close'].dtype == np.float32 and compact['volume'].dtype == np.int32
+    assert compact.memory_usage(deep=True).sum() <= full.memory_usage(deep=True).sum() / 2
+
+    # Indicators accumulate in float64 over the float32 prices
+    result = run_strategy(compact, "sma", {"short_window": 5, "long_window": 20}, response_format="columnar")
+    reference = run_strategy(full, "sma", {"short_window": 5, "long_window": 20}, response_format="columnar")
+    assert np.allclose(np.array(result["data"]["SMA_Long"], dtype=float), np.array(reference["data"]["SMA_Long"], dtype=float),
+                       rtol=1e-6, equal_nan=True)
+    assert abs(result["backtest"]["final_balance"] - reference["backtest"]["final_balance"]) < 1e-3 * reference["backtest"]["final_balance"]
+
+def test_stage_timer_memory():
+    timer = StageTimer("/test", memory=True)
+    block = np.ones(1_000_000)
+    timer.lap("allocate")
+    np.ones(2_000_000).sum()
+    del block
+    timer.lap("free")
+    report = timer.memory_report()
+    timer.close()
+
+    assert report["stages"]["allocate"]["allocated_bytes"] >= 8_000_000
+    assert report["stages"]["free"]["allocated_bytes"] <= -7_000_000
+    assert 16_000_000 <= report["stages"]["free"]["peak_bytes"] < 17_000_000
+    assert report["peak_bytes"] >= 24_000_000
+    assert not tracemalloc.is_tracing()
+    assert StageTimer("/test").memory_report() is None
+
+    # Tracing started part way through covers only the later stages
+    late = StageTimer("/test")
+    late.lap("decode")
+    late.trace_memory()
+    np.ones(1_000_000).sum()
+    late.lap("run")
+    late.close()
+    assert list(late.memory_report()["stages"]) == ["run"] and late.memory_report()["peak_bytes"] >= 8_000_000
+    assert list(late.stages) == ["decode", "run"]
+    assert not tracemalloc.is_tracing()
+
+def test_endpoint_memory_and_compact():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300, seed=5).items()}
+    body = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": 5, "long_window": 20}, "data": data,
+            "response_format": "columnar", "compact": True, "include_memory": True}
+
+    response = client.post("/run-backtest", json=body)
+    memory = response.json()["memory"]
+    assert "x-cache" not in response.headers and int(response.headers["x-peak-memory"]) >= memory["peak_bytes"] > 0
+    assert {"dataframe", "signals", "backtest"} <= set(memory["stages"])
+    assert response.json()["data"]["close"][0] == float(str(np.float32(data["close"][0])))
+    assert not tracemalloc.is_tracing()
+
+    # Binary requests time the decode as part of the request and trace memory after it
+    columns = {k: np.asarray(v) for k, v in data.items()}
+    binary = client.post("/run-backtest-binary", content=encode_binary(columns, strategy="sma", params=body["params"],
+                                                                        response_format="columnar", include_memory=True,
+                                                                        include_timings=True),
+                         headers={"Content-Type": "application/octet-stream"})
+    assert list(binary.json()["timings"])[:2] == ["parse", "dataframe"]
+    assert "parse" not in binary.json()["memory"]["stages"] and "backtest" in binary.json()["memory"]["stages"]
+    assert not tracemalloc.is_tracing()
+
+    full = client.post("/datasets", json={"data": data}).json()
+    compact = client.post("/datasets", json={"data": data, "compact": True}).json()
+    assert compact["dataset_id"] != full["dataset_id"] and compact["bytes"] < full["bytes"]
@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.datasets import DatasetRegistry, UnknownDataset
+from engine.strategy_runner import run_strategy
+from engine.serialization import dumps
+from test_engine_modes import generate_walk_data
+
+PARAMS = {
+    "sma": {"short_window": 5, "long_window": 20},
+    "rsi": {"period": 14, "oversold": 30, "overbought": 70},
+    "breakout": {"lookback": 10}
+}
+
+def timestamped(n=400):
+    df = generate_walk_data(n=n)
+    df.index = pd.date_range("2024-01-01", periods=n, freq="h", name="index")
+    return df
+
+def test_registry_roundtrip_is_read_only():
+    registry = DatasetRegistry()
+    df = timestamped()
+    dataset_id, created = registry.register(df)
+    assert created
+    assert registry.register(df.copy()) == (dataset_id, False)
+
+    frame = registry.get(dataset_id)
+    pd.testing.assert_frame_equal(frame, df, check_freq=False)
+    assert not frame['close'].to_numpy().flags.writeable
+
+    # Runs over the shared frame neither fail nor change the stored bars
+    for strategy, params in PARAMS.items():
+        shared = dumps(run_strategy(registry.get(dataset_id), strategy, params, response_format="columnar"))
+        assert shared == dumps(run_strategy(df, strategy, params, response_format="columnar"))
+    frame['close'] = 0.0
+    pd.testing.assert_frame_equal(registry.get(dataset_id), df, check_freq=False)
+
+def test_eviction_and_spill(tmp_path):
+    first, second = timestamped(), generate_walk_data(n=400, seed=3)
+    registry = DatasetRegistry(max_bytes=1)
+    first_id, _ = registry.register(first)
+    registry.register(second)
+    assert registry.stats()["evictions"] == 1
+    try:
+        registry.get(first_id)
+        assert False, "evicted dataset should be unknown"
+    except UnknownDataset:
+        pass
+
+    registry = DatasetRegistry(max_bytes=1, spill_dir=str(tmp_path))
+    first_id, _ = registry.register(first)
+    second_id, _ = registry.register(second)
+    assert os.path.exists(tmp_path / f"{first_id}.npy")
+    pd.testing.assert_frame_equal(registry.get(first_id), first, check_freq=False)
+    pd.testing.assert_frame_equal(registry.get(second_id), second, check_freq=False)
+    assert registry.info(first_id)["start"] == "2024-01-01 00:00:00"
+
+    assert registry.delete(first_id)
+    assert not os.path.exists(tmp_path / f"{first_id}.npy")
+    assert not registry.delete(first_id)
+
+def test_dataset_endpoints():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300).items()}
+    uploaded = client.post("/datasets", json={"symbol": "TEST", "data": data}).json()
+    assert uploaded["rows"] == 300
+
+    body = {"symbol": "TEST", "strategy": "sma", "params": PARAMS["sma"]}
+    by_id = client.post("/run-backtest", json=dict(body, dataset=uploaded["dataset_id"]))
+    assert by_id.status_code == 200
+    assert by_id.json() == client.post("/run-backtest", json=dict(body, data=data)).json()
+
+    sweep = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": [5, 10], "long_window": 20}}
+    assert client.post("/sweep", json=dict(sweep, dataset=uploaded["dataset_id"])).json() == \
+        client.post("/sweep", json=dict(sweep, data=data)).json()
+
+    assert client.get(f"/datasets/{uploaded['dataset_id']}").json()["columns"] == list(data)
+    assert client.post("/run-backtest", json=dict(body, dataset="0" * 32)).status_code == 404
+    assert client.post("/run-backtest", json=body).status_code == 400
+    assert client.delete(f"/datasets/{uploaded['dataset_id']}").status_code == 200
+    assert client.get(f"/datasets/{uploaded['dataset_id']}").status_code == 404
@@ -0,0 +1,74 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.ingest import encode_binary
+from engine.downsample import lttb, drawdown_extremes, downsample_indices
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 10000))
+    y[4321] = 50.0
+    selected = lttb(y, 200)
+
+    assert len(selected) == 200
+    assert selected[0] == 0 and selected[-1] == len(y) - 1
+    assert np.all(np.diff(selected) > 0)
+    assert 4321 in selected
+    assert len(lttb(y[:50], 200)) == 50
+
+def test_drawdown_extremes():
+    equity = np.array([100.0, 120.0, 90.0, 130.0, 80.0, 110.0])
+    assert drawdown_extremes(equity) == (3, 4)
+
+def test_downsample_keeps_required_bars():
+    rng = np.random.default_rng(0)
+    equity = 1000 + np.cumsum(rng.normal(0, 1, 50000))
+    price = 100 + np.cumsum(rng.normal(0, 1, 50000))
+    keep = [5, 17, 49998]
+    bars = downsample_indices(equity, price, 500, keep=keep)
+
+    assert len(bars) <= 500
+    assert set(keep) <= set(bars.tolist())
+    assert set(drawdown_extremes(equity)) <= set(bars.tolist())
+    assert {int(np.argmax(price)), int(np.argmin(price))} <= set(bars.tolist())
+
+def test_run_strategy_max_points():
+    df = generate_walk_data(n=5000)
+    params = {"short_window": 5, "long_window": 20}
+    full = run_strategy(df, "sma", params)['backtest']
+    small = run_strategy(df, "sma", params, max_points=300)['backtest']
+
+    assert len(full['equity_curve']) == 5000
+    assert len(small['equity_curve']) <= max(300, 2 * len(full['trades']) + 6)
+    assert small['final_balance'] == full['final_balance']
+
+    by_bar = {p['index']: p for p in full['equity_curve']}
+    for point in small['equity_curve']:
+        assert point == by_bar[point['index']]
+    kept = {p['index'] for p in small['equity_curve']}
+    for trade in full['trades']:
+        assert trade['entry_index'] in kept and trade['exit_index'] in kept
+
+def test_negative_max_points_rejected():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300).items()}
+    body = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": 5, "long_window": 20}, "data": data, "max_points": -5}
+
+    for response_format in ("records", "columnar", "ndjson"):
+        assert client.post("/run-backtest", json=dict(body, response_format=response_format)).status_code == 400
+    columns = {k: np.asarray(v) for k, v in data.items()}
+    for max_points in (-5, "5"):
+        binary = encode_binary(columns, strategy="sma", params=body["params"], max_points=max_points)
+        assert client.post("/run-backtest-binary", content=binary,
+                           headers={"Content-Type": "application/octet-stream"}).status_code == 400
+    batch = {"jobs": [{"data": data, "strategy": "sma", "params": body["params"]}], "max_points": -5}
+    assert client.post("/run-backtest-batch", json=batch).status_code == 400
+    assert client.post("/run-backtest", json=dict(body, max_points=0)).status_code == 200
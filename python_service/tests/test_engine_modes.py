@@ -0,0 +1,79 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.backtest_engine import BacktestEngine, BUY, SELL
+from strategies import sma_crossover, rsi_mean_reversion, breakout
+
+def generate_walk_data(n=1000, start_price=100, seed=7):
+    rng = np.random.default_rng(seed)
+    close = np.maximum(1, start_price + np.cumsum(rng.uniform(-2, 2, n)))
+    return pd.DataFrame({
+        "open": close + rng.uniform(-0.5, 0.5, n),
+        "high": close + rng.uniform(0, 1, n),
+        "low": close - rng.uniform(0, 1, n),
+        "close": close,
+        "volume": rng.integers(100, 1000, n)
+    })
+
+def run_both(df, signals):
+    reference = BacktestEngine(mode="reference")
+    reference.run(df, signals)
+    array = BacktestEngine(mode="array")
+    array.run(df, signals)
+    return reference.get_results(), array.get_results()
+
+def test_array_engine_matches_reference():
+    df = generate_walk_data()
+    cases = [
+        (sma_crossover, {"short_window": 5, "long_window": 20}),
+        (rsi_mean_reversion, {"period": 14, "oversold": 30, "overbought": 70}),
+        (breakout, {"lookback": 10})
+    ]
+
+    for module, params in cases:
+        signals = module.generate_signals(df.copy(), params)
+        ref, arr = run_both(df, signals)
+
+        assert ref['total_trades'] > 0
+        for key in ("final_balance", "net_profit", "roi", "total_trades", "winning_trades", "losing_trades", "win_rate"):
+            assert ref[key] == arr[key], key
+        assert ref['trades'] == arr['trades']
+        assert ref['equity_curve'] == arr['equity_curve']
+
+def test_array_engine_signal_edge_cases():
+    df = generate_walk_data(n=50)
+    signals = [
+        {"index": 3, "signal": "SELL", "price": 10.0},       # no position yet
+        {"index": 5, "signal": "BUY", "price": 1e9},         # cannot afford
+        {"index": 6, "signal": "BUY"},                       # fills at close
+        {"index": 8, "signal": "BUY", "price": 50.0},        # already long
+        {"index": 8, "signal": "SELL", "price": 200.0},      # last signal at an index wins
+        {"index": "2024-01-01", "signal": "BUY"},            # non-integer index is ignored
+        {"index": 70, "signal": "BUY"},                      # outside the data
+        {"index": 49, "signal": "BUY"}                       # open position at the end
+    ]
+    ref, arr = run_both(df, signals)
+
+    assert ref['total_trades'] == 1
+    assert ref['trades'] == arr['trades']
+    assert ref['equity_curve'] == arr['equity_curve']
+    assert ref['final_balance'] == arr['final_balance']
+
+def test_run_arrays_with_datetime_index():
+    close = np.array([10.0, 11.0, 12.0, 9.0])
+    codes = np.array([BUY, 0, SELL, 0])
+    index = pd.date_range("2024-01-01", periods=4, freq="D")
+
+    engine = BacktestEngine()
+    engine.run_arrays(close, codes, index=index)
+    results = engine.get_results()
+
+    assert results['total_trades'] == 1
+    assert results['trades'][0]['pnl'] == 10000 * 2.0
+    assert results['equity_curve'][0]['timestamp'] == str(index[0])
+    assert results['final_balance'] == 120000.0
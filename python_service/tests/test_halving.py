@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.halving import run_halving, rung_bars, rung_counts, rung_plan, fit_budget
+from engine.sweep import run_sweep
+from test_engine_modes import generate_walk_data
+
+RANGES = {
+    "period": {"start": 5, "stop": 25, "step": 2},
+    "oversold": [20, 25, 30, 35],
+    "overbought": [65, 70, 75, 80]
+}
+
+def test_schedule():
+    assert rung_bars(2700, 4, 3, 50) == [100, 300, 900, 2700]
+    assert rung_bars(2700, 4, 3, 200) == [200, 300, 900, 2700]
+    assert rung_counts(176, 4, 3) == [176, 59, 20, 7]
+    # A single survivor goes straight to the full history
+    assert rung_plan(4, [100, 300, 900, 2700], 3) == [(4, 100), (2, 300), (1, 2700)]
+    assert fit_budget(176, [100, 300, 900, 2700], 3, 2699) == 0
+    assert fit_budget(176, [100, 300, 900, 2700], 3, 2700) == 1
+
+def test_halving_matches_sweep_on_survivors():
+    df = generate_walk_data(n=4000, seed=3)
+    result = run_halving(df, "rsi", RANGES, min_bars=150, seed=7)
+    full = run_sweep(df, "rsi", RANGES)
+
+    assert result["combinations"] == full["combinations"] == 176
+    # 4000 / 27 is under min_bars, so three rungs
+    assert [rung["bars"] for rung in result["rungs"]] == [444, 1333, 4000]
+    assert [rung["candidates"] for rung in result["rungs"]] == [176, 59, 20]
+    assert 0 < result["cost"]["bar_evaluations"] < result["cost"]["full_grid_bar_evaluations"]
+    assert result["cost"]["saved"] > 0.5
+
+    # Survivors' full-history metrics are exactly those of the full sweep
+    rows = {tuple(full["results"][name][i] for name in full["params"]): i for i in range(full["combinations"])}
+    table = result["results"]
+    for j in range(len(table["roi"])):
+        i = rows[tuple(table[name][j] for name in result["params"])]
+        assert table["roi"][j] == full["results"]["roi"][i]
+        assert table["total_trades"][j] == full["results"]["total_trades"][i]
+    assert result["best"]["roi"] == max(table["roi"])
+
+def test_budget_and_determinism():
+    df = generate_walk_data(n=3000, seed=4)
+    limited = run_halving(df, "rsi", RANGES, budget=0.05, seed=1)
+    assert limited["cost"]["bar_evaluations"] <= 0.05 * limited["cost"]["full_grid_bar_evaluations"]
+    assert limited == run_halving(df, "rsi", RANGES, budget=0.05, seed=1)
+
+    hyperband = run_halving(df, "sma", {"short_window": [5, 10, 15, 20], "long_window": [30, 40, 50, 60, 80]},
+                            method="hyperband", min_bars=100, seed=3)
+    assert len({rung["bracket"] for rung in hyperband["rungs"]}) > 1
+    assert all(rung["bars"] == 3000 for rung in hyperband["rungs"] if rung["candidates"] == 1)
+    assert hyperband == run_halving(df, "sma", {"short_window": [5, 10, 15, 20], "long_window": [30, 40, 50, 60, 80]},
+                                    method="hyperband", min_bars=100, seed=3)
+
+def test_small_budgets_are_never_exceeded():
+    df = generate_walk_data(n=3000, seed=4)
+    full_cost = 176 * 3000
+
+    # Three candidates fit in 1.5 full-history evaluations once the single survivor skips the 1000-bar prefix
+    small = run_halving(df, "rsi", RANGES, budget=4500 / full_cost, seed=2)
+    assert [(rung["candidates"], rung["bars"]) for rung in small["rungs"]] == [(3, 333), (1, 3000)]
+    assert small["cost"]["bar_evaluations"] == 3999
+
+    hyperband = run_halving(df, "rsi", RANGES, method="hyperband", budget=0.02, seed=2)
+    assert hyperband["cost"]["bar_evaluations"] <= 0.02 * full_cost
+    assert all(rung["bars"] == 3000 for rung in hyperband["rungs"] if rung["candidates"] == 1)
+
+    try:
+        run_halving(df, "rsi", RANGES, budget=2999 / full_cost)
+        assert False, "budget below one full-history evaluation accepted"
+    except ValueError:
+        pass
+
+def test_sweep_endpoint_search():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=1000).items()}
+    body = {"symbol": "TEST", "strategy": "rsi", "params": RANGES, "data": data, "search": "halving", "top": 3, "seed": 1}
+
+    response = client.post("/sweep", json=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["method"] == "halving" and len(result["results"]["roi"]) <= 3
+    assert client.post("/sweep", json=dict(body, search="nope")).status_code == 400
+    assert client.post("/sweep", json=dict(body, budget=2)).status_code == 400
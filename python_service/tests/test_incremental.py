@@ -0,0 +1,156 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.backtest_engine import BacktestEngine
+from engine.indicators import sma, wilder_rsi, rolling_max, rolling_min
+from engine.incremental import RollingMean, WilderRSI, RollingExtreme, LiveSession
+from strategies import sma_crossover, rsi_mean_reversion, breakout
+from test_engine_modes import generate_walk_data
+
+def stream(indicator, values):
+    return np.array([indicator.update(v) for v in values])
+
+def test_incremental_kernels_match_batch():
+    rng = np.random.default_rng(5)
+    values = np.maximum(1, 100 + np.cumsum(rng.normal(0, 1, 3000))) * 1000
+    values[100:140] = values[100]
+
+    for window in (1, 2, 14, 50):
+        assert np.array_equal(stream(RollingMean(window), values), sma(values, window), equal_nan=True)
+        assert np.array_equal(stream(WilderRSI(window), values), wilder_rsi(values, window), equal_nan=True)
+        for lag in (0, 1):
+            assert np.array_equal(stream(RollingExtreme(window, "max", lag), values), rolling_max(values, window, lag=lag), equal_nan=True)
+            assert np.array_equal(stream(RollingExtreme(window, "min", lag), values), rolling_min(values, window, lag=lag), equal_nan=True)
+
+def test_live_session_matches_batch_backtest():
+    df = generate_walk_data(n=1500, seed=9)
+    candles = df.to_dict(orient='records')
+    cases = [
+        (sma_crossover, {"short_window": 5, "long_window": 20}, ["SMA_Short", "SMA_Long"]),
+        (rsi_mean_reversion, {"period": 14, "oversold": 30, "overbought": 70}, ["RSI"]),
+        (breakout, {"lookback": 10}, ["Rolling_Max", "Rolling_Min"])
+    ]
+
+    for module, params, columns in cases:
+        signals = module.generate_signals(df, params)
+        engine = BacktestEngine()
+        engine.run(df, signals)
+
+        session = LiveSession(module, params)
+        updates = [session.update(candle) for candle in candles]
+
+        assert [u['signal'] for u in updates if u['signal']] == list(signals)
+        assert np.array_equal([u['equity'] for u in updates], engine.equity)
+        assert [u['trade'] for u in updates if u['trade']] == engine.trades
+        for column in columns:
+            live = np.array([u['indicators'][column] for u in updates])
+            assert np.array_equal(live, signals.indicators[column], equal_nan=True), column
+
+def test_live_websocket():
+    df = generate_walk_data(n=60, seed=4)
+    candles = df.to_dict(orient='records')
+    client = TestClient(app)
+
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_json({"strategy": "sma", "params": {"short_window": 3, "long_window": 10}})
+        assert ws.receive_json()["type"] == "ready"
+
+        ws.send_json(candles[:50])
+        batch = ws.receive_json()
+        assert batch["type"] == "updates" and len(batch["updates"]) == 50
+
+        ws.send_json(candles[50])
+        update = ws.receive_json()
+        assert update["type"] == "update" and update["index"] == 50
+
+        ws.send_json({"open": 1.0})
+        assert ws.receive_json()["type"] == "error"
+
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_json({"strategy": "unknown"})
+        assert ws.receive_json()["type"] == "error"
+
+def test_rolling_mean_matches_pandas_rolling_mean():
+    # RollingMean mirrors pandas' compensated rolling sum (constant runs,
+    # sign clamps, restarts after NaN gaps); pin it to Series.rolling().mean()
+    rng = np.random.default_rng(11)
+    values = np.round(rng.normal(0, 50, 2000), 1)
+    values[100:130] = np.nan
+    values[200:260] = 3.3
+    values[300:320] = -0.7
+    values[400:403] = np.nan
+    values[500:510] = 1e12
+    values[510:520] = 1e-12
+    values[600] = np.nan
+    values[601:700] = 0.0
+
+    for window in (1, 2, 3, 7, 30):
+        expected = pd.Series(values).rolling(window=window).mean().to_numpy()
+        assert np.array_equal(stream(RollingMean(window), values), expected, equal_nan=True), window
+        chunked = RollingMean(window)
+        parts = [chunked.update_many(part) for part in np.array_split(values, 7)]
+        assert np.array_equal(np.concatenate(parts), expected, equal_nan=True), window
+
+def test_live_websocket_malformed_messages():
+    df = generate_walk_data(n=20, seed=4)
+    candles = df.to_dict(orient='records')
+    client = TestClient(app)
+
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_json({"strategy": "sma", "params": {"short_window": 3, "long_window": 10}})
+        assert ws.receive_json()["type"] == "ready"
+        for bad in ("not json", "{\"open\":", "42", "[1, 2]"):
+            ws.send_text(bad)
+            assert ws.receive_json()["type"] == "error", bad
+        ws.send_bytes(b"\xff")
+        assert ws.receive_json()["type"] == "error"
+
+        # The session survives and keeps its state
+        ws.send_json(candles[0])
+        update = ws.receive_json()
+        assert update["type"] == "update" and update["index"] == 0
+
+    for first in ("not json", "[]"):
+        with client.websocket_connect("/ws/live") as ws:
+            ws.send_text(first)
+            assert ws.receive_json()["type"] == "error"
+
+def test_bad_candles_leave_the_live_session_unchanged():
+    df = generate_walk_data(n=60, seed=8)
+    candles = df.to_dict(orient='records')
+    config = {"strategy": "breakout", "params": {"lookback": 5}}
+    client = TestClient(app)
+
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_json(config)
+        ws.receive_json()
+        expected = [ws.send_json(candle) or ws.receive_json() for candle in candles]
+    # "updates" messages carry the same entries without the per-message type
+    for update in expected:
+        del update["type"]
+
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_json(config)
+        ws.receive_json()
+        ws.send_json(candles[:20])
+        assert ws.receive_json()["updates"] == expected[:20]
+        for bad in ({"close": "abc"}, dict(candles[20], low=None), {"high": 1.0}, "candle"):
+            ws.send_json(bad)
+            assert ws.receive_json()["type"] == "error"
+        # A list with a bad candle applies none of them
+        ws.send_json(candles[20:30] + [{"close": "abc"}])
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json(candles[20:40])
+        assert ws.receive_json()["updates"] == expected[20:40]
+        updates = [ws.send_json(candle) or ws.receive_json() for candle in candles[40:]]
+
+    assert [update.pop("type") for update in updates] == ["update"] * 20
+    assert updates == expected[40:]
+    assert updates[0]["index"] == 40
@@ -0,0 +1,60 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.indicator_cache import IndicatorCache, fingerprint, indicator_cache
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def test_lru_eviction_and_counters():
+    cache = IndicatorCache(max_bytes=3 * 800)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return np.full(100, value, dtype=np.float64)  # 800 bytes
+
+    for window in (1, 2, 3):
+        cache.get_or_compute("data", "sma", {"window": window}, lambda: compute(window))
+    cache.get_or_compute("data", "sma", {"window": 1}, lambda: compute(1))   # hit, 1 becomes most recent
+    cache.get_or_compute("data", "sma", {"window": 4}, lambda: compute(4))   # evicts 2
+    cache.get_or_compute("data", "sma", {"window": 2}, lambda: compute(2))   # miss again
+
+    stats = cache.stats()
+    assert calls == [1, 2, 3, 4, 2]
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (1, 5, 2, 3)
+
+    value = cache.get_or_compute("data", "sma", {"window": 2}, lambda: compute(2))
+    assert not value.flags.writeable
+
+    cache.configure(enabled=False)
+    assert cache.fingerprint(pd.DataFrame({"close": [1.0]})) is None
+    assert cache.stats()['entries'] == 0
+    cache.get_or_compute("data", "sma", {"window": 2}, lambda: compute(2))
+    assert calls[-1] == 2 and cache.stats()['entries'] == 0
+
+def test_fingerprint_tracks_ohlcv_content():
+    df = generate_walk_data(n=100)
+    other = df.copy()
+    other['SMA_Short'] = 1.0
+    assert fingerprint(df) == fingerprint(other)
+
+    other.loc[50, 'close'] += 0.01
+    assert fingerprint(df) != fingerprint(other)
+
+def test_strategies_share_cache_and_leave_frame_untouched():
+    df = generate_walk_data(n=500)
+    columns = list(df.columns)
+
+    before = indicator_cache.stats()['hits']
+    first = run_strategy(df, "sma", {"short_window": 5, "long_window": 20})
+    second = run_strategy(df, "sma", {"short_window": 5, "long_window": 30})
+
+    assert list(df.columns) == columns
+    assert indicator_cache.stats()['hits'] >= before + 1
+    assert 'SMA_Short' in first['data'][0] and 'SMA_Long' in second['data'][0]
+    assert first['data'][-1]['SMA_Short'] == second['data'][-1]['SMA_Short']
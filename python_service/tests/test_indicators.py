@@ -0,0 +1,49 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.indicators import sma, ema, rolling_max, wilder_rsi, crossed_above, crossed_below
+from engine.signals import Signals, BUY, SELL
+
+def test_kernels_match_pandas():
+    rng = np.random.default_rng(1)
+    close = pd.Series(100 + np.cumsum(rng.normal(0, 1, 500)))
+
+    np.testing.assert_allclose(sma(close, 10), close.rolling(10).mean().to_numpy(), equal_nan=True)
+    np.testing.assert_allclose(rolling_max(close, 10, lag=1), close.shift(1).rolling(10).max().to_numpy(), equal_nan=True)
+
+    # Wilder's RSI as EMA(alpha=1/period) of gains and losses
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    loss = (-delta.where(delta < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    expected_rsi = 100 - (100 / (1 + gain / loss))
+    np.testing.assert_allclose(wilder_rsi(close, 14), expected_rsi.to_numpy(), equal_nan=True)
+
+    # EMA is seeded with the SMA of the first `length` bars
+    out = ema(close, 5)
+    assert np.isnan(out[:4]).all()
+    assert out[4] == close[:5].mean()
+
+def test_crossovers():
+    fast = np.array([1.0, 2.0, 3.0, 2.0, 1.0])
+    slow = np.array([2.0, 2.0, 2.0, 2.0, 2.0])
+
+    assert crossed_above(fast, slow).tolist() == [False, False, True, False, False]
+    assert crossed_below(fast, slow).tolist() == [False, False, False, False, True]
+
+def test_signals_from_masks_builds_reasons_lazily():
+    buy = np.array([False, True, False, True])
+    sell = np.array([True, True, False, False])
+    price = np.array([10.0, 11.0, 12.0, 13.0])
+    signals = Signals.from_masks(buy, sell, price, reasons={BUY: "low {value:.1f}", SELL: "high"}, reason_values=price * 2)
+
+    assert len(signals) == 3
+    assert signals.side.tolist() == [SELL, BUY, BUY]
+    assert signals.to_codes(4).tolist() == [SELL, BUY, 0, BUY]
+    assert signals[1] == {"index": 1, "signal": "BUY", "price": 11.0, "reason": "low 22.0"}
+    assert [s['index'] for s in signals[1:]] == [1, 3]
+    assert list(Signals.empty()) == []
@@ -0,0 +1,55 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import struct
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.ingest import MAGIC, encode_binary, decode_binary, frame_from_columns
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def test_binary_roundtrip_is_zero_copy():
+    df = generate_walk_data(n=257)
+    df['timestamp'] = 1_700_000_000 + np.arange(len(df)) * 60
+    body = encode_binary({col: df[col].to_numpy() for col in df.columns}, strategy="rsi", params={"period": 10})
+
+    header, decoded = decode_binary(body)
+    assert header['strategy'] == "rsi" and header['params'] == {"period": 10}
+    assert header['rows'] == 257
+    assert np.shares_memory(decoded['close'].to_numpy(), np.frombuffer(body, dtype=np.uint8))
+    assert decoded.index[1] - decoded.index[0] == pd.Timedelta(minutes=1)
+
+    expected = run_strategy(df.set_index(pd.to_datetime(df['timestamp'], unit='s').rename('index')), "rsi", {"period": 10})
+    assert run_strategy(decoded, "rsi", {"period": 10}) == expected
+
+def test_invalid_payloads_raise_value_error():
+    body = encode_binary({"close": np.arange(10.0)}, strategy="sma")
+    # Malformed headers in otherwise well-framed payloads (magic, length, 8 zero bytes of data)
+    headers = ['[]', '{"rows": -1, "columns": [{"name": "close"}]}', '{"rows": [1], "columns": []}',
+               '{"rows": 1, "columns": [{"dtype": "<f8"}]}', '{"rows": 1, "columns": [{"name": 5}]}',
+               '{"rows": 1, "columns": "close"}']
+    bad_payloads = [
+        b"nope",
+        body[:-8],
+        body.replace(b'"<f8"', b'"|O8"')
+    ] + [MAGIC + struct.pack("<I", len(header)) + header.encode() + bytes(8) for header in headers]
+    for payload in bad_payloads:
+        try:
+            decode_binary(payload)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+def test_frame_from_columns_validation():
+    df = frame_from_columns({"close": [1.0, 2.0], "timestamp": [0, 60]})
+    assert str(df.index[1]) == "1970-01-01 00:01:00"
+
+    for bad in ({}, {"close": []}, {"close": [1.0], "open": [1.0, 2.0]}, {"open": [1.0]}):
+        try:
+            frame_from_columns(bad)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
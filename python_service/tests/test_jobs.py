@@ -0,0 +1,127 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine import backtest_engine
+from engine.jobs import JobQueue, JobCancelled, QueueFull, DONE, FAILED, CANCELLED
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def wait_finished(queue, job_id, timeout=10):
+    job = queue.get(job_id)
+    deadline = time.time() + timeout
+    while job.status not in (DONE, FAILED, CANCELLED) and time.time() < deadline:
+        queue.wait(job, job.version, timeout=0.1)
+    return job
+
+def test_job_queue_runs_and_reports_progress():
+    queue = JobQueue(workers=1)
+
+    def work(progress):
+        progress("backtest", 0, 10)
+        progress("results", 10, 10)
+        return b"ok"
+
+    job = wait_finished(queue, queue.submit(work))
+    assert job.status == DONE and job.result == b"ok"
+    assert (job.stage, job.bars_done, job.bars_total) == ("results", 10, 10)
+
+    failed = wait_finished(queue, queue.submit(lambda progress: int("x")))
+    assert failed.status == FAILED and "invalid literal" in failed.error and failed.invalid
+
+    broken = wait_finished(queue, queue.submit(lambda progress: {}["x"]))
+    assert broken.status == FAILED and broken.error == "Internal Server Error" and not broken.invalid
+
+def test_job_queue_cancel_and_limits():
+    queue = JobQueue(workers=1, max_jobs=2, retention_seconds=0.2)
+    release = threading.Event()
+
+    def blocking(progress):
+        progress("running")
+        release.wait(5)
+        progress("after wait")
+        return b"never"
+
+    running = queue.submit(blocking)
+    queued = queue.submit(lambda progress: b"queued")
+    try:
+        queue.submit(lambda progress: b"third")
+        assert False, "expected QueueFull"
+    except QueueFull:
+        pass
+
+    assert queue.cancel(queued).status == CANCELLED
+    queue.cancel(running)
+    release.set()
+    assert wait_finished(queue, running).status == CANCELLED
+
+    time.sleep(0.3)
+    assert queue.get(running) is None
+
+def test_backtest_reports_progress_per_block(monkeypatch):
+    df = generate_walk_data(n=1000, seed=5)
+    params = {"short_window": 5, "long_window": 20}
+    whole = run_strategy(df, "sma", params, response_format="columnar", include_data=False)
+
+    monkeypatch.setattr(backtest_engine, "PROGRESS_BLOCK_BARS", 300)
+    calls = []
+    blocked = run_strategy(df, "sma", params, response_format="columnar", include_data=False,
+                           progress=lambda *args: calls.append(args))
+    assert [call for call in calls if call[0] == "backtest"] == [("backtest", 0, 1000), ("backtest", 300, 1000),
+                                                                ("backtest", 600, 1000), ("backtest", 900, 1000),
+                                                                ("backtest", 1000, 1000)]
+    np.testing.assert_array_equal(blocked["backtest"]["equity_curve"]["equity"], whole["backtest"]["equity_curve"]["equity"])
+    for field, values in whole["backtest"]["trades"].items():
+        np.testing.assert_array_equal(blocked["backtest"]["trades"][field], values)
+
+    # A cancelled job stops at the next block instead of finishing the backtest
+    def cancel_after_first_block(stage, bars_done=None, bars_total=None):
+        if stage == "backtest" and bars_done:
+            raise JobCancelled()
+    try:
+        run_strategy(df, "sma", params, progress=cancel_after_first_block)
+        assert False, "expected JobCancelled"
+    except JobCancelled:
+        pass
+
+    calls.clear()
+    signals = run_strategy(df, "sma", params, include_data=False)["signals"]
+    backtest_engine.BacktestEngine(mode="reference").run(df, signals, progress=lambda *args: calls.append(args))
+    assert calls == [("backtest", 300, 1000), ("backtest", 600, 1000), ("backtest", 900, 1000), ("backtest", 1000, 1000)]
+
+def test_job_endpoints():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=500).items()}
+    body = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": 5, "long_window": 20}, "data": data}
+
+    submitted = client.post("/jobs", json=body)
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    events = [json.loads(line) for line in client.get(f"/jobs/{job_id}/events").iter_lines() if line]
+    assert events[-1]["status"] == "done"
+    assert client.get(f"/jobs/{job_id}").json()["bars_total"] == 500
+
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.json() == client.post("/run-backtest", json=body).json()
+
+    assert client.get("/jobs/unknown").status_code == 404
+    # Bad input is answered with 400, as /run-backtest does: up front when it can be checked...
+    for bad in (dict(body, strategy="nope"), dict(body, response_format="nope"), dict(body, max_points=-1)):
+        assert client.post("/jobs", json=bad).status_code == client.post("/run-backtest", json=bad).status_code == 400
+    # ...and from the result when the run rejects it
+    bad = dict(body, params={"short_window": "abc", "long_window": 20})
+    assert client.post("/run-backtest", json=bad).status_code == 400
+    bad_id = client.post("/jobs", json=bad).json()["job_id"]
+    list(client.get(f"/jobs/{bad_id}/events").iter_lines())
+    failed = client.get(f"/jobs/{bad_id}/result")
+    assert failed.status_code == 400 and failed.json()["detail"].startswith("Job is failed")
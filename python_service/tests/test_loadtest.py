@@ -0,0 +1,44 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import copy
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from loadtest import parse_mix, schedule, start_service, run_load, compare
+
+def test_mix_and_schedule():
+    mix = parse_mix(["sma:1e3:3", "rsi:2000"])
+    assert mix == [("sma", 1000, 3.0), ("rsi", 2000, 1.0)]
+    order = schedule(mix, 400, seed=1)
+    assert order == schedule(mix, 400, seed=1)
+    assert 250 < order.count(0) < 350
+    try:
+        parse_mix(["nope:1e3"])
+        assert False, "unknown strategy accepted"
+    except ValueError:
+        pass
+
+def test_load_run_against_service_and_compare():
+    mix = parse_mix(["sma:300:2", "breakout:500"])
+    with start_service() as url:
+        results = run_load(url, mix, concurrency=[1, 2], requests=6)
+
+    levels = [(row["concurrency"], row["strategy"]) for row in results if row["strategy"] == "all"]
+    assert levels == [(1, "all"), (2, "all")]
+    for row in results:
+        assert row["errors"] == 0 and row["throughput"] > 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"]
+    assert sum(row["requests"] for row in results if row["concurrency"] == 1 and row["strategy"] != "all") == 6
+
+    suite = {"results": results}
+    slower = copy.deepcopy(suite)
+    for row in slower["results"]:
+        row["p95_ms"] = row["p95_ms"] * 2 + 10
+        row["throughput"] = row["throughput"] / 2
+    assert compare(suite, suite) == []
+    metrics = [regression[3] for regression in compare(suite, slower)]
+    assert metrics.count("throughput") == 2 and metrics.count("p95_ms") == len(results)
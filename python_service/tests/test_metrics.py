@@ -0,0 +1,59 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.metrics import Metrics, StageTimer, NULL_TIMER
+from test_engine_modes import generate_walk_data
+
+def test_stage_timer_laps_and_histograms():
+    timer = StageTimer("/run-backtest")
+    time.sleep(0.002)
+    timer.lap("signals")
+    timer.lap("backtest")
+    timer.lap("signals")
+    assert list(timer.stages) == ["signals", "backtest"]
+    assert timer.stages["signals"] >= 0.002
+    assert abs(sum(timer.stages.values()) - timer.total()) < 1e-9
+    assert timer.headers()["Server-Timing"].startswith("signals;dur=")
+
+    metrics = Metrics()
+    metrics.observe(timer, "sma", bars=5000)
+    text = metrics.render(caches={"indicators": {"hits": 3, "misses": 1}})
+    assert 'backtest_bars_bucket{endpoint="/run-backtest",strategy="sma",le="1000"} 0' in text
+    assert 'backtest_bars_bucket{endpoint="/run-backtest",strategy="sma",le="10000"} 1' in text
+    assert 'backtest_stage_duration_seconds_count{endpoint="/run-backtest",strategy="sma",stage="signals"} 1' in text
+    assert 'cache_hit_ratio{cache="indicators"} 0.75' in text
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    timer = metrics.timer("/run-backtest")
+    assert timer is NULL_TIMER
+    timer.lap("signals")
+    metrics.observe(timer, "sma", bars=10)
+    assert timer.headers() is None and timer.milliseconds() == {}
+    assert "backtest_request_duration_seconds_count" not in metrics.render()
+
+def test_backtest_timings_header_body_and_metrics():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=500).items()}
+    body = {"symbol": "TEST", "strategy": "rsi", "params": {"period": 14}, "data": data}
+
+    plain = client.post("/run-backtest", json=body)
+    timed = client.post("/run-backtest", json=dict(body, include_timings=True))
+    assert "timings" not in plain.json()
+    stages = ["parse", "dataframe", "signals", "backtest", "results", "clean", "serialize", "total"]
+    assert [entry.split(";")[0] for entry in timed.headers["Server-Timing"].split(", ")] == stages
+    assert list(timed.json()["timings"]) == stages[:-2]
+    assert timed.json()["backtest"] == plain.json()["backtest"]
+
+    text = client.get("/metrics").text
+    assert 'backtest_bars_count{endpoint="/run-backtest",strategy="rsi"}' in text
+    assert 'http_responses_total{endpoint="/run-backtest",status="200"}' in text
+    assert 'cache_hits_total{cache="indicators"}' in text
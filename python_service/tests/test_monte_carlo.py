@@ -0,0 +1,52 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.backtest_engine import BacktestEngine
+from engine.monte_carlo import trade_returns, resample_indices, simulate
+from strategies import sma_crossover
+from test_engine_modes import generate_walk_data
+
+def test_trade_returns_compound_to_ledger_result():
+    df = generate_walk_data(n=3000, seed=8)
+    engine = BacktestEngine()
+    engine.run(df, sma_crossover.generate_signals(df, {"short_window": 5, "long_window": 20}))
+
+    pnl = engine.ledger['pnl']
+    returns = trade_returns(pnl, engine.initial_capital)
+    assert np.isclose(engine.initial_capital * np.prod(1 + returns), engine.initial_capital + pnl.sum())
+
+def test_block_resampling_keeps_consecutive_trades():
+    idx = resample_indices(10, 50, method="block", block_size=4, rng=np.random.default_rng(0))
+    assert idx.shape == (50, 10)
+    steps = np.diff(idx[:, :4], axis=1) % 10
+    assert (steps == 1).all()
+
+def test_simulate_percentiles():
+    pnl = np.array([1000.0, -500.0, 2000.0, -1500.0, 800.0])
+    result = simulate(pnl, 100000, paths=2000, seed=1)
+    again = simulate(pnl, 100000, paths=2000, seed=1)
+
+    assert np.array_equal(result['final_equity'], again['final_equity'])
+    assert (np.diff(result['final_equity']) >= 0).all()
+    assert (result['max_drawdown'] >= 0).all()
+    assert 0 <= result['probability_of_loss'] <= 1
+
+    flat = simulate(np.empty(0), 100000, paths=10)
+    assert (flat['final_equity'] == 100000).all()
+
+def test_simulate_in_blocks_matches_one_block(monkeypatch):
+    from engine import monte_carlo
+    pnl = np.random.default_rng(3).normal(100, 1000, 37)
+    for method in ("bootstrap", "block"):
+        whole = simulate(pnl, 100000, paths=500, method=method, seed=2)
+        monkeypatch.setattr(monte_carlo, "BLOCK_CELLS", 37 * 7)
+        blocked = simulate(pnl, 100000, paths=500, method=method, seed=2)
+        monkeypatch.undo()
+        for field in ("final_equity", "roi", "max_drawdown"):
+            assert np.array_equal(whole[field], blocked[field]), (method, field)
+        assert whole["probability_of_loss"] == blocked["probability_of_loss"]
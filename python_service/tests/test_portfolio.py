@@ -0,0 +1,78 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.backtest_engine import BacktestEngine, BUY, SELL, TRADE_FIELDS
+from engine.strategy_runner import run_portfolio_strategy
+from strategies import sma_crossover
+from test_engine_modes import generate_walk_data
+
+def test_single_symbol_portfolio_matches_engine():
+    df = generate_walk_data(n=2000, seed=3)
+    signals = sma_crossover.generate_signals(df, {"short_window": 5, "long_window": 20})
+    single = BacktestEngine()
+    single.run(df, signals)
+
+    close = df['close'].to_numpy()
+    portfolio = BacktestEngine()
+    portfolio.run_portfolio(close[:, None], signals.to_codes(len(df))[:, None], ["X"], sizing="fraction", fraction=1.0)
+
+    assert np.array_equal(single.equity, portfolio.equity)
+    for field in TRADE_FIELDS:
+        assert np.array_equal(single.ledger[field], portfolio.ledger[field]), field
+    assert portfolio.get_summary() == single.get_summary()
+
+def test_portfolio_shares_cash_across_symbols():
+    prices = np.array([
+        [10.0, 20.0, 50.0],
+        [10.0, 20.0, 50.0],
+        [12.0, 20.0, 50.0],
+        [12.0, 25.0, 50.0]
+    ])
+    codes = np.zeros(prices.shape, dtype=np.int8)
+    codes[0, 0] = BUY   # 1000 / 3 -> 33 shares
+    codes[0, 1] = BUY   # 1000 / 3 -> 16 shares
+    codes[2, 0] = SELL  # +66 pnl
+    codes[2, 2] = BUY   # (746 + 320) / 3 -> 7 shares
+    codes[3, 2] = SELL  # flat trade
+
+    engine = BacktestEngine(initial_capital=1000)
+    engine.run_portfolio(prices, codes, ["A", "B", "C"])
+
+    assert engine.ledger['symbol'].tolist() == [0, 2]
+    assert engine.ledger['quantity'].tolist() == [33, 7]
+    assert engine.ledger['pnl'].tolist() == [66, 0]
+    assert engine.position.tolist() == [0, 16, 0]
+    assert engine.equity.tolist() == [1000, 1000, 1066, 1146]
+
+    results = engine.get_portfolio_results()
+    assert results['symbols']['total_trades'].tolist() == [1, 0, 1]
+    assert results['trades']['A']['pnl'].tolist() == [66]
+    assert len(results['trades']['B']['pnl']) == 0
+    assert np.allclose(results['equity_curve']['cash'] + results['equity_curve']['holdings'], engine.equity)
+
+def test_portfolio_buys_fill_until_cash_runs_out():
+    prices = np.full((2, 3), 100.0)
+    codes = np.zeros(prices.shape, dtype=np.int8)
+    codes[0] = BUY
+
+    engine = BacktestEngine(initial_capital=1000)
+    engine.run_portfolio(prices, codes, sizing="fraction", fraction=0.4)
+    assert engine.position.tolist() == [4, 4, 2]
+    assert engine.cash == 0
+
+def test_run_portfolio_strategy_aligns_symbols():
+    a = generate_walk_data(n=300, seed=1)
+    b = generate_walk_data(n=250, seed=2)
+    a.index = pd.date_range("2024-01-01", periods=300)
+    b.index = pd.date_range("2024-02-20", periods=250)
+
+    result = run_portfolio_strategy({"A": a, "B": b}, "sma", {"short_window": 5, "long_window": 20})
+    backtest = result['backtest']
+    assert backtest['symbols']['symbol'] == ["A", "B"]
+    assert len(backtest['equity_curve']['equity']) == len(a.index.union(b.index))
+    assert backtest['total_trades'] == sum(backtest['symbols']['total_trades'].tolist())
@@ -0,0 +1,91 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app, metrics
+from engine.result_cache import ResultCache, result_key, frame_digest, result_cache
+from strategies import sma_crossover, rsi_mean_reversion
+from test_engine_modes import generate_walk_data
+
+def test_keys():
+    df = generate_walk_data(n=200)
+    digest = frame_digest(df)
+    assert digest == frame_digest(df.copy())
+    changed = df.copy()
+    changed.loc[5, 'volume'] += 1
+    assert frame_digest(changed) != digest
+    assert frame_digest(df.set_axis(pd.date_range("2024-01-01", periods=200, freq="h"))) != digest
+
+    key = result_key(digest, sma_crossover, {"short_window": 5, "long_window": 20}, max_points=100)
+    assert key == result_key(digest, sma_crossover, {"long_window": 20.0, "short_window": 5}, max_points=100)
+    assert key != result_key(digest, sma_crossover, {"short_window": 6, "long_window": 20}, max_points=100)
+    assert key != result_key(digest, sma_crossover, {"short_window": 5, "long_window": 20}, max_points=None)
+    assert key != result_key(digest, rsi_mean_reversion, {"short_window": 5, "long_window": 20}, max_points=100)
+
+def test_memory_and_disk_tiers(tmp_path):
+    cache = ResultCache(max_bytes=10, directory=str(tmp_path), max_disk_bytes=12)
+    cache.put("a", b"aaaaaa")
+    cache.put("b", b"bbbbbb")
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 1
+
+    # "a" left memory and is served from disk (file times have clock-tick resolution)
+    time.sleep(0.05)
+    assert cache.get("a") == b"aaaaaa"
+    assert cache.stats()["disk_hits"] == 1
+    time.sleep(0.05)
+    cache.put("c", b"cccccc")
+    # The disk tier keeps the two most recently used files
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+def test_concurrent_requests_compute_once():
+    cache = ResultCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return b"result"
+
+    outcomes = []
+    threads = [threading.Thread(target=lambda: outcomes.append(cache.get_or_compute("k", compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(outcomes) == [(b"result", False)] + [(b"result", True)] * 3
+
+def observed_runs(strategy):
+    prefix = f'backtest_request_duration_seconds_count{{endpoint="/run-backtest",strategy="{strategy}"}} '
+    lines = [line for line in metrics.render().splitlines() if line.startswith(prefix)]
+    return int(lines[0][len(prefix):]) if lines else 0
+
+def test_endpoint_serves_cached_bytes():
+    result_cache.clear()
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300, seed=11).items()}
+    body = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": 5, "long_window": 20}, "data": data}
+
+    runs = observed_runs("sma")
+    first = client.post("/run-backtest", json=body)
+    second = client.post("/run-backtest", json=dict(body, params={"short_window": 5.0, "long_window": 20}))
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    # Only the run that computed the result lands in the latency histograms
+    assert observed_runs("sma") == runs + 1
+    assert first.content == second.content
+    assert client.post("/run-backtest", json=dict(body, response_format="columnar")).headers["x-cache"] == "MISS"
+    timed = client.post("/run-backtest", json=dict(body, include_timings=True))
+    assert "x-cache" not in timed.headers and "timings" in timed.json()
+    assert client.get("/cache-stats").json()["results"]["hits"] >= 1
@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import risk
+from engine.backtest_engine import BacktestEngine, RISK_FIELDS, BUY, SELL
+from strategies import sma_crossover
+from test_engine_modes import generate_walk_data
+
+def naive_metrics(equity, bars_per_year):
+    equity = pd.Series(equity)
+    peak = equity.cummax()
+    returns = equity.pct_change().dropna()
+    underwater = (equity < peak).astype(int)
+    # Longest run of consecutive underwater bars
+    runs = underwater.groupby((underwater == 0).cumsum()).sum()
+    downside = np.sqrt((returns.clip(upper=0) ** 2).mean())
+    return {
+        "max_drawdown": ((peak - equity) / peak).max() * 100,
+        "max_drawdown_duration": int(runs.max()),
+        "sharpe_ratio": returns.mean() / returns.std() * np.sqrt(bars_per_year),
+        "sortino_ratio": returns.mean() / downside * np.sqrt(bars_per_year)
+    }
+
+def test_risk_metrics_match_naive_computation(monkeypatch):
+    df = generate_walk_data(n=3000)
+    signals = sma_crossover.generate_signals(df, {"short_window": 5, "long_window": 20})
+    engine = BacktestEngine()
+    engine.run(df, signals)
+    summary = engine.get_summary()
+    expected = naive_metrics(engine.equity, risk.DEFAULT_BARS_PER_YEAR)
+
+    for field, value in expected.items():
+        assert np.isclose(summary[field], value, rtol=1e-9), field
+
+    ledger = engine.ledger
+    pnl = ledger["pnl"]
+    assert np.isclose(summary["profit_factor"], pnl[pnl > 0].sum() / -pnl[pnl < 0].sum())
+    assert summary["avg_trade_duration"] == (ledger["exit_index"] - ledger["entry_index"]).mean()
+    years = (len(df) - 1) / risk.DEFAULT_BARS_PER_YEAR
+    assert np.isclose(summary["cagr"], ((summary["final_balance"] / 100000) ** (1 / years) - 1) * 100)
+
+    # Blocks only change how the curve is scanned
+    monkeypatch.setattr(risk, "BLOCK_BARS", 7)
+    blocked = engine.get_summary()
+    for field in RISK_FIELDS:
+        assert np.isclose(blocked[field], summary[field], rtol=1e-12), field
+
+def test_exposure_counts_open_position():
+    close = np.linspace(100, 110, 10)
+    codes = np.zeros(10, dtype=np.int8)
+    codes[[1, 6]] = [BUY, SELL]
+    codes[8] = BUY
+    engine = BacktestEngine()
+    engine.run_arrays(close, codes)
+    summary = engine.get_summary()
+
+    # Bars 1-5 for the closed trade, 8-9 for the open one
+    assert summary["exposure"] == 70.0
+    assert summary["avg_trade_duration"] == 5.0
+    assert summary["profit_factor"] is None
+    assert summary["max_drawdown"] == 0.0
+
+def test_undefined_metrics_are_none():
+    engine = BacktestEngine()
+    engine.run_arrays(np.full(5, 100.0), np.zeros(5, dtype=np.int8))
+    summary = engine.get_summary()
+    assert summary["sharpe_ratio"] is None
+    assert summary["sortino_ratio"] is None
+    assert summary["avg_trade_duration"] is None
+    assert summary["exposure"] == 0.0
+    assert summary["cagr"] == 0.0
+
+    engine.run_arrays(np.empty(0), np.empty(0, dtype=np.int8))
+    assert all(engine.get_summary()[field] is None for field in RISK_FIELDS)
+
+def test_bars_per_year_from_timestamps():
+    index = pd.date_range("2021-01-01", periods=24 * 365 + 1, freq="h")
+    assert np.isclose(risk.bars_per_year(index, len(index)), 24 * 365.25)
+    assert risk.bars_per_year(pd.RangeIndex(10), 10) == risk.DEFAULT_BARS_PER_YEAR
+
+def test_cagr_of_short_spans_is_undefined_when_out_of_range():
+    equity = np.array([100000.0, 150000.0])
+    index = pd.date_range("2024-01-01", periods=2, freq="s")
+    metrics = risk.risk_metrics(equity, 100000, {"pnl": np.empty(0), "entry_index": np.empty(0), "exit_index": np.empty(0)}, index=index)
+    assert metrics["cagr"] is None
+    metrics = risk.risk_metrics(np.array([100000.0, np.nan]), 100000, {"pnl": np.empty(0), "entry_index": np.empty(0), "exit_index": np.empty(0)})
+    assert metrics["cagr"] is None
@@ -0,0 +1,52 @@
+import pandas as pd
+import numpy as np
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import serialization
+from engine.strategy_runner import run_strategy
+from test_engine_modes import generate_walk_data
+
+def columns_to_records(columns):
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+def test_columnar_matches_records():
+    df = generate_walk_data(n=400)
+    df.index = pd.date_range("2024-01-01", periods=len(df), freq="min", name="index")
+    params = {"period": 14, "oversold": 30, "overbought": 70}
+
+    records = run_strategy(df, "rsi", params)
+    columnar = json.loads(serialization.dumps(run_strategy(df, "rsi", params, response_format="columnar")))
+
+    assert columnar['format'] == "columnar"
+    assert columns_to_records(columnar['data']) == records['data']
+    assert columns_to_records(columnar['signals']) == records['signals']
+    assert columns_to_records(columnar['backtest']['equity_curve']) == records['backtest']['equity_curve']
+    assert columns_to_records(columnar['backtest']['trades']) == records['backtest']['trades']
+    assert columnar['backtest']['roi'] == records['backtest']['roi']
+
+def test_data_can_be_omitted_or_filtered():
+    df = generate_walk_data(n=100)
+    params = {"short_window": 5, "long_window": 20}
+
+    assert 'data' not in run_strategy(df, "sma", params, include_data=False)
+    assert 'data' not in run_strategy(df, "sma", params, response_format="columnar", include_data=False)
+
+    filtered = run_strategy(df, "sma", params, columns=["close", "SMA_Long"])
+    assert list(filtered['data'][0]) == ["index", "close", "SMA_Long"]
+
+    try:
+        run_strategy(df, "sma", params, columns=["missing"])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_fallback_encoder_maps_nan_to_null(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    payload = {"a": np.array([1.0, np.nan, np.inf]), "b": np.int64(3), "c": float('nan'), "d": np.array(["x", None], dtype=object)}
+    assert json.loads(serialization.dumps(payload)) == {"a": [1.0, None, None], "b": 3, "c": None, "d": ["x", None]}
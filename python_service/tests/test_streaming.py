@@ -0,0 +1,66 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from engine.serialization import dumps
+from engine.strategy_runner import run_strategy, stream_strategy
+from test_engine_modes import generate_walk_data
+
+def reassemble(lines):
+    """Join the chunks of an NDJSON stream back into one columnar result."""
+    messages = [json.loads(line) for line in lines]
+    assert messages[0]["type"] == "summary" and messages[-1]["type"] == "end"
+    sections = {}
+    for message in messages[1:-1]:
+        section = sections.setdefault(message["type"], {})
+        assert message["offset"] == len(next(iter(section.values()), []))
+        for column, values in message["columns"].items():
+            section.setdefault(column, []).extend(values)
+    return messages[0], sections
+
+def test_stream_matches_columnar_result():
+    df = generate_walk_data(n=700)
+    df.index = pd.date_range("2024-01-01", periods=len(df), freq="h", name="index")
+    cases = [
+        ("sma", {"short_window": 5, "long_window": 20}, None),
+        ("rsi", {"period": 14, "oversold": 30, "overbought": 70}, 50),
+        ("breakout", {"lookback": 10}, None)
+    ]
+    for strategy, params, max_points in cases:
+        expected = json.loads(dumps(run_strategy(df, strategy, params, response_format="columnar", max_points=max_points)))
+        summary, sections = reassemble(stream_strategy(df, strategy, params, max_points=max_points, chunk_rows=64))
+
+        backtest = expected.pop("backtest")
+        # Empty sections have no lines
+        trades = backtest.pop("trades")
+        assert sections.pop("trades", dict.fromkeys(trades, [])) == trades
+        assert sections.pop("equity_curve") == backtest.pop("equity_curve")
+        assert summary["backtest"] == backtest
+        assert summary["rows"]["data"] == len(df)
+        assert sections.pop("data") == expected["data"]
+        assert sections.pop("signals", dict.fromkeys(expected["signals"], [])) == expected["signals"]
+        assert not sections
+
+def test_stream_endpoint():
+    client = TestClient(app)
+    data = {k: v.tolist() for k, v in generate_walk_data(n=300).items()}
+    body = {"symbol": "TEST", "strategy": "sma", "params": {"short_window": 5, "long_window": 20}, "data": data,
+            "response_format": "ndjson", "columns": ["close", "SMA_Short"], "include_timings": True}
+
+    response = client.post("/run-backtest", json=body)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert lines[0]["rows"]["equity_curve"] <= 2000
+    assert set(lines[-1]["timings"]) >= {"signals", "backtest", "stream"}
+    data_lines = [line for line in lines if line["type"] == "data"]
+    assert set(data_lines[0]["columns"]) == {"index", "close", "SMA_Short"}
+
+    assert client.post("/run-backtest", json=dict(body, columns=["nope"])).status_code == 400
+    assert client.post("/jobs", json=body).status_code == 400
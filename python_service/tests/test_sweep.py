@@ -0,0 +1,53 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.strategy_runner import run_strategy
+from engine.sweep import run_sweep, build_grid
+from test_engine_modes import generate_walk_data
+
+def assert_matches_single_runs(df, strategy, sweep):
+    table = sweep['results']
+    for k in range(len(table['roi'])):
+        params = {name: table[name][k] for name in sweep['params']}
+        bt = run_strategy(df.copy(), strategy, params)['backtest']
+        for field in ("final_balance", "roi", "total_trades", "winning_trades", "win_rate"):
+            assert bt[field] == table[field][k], (strategy, params, field)
+
+def test_sweep_matches_run_strategy():
+    df = generate_walk_data(n=2000, seed=11)
+
+    sweeps = [
+        ("sma", {"short_window": [3, 5, 10], "long_window": {"start": 10, "stop": 40, "step": 10}}),
+        ("rsi", {"period": [7, 14], "oversold": [25, 30], "overbought": [70, 75]}),
+        ("breakout", {"lookback": {"start": 5, "stop": 30, "step": 5}})
+    ]
+    for strategy, ranges in sweeps:
+        sweep = run_sweep(df, strategy, ranges)
+        assert sweep['combinations'] == len(sweep['results']['roi'])
+        assert_matches_single_runs(df, strategy, sweep)
+
+def test_sweep_sorts_and_truncates():
+    df = generate_walk_data(n=500, seed=2)
+    sweep = run_sweep(df, "sma", {"short_window": [2, 4, 6, 8], "long_window": [20, 30]}, top=3)
+
+    assert sweep['combinations'] == 8
+    assert len(sweep['results']['roi']) == 3
+    assert sweep['results']['roi'] == sorted(sweep['results']['roi'], reverse=True)
+
+def test_build_grid_validation():
+    names, grid = build_grid({"period": [7, 14], "oversold": {"start": 20, "stop": 30, "step": 5}})
+    assert names == ["period", "oversold"]
+    assert grid["period"].tolist() == [7, 7, 7, 14, 14, 14]
+    assert grid["oversold"].tolist() == [20, 25, 30, 20, 25, 30]
+
+    for bad in ({"period": []}, {"period": {"start": 1, "stop": 5, "step": 0}}):
+        try:
+            build_grid(bad)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.backtest_engine import BacktestEngine
+from engine.sweep import run_sweep
+from engine.walk_forward import make_windows, run_walk_forward
+from strategies import sma_crossover
+from test_engine_modes import generate_walk_data
+
+RANGES = {"short_window": [3, 5, 10], "long_window": [20, 40]}
+
+def test_make_windows():
+    assert make_windows(10, 4, 3) == [(0, 4, 4, 7), (3, 7, 7, 10)]
+    assert make_windows(10, 4, 3, anchored=True) == [(0, 4, 4, 7), (0, 7, 7, 10)]
+    assert make_windows(9, 4, 3)[-1] == (3, 7, 7, 9)
+
+def test_walk_forward_windows_match_manual_runs():
+    df = generate_walk_data(n=3000, seed=12)
+    result = run_walk_forward(df, "sma", RANGES, train_size=1000, test_size=500, workers=1)
+    windows = result["windows"]
+    equity = result["backtest"]["equity_curve"]["equity"]
+
+    capital = 100000
+    for k, (train_start, test_start, test_end) in enumerate(zip(windows["train_start"], windows["test_start"], windows["test_end"])):
+        best = run_sweep(df.iloc[train_start:test_start], "sma", RANGES, top=1)["results"]
+        params = {name: windows["params"][name][k] for name in RANGES}
+        assert params == {name: best[name][0] for name in RANGES}
+
+        signals = sma_crossover.generate_signals(df.iloc[train_start:test_end], params)
+        codes = signals.to_codes(test_end - train_start)[test_start - train_start:]
+        engine = BacktestEngine(initial_capital=capital)
+        engine.run_arrays(df['close'].to_numpy()[test_start:test_end], codes)
+        assert np.array_equal(equity[test_start - 1000:test_end - 1000], engine.equity)
+        capital = engine.get_summary()["final_balance"]
+
+    assert result["backtest"]["final_balance"] == capital
+
+def test_walk_forward_parallel_matches_serial():
+    df = generate_walk_data(n=2000, seed=4)
+    df.index = pd.date_range("2020-01-01", periods=len(df), freq="h")
+    serial = run_walk_forward(df, "sma", RANGES, train_size=600, test_size=300, anchored=True, workers=1)
+    parallel = run_walk_forward(df, "sma", RANGES, train_size=600, test_size=300, anchored=True, workers=2)
+
+    assert serial["windows"] == parallel["windows"]
+    assert np.array_equal(serial["backtest"]["equity_curve"]["equity"], parallel["backtest"]["equity_curve"]["equity"])
+    assert serial["backtest"]["equity_curve"]["timestamp"][0] == "2020-01-26 00:00:00"
+
+def test_walk_forward_with_gaps_between_test_windows():
+    df = generate_walk_data(n=1020, seed=7)
+    result = run_walk_forward(df, "sma", RANGES, train_size=300, test_size=100, step=150, workers=1)
+    windows = result["windows"]
+    backtest = result["backtest"]
+    curve = backtest["equity_curve"]
+
+    # Only test bars are stitched; capital carries across the untraded gaps
+    tested = np.concatenate([np.arange(a, b) for a, b in zip(windows["test_start"], windows["test_end"])])
+    assert np.array_equal(curve["index"], tested)
+    assert not np.isnan(curve["equity"]).any()
+    assert np.isfinite(backtest["final_balance"]) and np.isfinite(backtest["roi"])
+    assert backtest["final_balance"] == curve["equity"][-1]
+
+    capital = 100000
+    for k, (train_start, test_start, test_end) in enumerate(zip(windows["train_start"], windows["test_start"], windows["test_end"])):
+        params = {name: windows["params"][name][k] for name in RANGES}
+        signals = sma_crossover.generate_signals(df.iloc[train_start:test_end], params)
+        engine = BacktestEngine(initial_capital=capital)
+        engine.run_arrays(df['close'].to_numpy()[test_start:test_end], signals.to_codes(test_end - train_start)[test_start - train_start:])
+        assert np.array_equal(curve["equity"][np.isin(tested, np.arange(test_start, test_end))], engine.equity)
+        capital = engine.get_summary()["final_balance"]
+    assert backtest["final_balance"] == capital
+    for field in ("entry_index", "exit_index"):
+        assert np.isin(backtest["trades"][field], tested).all()
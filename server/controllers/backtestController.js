@@ -21,6 +21,30 @@ function generateDummyData(count) {
     return data;
 }
 
+// Datasets above this size run as a Python service job instead of one blocking request
+const JOB_THRESHOLD_BARS = 20000;
+const JOB_POLL_MS = 500;
+const JOB_TIMEOUT_MS = 10 * 60 * 1000;
+
+// Submit a backtest job, poll until it finishes and fetch its result
+async function runAsJob(pythonServiceUrl, payload) {
+    const { data: submitted } = await axios.post(`${pythonServiceUrl}/jobs`, payload, { timeout: 20000 });
+    const jobUrl = `${pythonServiceUrl}/jobs/${submitted.job_id}`;
+    const deadline = Date.now() + JOB_TIMEOUT_MS;
+
+    while (Date.now() < deadline) {
+        const { data: job } = await axios.get(jobUrl, { timeout: 20000 });
+        if (['done', 'failed', 'cancelled'].includes(job.status)) {
+            // Failed jobs answer 400/500 with the error, as the direct endpoints would, and are handled the same way
+            return axios.get(`${jobUrl}/result`, { timeout: 60000 });
+        }
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_MS));
+    }
+
+    await axios.delete(jobUrl).catch(() => {});
+    throw new Error('Backtest job timed out');
+}
+
 export const runBacktest = async (req, res) => {
     try {
         const { symbol, strategy, params } = req.body;
@@ -51,22 +75,35 @@ export const runBacktest = async (req, res) => {
         let response;
         let lastError;
 
-        for (const endpoint of endpointsToTry) {
+        if (ohlcvData.length > JOB_THRESHOLD_BARS) {
             try {
-                response = await axios.post(`${pythonServiceUrl}${endpoint}`, pythonPayload, { timeout: 20000 });
-                break; // Success
+                response = await runAsJob(pythonServiceUrl, pythonPayload);
             } catch (error) {
-                lastError = error;
-                const status = error.response?.status;
-                // If the endpoint does not exist, try the next fallback
-                if (status === 404) {
-                    continue;
+                // Older services without the job API fall back to the direct endpoints
+                if (error.response?.status !== 404 || error.config?.url !== `${pythonServiceUrl}/jobs`) {
+                    throw error;
                 }
-                // Connection level errors
-                if (error.code === 'ECONNREFUSED') {
-                    throw new Error(`Python service unreachable at ${pythonServiceUrl}. Ensure it is running and accessible.`);
+            }
+        }
+
+        if (!response) {
+            for (const endpoint of endpointsToTry) {
+                try {
+                    response = await axios.post(`${pythonServiceUrl}${endpoint}`, pythonPayload, { timeout: 20000 });
+                    break; // Success
+                } catch (error) {
+                    lastError = error;
+                    const status = error.response?.status;
+                    // If the endpoint does not exist, try the next fallback
+                    if (status === 404) {
+                        continue;
+                    }
+                    // Connection level errors
+                    if (error.code === 'ECONNREFUSED') {
+                        throw new Error(`Python service unreachable at ${pythonServiceUrl}. Ensure it is running and accessible.`);
+                    }
+                    throw error;
                 }
-                throw error;
             }
         }
 
@@ -88,6 +125,14 @@ export const runBacktest = async (req, res) => {
                 roi: result.backtest.roi,
                 totalTrades: result.backtest.total_trades,
                 winRate: result.backtest.win_rate,
+                maxDrawdown: result.backtest.max_drawdown,
+                maxDrawdownDuration: result.backtest.max_drawdown_duration,
+                sharpeRatio: result.backtest.sharpe_ratio,
+                sortinoRatio: result.backtest.sortino_ratio,
+                cagr: result.backtest.cagr,
+                profitFactor: result.backtest.profit_factor,
+                exposure: result.backtest.exposure,
+                avgTradeDuration: result.backtest.avg_trade_duration,
                 equityCurve: result.backtest.equity_curve.map(p => p.equity) // Store just equity values
             });
             
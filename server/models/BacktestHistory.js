@@ -38,6 +38,39 @@ const backtestHistorySchema = new mongoose.Schema({
         type: Number,
         required: true
     },
+    // Risk metrics from the backtest summary (null when undefined, e.g. no trades)
+    maxDrawdown: {
+        type: Number,
+        default: null
+    },
+    maxDrawdownDuration: {
+        type: Number,
+        default: null
+    },
+    sharpeRatio: {
+        type: Number,
+        default: null
+    },
+    sortinoRatio: {
+        type: Number,
+        default: null
+    },
+    cagr: {
+        type: Number,
+        default: null
+    },
+    profitFactor: {
+        type: Number,
+        default: null
+    },
+    exposure: {
+        type: Number,
+        default: null
+    },
+    avgTradeDuration: {
+        type: Number,
+        default: null
+    },
     equityCurve: {
         type: [Number], // Storing just the equity values for simplicity/size, or could be objects
         default: []
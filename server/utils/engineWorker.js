@@ -0,0 +1,105 @@
+import { spawn } from 'child_process';
+import path from 'path';
+import readline from 'readline';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const enginePath = path.join(__dirname, '../../engine/main.py');
+
+// Milliseconds a request may take before the worker is considered hung
+const REQUEST_TIMEOUT_MS = Number(process.env.ENGINE_REQUEST_TIMEOUT_MS) || 120000;
+
+// A single long-running engine process (engine/main.py --worker) that
+// answers JSON-lines requests, so pandas/yfinance imports and downloaded
+// data stay warm between backtests.
+let worker = null;
+let nextId = 1;
+const pending = new Map();
+
+function settle(id) {
+    const request = pending.get(id);
+    if (!request) return null;
+    pending.delete(id);
+    clearTimeout(request.timer);
+    return request;
+}
+
+// Reject every request sent to proc and drop it, so the next request starts
+// a fresh worker. Safe to call more than once for the same process.
+function stopWorker(proc, error) {
+    if (worker === proc) {
+        worker = null;
+    }
+    for (const [id, request] of pending) {
+        if (request.proc === proc) {
+            settle(id).reject(error);
+        }
+    }
+    if (proc.exitCode === null && !proc.killed) {
+        proc.kill();
+    }
+}
+
+function startWorker() {
+    const proc = spawn('python3', [enginePath, '--worker']);
+
+    readline.createInterface({ input: proc.stdout }).on('line', (line) => {
+        let message;
+        try {
+            message = JSON.parse(line);
+        } catch (e) {
+            console.error('Invalid output from engine worker:', line);
+            return;
+        }
+        const request = settle(message.id);
+        if (!request) return;
+        if (message.error) {
+            request.reject(new Error(message.error));
+        } else {
+            request.resolve(message.result);
+        }
+    });
+
+    proc.stderr.on('data', (data) => {
+        console.error(`Python Error: ${data}`);
+    });
+
+    // Spawn failures (e.g. no python3) and writes after the worker died (EPIPE)
+    // arrive as 'error' events, which would otherwise crash the server
+    proc.on('error', (err) => {
+        console.error('Engine worker error:', err.message);
+        stopWorker(proc, new Error(`Engine worker failed: ${err.message}`));
+    });
+    proc.stdin.on('error', (err) => {
+        console.error('Engine worker stdin error:', err.message);
+        stopWorker(proc, new Error(`Engine worker failed: ${err.message}`));
+    });
+
+    proc.on('close', (code) => {
+        console.error(`Engine worker exited with code ${code}`);
+        stopWorker(proc, new Error('Engine worker exited'));
+    });
+
+    return proc;
+}
+
+export function runEngineBacktest(payload, { timeoutMs = REQUEST_TIMEOUT_MS } = {}) {
+    if (!worker) {
+        worker = startWorker();
+    }
+    const proc = worker;
+    const id = nextId++;
+    return new Promise((resolve, reject) => {
+        // Requests are answered in order, so a request that times out means the
+        // worker is stuck: restart it rather than queue more work behind it
+        const timer = setTimeout(() => {
+            console.error(`Engine request ${id} timed out after ${timeoutMs} ms; restarting worker`);
+            stopWorker(proc, new Error(`Engine request timed out after ${timeoutMs} ms`));
+        }, timeoutMs);
+        pending.set(id, { resolve, reject, proc, timer });
+        proc.stdin.write(JSON.stringify({ id, ...payload }) + '\n');
+    });
+}